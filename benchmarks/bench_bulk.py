@@ -0,0 +1,60 @@
+"""
+Compare writing DTOs using save() per row against the bulk helpers.
+
+Run using `python -m benchmarks.bench_bulk`.
+"""
+from .utils import measure, setup_django
+
+setup_django()
+
+from django.db import connection, models, transaction  # noqa: E402
+
+from fastapi_django.bulk import bulk_create, bulk_update  # noqa: E402
+from fastapi_django.models import django_to_pydantic_model  # noqa: E402
+
+ROWS = 10_000
+
+
+class Row(models.Model):
+    name = models.CharField(max_length=255)
+    age = models.IntegerField(null=True, blank=True)
+    size = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        app_label = "benchmarks"
+
+
+RowCreateDTO = django_to_pydantic_model(Row, exclude={"id"})
+RowDTO = django_to_pydantic_model(Row)
+
+
+def save_per_row(payload: list[dict]) -> None:
+    with transaction.atomic():
+        for row in payload:
+            RowCreateDTO.model_validate(row).to_django().save()
+
+
+def main() -> None:
+    with connection.schema_editor() as schema_editor:
+        schema_editor.create_model(Row)
+
+    payload = [{"name": f"name {i}", "age": i, "size": i / 10} for i in range(ROWS)]
+    existing = [{"id": i + 1, **row} for i, row in enumerate(payload)]
+
+    cases = {
+        "save() per row": lambda: save_per_row(payload),
+        "bulk_create": lambda: bulk_create([RowCreateDTO.model_validate(row) for row in payload]),
+        "bulk_create (upsert)": lambda: bulk_create(
+            [RowDTO.model_validate(row) for row in existing],
+            update_conflicts=True,
+            unique_fields=["id"],
+        ),
+        "bulk_update": lambda: bulk_update([RowDTO.model_validate(row) for row in existing]),
+    }
+    for name, func in cases.items():
+        seconds = measure(func, rounds=3)
+        print(f"{name}: {ROWS / seconds:,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+Measure the model conversion layer for some representative models.
+
+Reports the time per row for `model_to_dict()` and `DjangoModelBase.from_django()`,
+the time to build a DTO class (including the field type resolution and the
+pydantic-core schema) and the memory used by 10k DTOs.
+
+Run using `python -m benchmarks.bench_conversion`. Use ``--output results.json`` to
+save the results and ``--baseline results.json`` to compare against saved results,
+exiting with status 1 if anything got slower (or bigger) than ``--tolerance``.
+"""
+import argparse
+import datetime
+import decimal
+import json
+import platform
+import sys
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from .utils import measure, setup_django
+
+setup_django()
+
+import django  # noqa: E402
+import pydantic  # noqa: E402
+from django.core.files.storage import InMemoryStorage  # noqa: E402
+from django.db import models  # noqa: E402
+
+from fastapi_django.models import DjangoModelBase, django_to_pydantic_model, model_to_dict  # noqa: E402
+from fastapi_django.models.fields import (  # noqa: E402
+    _get_pydantic_field_type_from_django_field,
+    _resolve_field_options,
+)
+from fastapi_django.models.models import _create_pydantic_model  # noqa: E402
+
+ROWS = 10_000
+
+storage = InMemoryStorage(base_url="/media/")
+
+
+class Other(models.Model):
+    name = models.CharField(max_length=255)
+
+    class Meta:
+        app_label = "benchmarks"
+
+
+class Wide(models.Model):
+    class Meta:
+        app_label = "benchmarks"
+
+
+# 40 columns of the usual types
+for _i in range(10):
+    Wide.add_to_class(f"char_{_i}", models.CharField(max_length=255))
+    Wide.add_to_class(f"int_{_i}", models.IntegerField())
+    Wide.add_to_class(f"decimal_{_i}", models.DecimalField(max_digits=10, decimal_places=2))
+    Wide.add_to_class(f"datetime_{_i}", models.DateTimeField())
+
+
+class ForeignKeys(models.Model):
+    name = models.CharField(max_length=255)
+    other_0 = models.ForeignKey(Other, on_delete=models.CASCADE, related_name="+")
+    other_1 = models.ForeignKey(Other, on_delete=models.CASCADE, related_name="+")
+    other_2 = models.ForeignKey(Other, on_delete=models.CASCADE, related_name="+")
+    other_3 = models.ForeignKey(Other, on_delete=models.CASCADE, related_name="+", null=True)
+    other_4 = models.ForeignKey(Other, on_delete=models.CASCADE, related_name="+", null=True)
+
+    class Meta:
+        app_label = "benchmarks"
+
+
+class Files(models.Model):
+    name = models.CharField(max_length=255)
+    document = models.FileField(storage=storage)
+    image = models.ImageField(storage=storage, null=True, blank=True)
+
+    class Meta:
+        app_label = "benchmarks"
+
+
+class JSON(models.Model):
+    name = models.CharField(max_length=255)
+    data = models.JSONField()
+
+    class Meta:
+        app_label = "benchmarks"
+
+
+class Nullable(models.Model):
+    name = models.CharField(max_length=255, null=True, blank=True)
+    age = models.IntegerField(null=True, blank=True)
+    size = models.FloatField(null=True, blank=True)
+    birth = models.DateField(null=True, blank=True)
+    joined = models.DateTimeField(null=True, blank=True)
+    email = models.EmailField(null=True, blank=True)
+    reference = models.UUIDField(null=True, blank=True)
+
+    class Meta:
+        app_label = "benchmarks"
+
+
+OtherDTO = django_to_pydantic_model(Other)
+
+JOINED = datetime.datetime(2023, 1, 1, 12, 34, 56, tzinfo=datetime.UTC)
+
+
+def _create_wide(i: int) -> models.Model:
+    values: dict[str, Any] = {"id": i}
+    for j in range(10):
+        values[f"char_{j}"] = f"value {i} {j}"
+        values[f"int_{j}"] = i + j
+        values[f"decimal_{j}"] = decimal.Decimal("12.34")
+        values[f"datetime_{j}"] = JOINED
+    return Wide(**values)
+
+
+OTHERS = [Other(id=i, name=f"other {i}") for i in range(5)]
+
+
+def _create_foreign_keys(i: int) -> models.Model:
+    return ForeignKeys(
+        id=i,
+        name=f"name {i}",
+        **{f"other_{j}": OTHERS[j] for j in range(5) if j < 3 or i % 2},
+    )
+
+
+def _create_files(i: int) -> models.Model:
+    return Files(
+        id=i,
+        name=f"name {i}",
+        document=f"documents/{i}.pdf",
+        image=f"images/{i}.jpg" if i % 2 else "",
+    )
+
+
+def _create_json(i: int) -> models.Model:
+    return JSON(
+        id=i,
+        name=f"name {i}",
+        # Only flat JSON is supported by the JSONField mapping
+        data={"id": i, "tag": f"tag {i % 10}", "enabled": bool(i % 2), "score": i / 10, "parent": None},
+    )
+
+
+def _create_nullable(i: int) -> models.Model:
+    # Every other row has all columns set to NULL
+    if i % 2:
+        return Nullable(id=i)
+    return Nullable(
+        id=i,
+        name=f"name {i}",
+        age=i,
+        size=i / 10,
+        birth=datetime.date(2023, 1, 1),
+        joined=JOINED,
+        email=f"mail{i}@example.com",
+        reference=uuid.UUID(int=i),
+    )
+
+
+# name: (Django model, factory for the instances, arguments for django_to_pydantic_model())
+CASES: dict[str, tuple[type[models.Model], Callable[[int], models.Model], dict[str, Any]]] = {
+    "wide": (Wide, _create_wide, {}),
+    "foreign_keys": (ForeignKeys, _create_foreign_keys, {}),
+    "foreign_keys_nested": (
+        ForeignKeys,
+        _create_foreign_keys,
+        {"relations": {f"other_{j}": OtherDTO for j in range(5)}},
+    ),
+    "files": (Files, _create_files, {}),
+    "json": (JSON, _create_json, {}),
+    "nullable": (Nullable, _create_nullable, {}),
+}
+
+
+def _build_dto_class(model_class: type[models.Model], kwargs: dict[str, Any]) -> type[DjangoModelBase]:
+    """Build a new DTO class bypassing the registry, including its deferred schema."""
+
+    dto_class = _create_pydantic_model(
+        model_class,
+        skip_unknown_field_types=True,
+        include=None,
+        exclude=None,
+        relations=kwargs.get("relations"),
+    )
+    dto_class._build_deferred_model()
+    return dto_class
+
+
+def _measure_memory(func: Callable[[], Any]) -> int:
+    """Return the memory (in bytes) still allocated for the result of ``func``."""
+
+    tracemalloc.start()
+    try:
+        result = func()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def run_case(
+    model_class: type[models.Model],
+    create_instance: Callable[[int], models.Model],
+    kwargs: dict[str, Any],
+    rows: int,
+    rounds: int,
+) -> dict[str, float]:
+    instances = [create_instance(i) for i in range(rows)]
+    dto_class = django_to_pydantic_model(model_class, **kwargs)
+    dto_class._build_deferred_model()
+    django_fields = model_class._meta.get_fields(include_hidden=False)
+
+    def resolve_field_types() -> None:
+        _resolve_field_options.cache_clear()
+        for django_field in django_fields:
+            if _resolve_field_options(django_field.__class__) is not None:
+                _get_pydantic_field_type_from_django_field(django_field)
+
+    per_row = 1_000_000 / rows
+    results = {
+        "model_to_dict_us_per_row": measure(
+            lambda: [model_to_dict(instance) for instance in instances],
+            rounds=rounds,
+        ) * per_row,
+        "from_django_us_per_row": measure(
+            lambda: [dto_class.from_django(instance) for instance in instances],
+            rounds=rounds,
+        ) * per_row,
+        "from_django_many_us_per_row": measure(
+            lambda: dto_class.from_django_many(instances),
+            rounds=rounds,
+        ) * per_row,
+        "from_django_many_trusted_us_per_row": measure(
+            lambda: dto_class.from_django_many(instances, trusted=True),
+            rounds=rounds,
+        ) * per_row,
+        "field_type_resolution_us": measure(resolve_field_types, rounds=rounds) * 1_000_000,
+        "class_build_ms": measure(
+            lambda: _build_dto_class(model_class, kwargs),
+            rounds=rounds,
+        ) * 1_000,
+        "dto_memory_kib_per_10k_rows": _measure_memory(
+            lambda: dto_class.from_django_many(instances),
+        ) / 1024 * 10_000 / rows,
+    }
+    # Don't leave the field type cache empty for the next case
+    resolve_field_types()
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """Return a message for every value exceeding its baseline by more than ``tolerance``."""
+
+    regressions = []
+    for case_name, case_results in results.items():
+        for name, value in case_results.items():
+            baseline_value = baseline.get(case_name, {}).get(name)
+            if not baseline_value:
+                continue
+            change = value / baseline_value - 1
+            if change > tolerance:
+                regressions.append(
+                    f"{case_name} {name}: {baseline_value:.2f} -> {value:.2f} ({change:+.0%})",
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--case", action="append", choices=CASES, help="only run these cases")
+    parser.add_argument("--output", type=Path, help="save the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare to results saved using --output")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed change, default: 0.2 (20%%)")
+    args = parser.parse_args()
+
+    results = {}
+    for case_name in args.case or CASES:
+        results[case_name] = run_case(*CASES[case_name], args.rows, args.rounds)
+        print(f"{case_name}:")
+        for name, value in results[case_name].items():
+            print(f"    {name}: {value:,.2f}")
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(
+            {
+                "python": platform.python_version(),
+                "django": django.__version__,
+                "pydantic": pydantic.VERSION,
+                "rows": args.rows,
+                "results": results,
+            },
+            indent=2,
+        ) + "\n")
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(results, baseline["results"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
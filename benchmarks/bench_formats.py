@@ -0,0 +1,71 @@
+"""
+Compare encoding rows in the formats DTO responses may be sent in, see `fastapi_django.formats`.
+
+Run using `python -m benchmarks.bench_formats`.
+"""
+import datetime
+import decimal
+import uuid
+
+from .utils import measure, setup_django
+
+setup_django()
+
+import pydantic_core  # noqa: E402
+from django.db import models  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from fastapi_django.formats import HAS_MSGPACK, dump_rows_csv, dump_rows_msgpack  # noqa: E402
+from fastapi_django.models import django_to_pydantic_model  # noqa: E402
+
+ROWS = 10_000
+
+
+class Row(models.Model):
+    name = models.CharField(max_length=255)
+    age = models.IntegerField(null=True, blank=True)
+    joined = models.DateTimeField(null=True, blank=True)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    key = models.UUIDField()
+
+    class Meta:
+        app_label = "benchmarks"
+
+
+RowDTO = django_to_pydantic_model(Row)
+
+
+def main() -> None:
+    joined = datetime.datetime(2023, 1, 1, tzinfo=datetime.UTC)
+    # Like returned by QuerySet.values() for trusted data
+    rows = [
+        {
+            "id": i,
+            "name": f"name {i}",
+            "age": i,
+            "joined": joined,
+            "price": decimal.Decimal(i) / 100,
+            "key": uuid.uuid4(),
+        }
+        for i in range(ROWS)
+    ]
+
+    def copy_rows() -> list[dict]:
+        # Encoding changes the rows in place
+        return [dict(row) for row in rows]
+
+    benchmarks = {
+        "json (jsonable_encoder)": lambda: pydantic_core.to_json(jsonable_encoder(copy_rows())),
+        "json": lambda: pydantic_core.to_json(copy_rows()),
+        "ndjson": lambda: b"".join(pydantic_core.to_json(row) + b"\n" for row in copy_rows()),
+        "csv": lambda: dump_rows_csv(RowDTO, copy_rows(), header=True),
+    }
+    if HAS_MSGPACK:
+        benchmarks["msgpack"] = lambda: dump_rows_msgpack(RowDTO, copy_rows())
+    for name, func in benchmarks.items():
+        seconds = measure(func)
+        print(f"{name}: {seconds / ROWS * 1_000_000:.2f} µs/row, {len(func()) / ROWS:.0f} bytes/row")
+
+
+if __name__ == "__main__":
+    main()
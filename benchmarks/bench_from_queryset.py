@@ -0,0 +1,49 @@
+"""
+Compare converting a queryset row by row against the bulk conversion.
+
+Run using `python -m benchmarks.bench_from_queryset`.
+"""
+from .utils import measure, setup_django
+
+setup_django()
+
+from django.db import connection, models  # noqa: E402
+
+from fastapi_django.models import django_to_pydantic_model  # noqa: E402
+
+ROWS = 10_000
+
+
+class Row(models.Model):
+    name = models.CharField(max_length=255)
+    age = models.IntegerField(null=True, blank=True)
+    size = models.FloatField(null=True, blank=True)
+    joined = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        app_label = "benchmarks"
+
+
+RowDTO = django_to_pydantic_model(Row)
+
+
+def main() -> None:
+    with connection.schema_editor() as schema_editor:
+        schema_editor.create_model(Row)
+    Row.objects.bulk_create(
+        Row(name=f"name {i}", age=i, size=i / 10)
+        for i in range(ROWS)
+    )
+
+    cases = {
+        "from_django per row": lambda: [RowDTO.from_django(row) for row in Row.objects.all()],
+        "from_django_many": lambda: RowDTO.from_django_many(Row.objects.all()),
+        "from_queryset": lambda: RowDTO.from_queryset(Row.objects.all()),
+    }
+    for name, func in cases.items():
+        seconds = measure(func)
+        print(f"{name}: {ROWS / seconds:,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
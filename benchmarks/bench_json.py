@@ -0,0 +1,60 @@
+"""
+Compare the ways to write the rows of a queryset to JSON.
+
+Run using `python -m benchmarks.bench_json`.
+"""
+from .utils import measure, setup_django
+
+setup_django()
+
+from django.db import connection, models  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from fastapi_django.models import django_to_pydantic_model  # noqa: E402
+from fastapi_django.responses import DTOResponse  # noqa: E402
+
+ROWS = 10_000
+
+
+class Row(models.Model):
+    name = models.CharField(max_length=255)
+    age = models.IntegerField(null=True, blank=True)
+    size = models.FloatField(null=True, blank=True)
+    joined = models.DateTimeField(null=True, blank=True)
+    email = models.EmailField(null=True, blank=True)
+
+    class Meta:
+        app_label = "benchmarks"
+
+
+RowDTO = django_to_pydantic_model(Row)
+
+
+def main() -> None:
+    with connection.schema_editor() as schema_editor:
+        schema_editor.create_model(Row)
+    Row.objects.bulk_create(
+        Row(name=f"name {i}", age=i, size=i / 10, email=f"mail{i}@example.com")
+        for i in range(ROWS)
+    )
+    queryset = Row.objects.all()
+
+    benchmarks = {
+        "from_django + jsonable_encoder": lambda: JSONResponse(jsonable_encoder([
+            RowDTO.from_django(obj)
+            for obj
+            in queryset
+        ])),
+        "from_queryset + DTOResponse": lambda: DTOResponse(
+            RowDTO.from_queryset(queryset, trusted=True),
+        ),
+        "dump_queryset_json": lambda: RowDTO.dump_queryset_json(queryset, trusted=True),
+    }
+    for name, func in benchmarks.items():
+        seconds = measure(func)
+        print(f"{name}: {seconds / ROWS * 1_000_000:.2f} µs/row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Measure the throughput of `model_to_dict`.
+
+Run using `python -m benchmarks.bench_model_to_dict`.
+"""
+import datetime
+import decimal
+
+from .utils import measure, setup_django
+
+setup_django()
+
+from django.core.files.storage import InMemoryStorage  # noqa: E402
+from django.db import models  # noqa: E402
+
+from fastapi_django.models import model_to_dict  # noqa: E402
+
+ROWS = 10_000
+
+storage = InMemoryStorage(base_url="/media/")
+
+
+class Other(models.Model):
+    name = models.CharField(max_length=255)
+
+    class Meta:
+        app_label = "benchmarks"
+
+
+class Something(models.Model):
+    name = models.CharField(max_length=255)
+    age = models.IntegerField(null=True, blank=True)
+    size = models.FloatField(null=True, blank=True)
+    weight = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    birth = models.DateField(null=True, blank=True)
+    joined = models.DateTimeField(null=True, blank=True)
+    email = models.EmailField(null=True, blank=True)
+    main_other = models.ForeignKey(Other, on_delete=models.CASCADE, null=True, blank=True)
+    avatar = models.ImageField(storage=storage)
+
+    class Meta:
+        app_label = "benchmarks"
+
+
+def main() -> None:
+    other = Other(id=1, name="other")
+    instances = [
+        Something(
+            id=i,
+            name=f"name {i}",
+            age=i,
+            size=i / 10,
+            weight=decimal.Decimal("12.34"),
+            birth=datetime.date(2023, 1, 1),
+            joined=datetime.datetime(2023, 1, 1, 12, 34, 56, tzinfo=datetime.UTC),
+            email=f"mail{i}@example.com",
+            main_other=other,
+            avatar="path/to/file.jpg" if i % 2 else "",
+        )
+        for i in range(ROWS)
+    ]
+
+    cases = {
+        "all fields": {},
+        "include": {"include": {"id", "name", "age", "main_other"}},
+        "exclude": {"exclude": {"avatar", "email"}},
+    }
+    for name, kwargs in cases.items():
+        seconds = measure(lambda kwargs=kwargs: [model_to_dict(i, **kwargs) for i in instances])
+        print(f"model_to_dict ({name}): {ROWS / seconds:,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
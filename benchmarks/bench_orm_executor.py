@@ -0,0 +1,53 @@
+"""
+Compare running the sync code of concurrent requests in the shared thread and in lanes.
+
+Simulates blocking queries using time.sleep(), as the benchmarks only use SQLite.
+
+Run using `python -m benchmarks.bench_orm_executor`.
+"""
+import asyncio
+import contextlib
+import time
+
+from .utils import setup_django
+
+setup_django()
+
+from asgiref.sync import sync_to_async  # noqa: E402
+
+from fastapi_django.executor import ORMExecutor  # noqa: E402
+
+REQUESTS = 40
+QUERIES_PER_REQUEST = 3
+QUERY_SECONDS = 0.005
+
+
+async def request(orm_executor: ORMExecutor | None) -> None:
+    async with orm_executor.lane() if orm_executor is not None else contextlib.nullcontext():
+        for _ in range(QUERIES_PER_REQUEST):
+            await sync_to_async(time.sleep)(QUERY_SECONDS)
+
+
+async def run(orm_executor: ORMExecutor | None) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(request(orm_executor) for _ in range(REQUESTS)))
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    seconds = await run(None)
+    print(f"shared thread: {seconds * 1000:.1f} ms for {REQUESTS} concurrent requests")
+    for lanes in (2, 4, 8):
+        orm_executor = ORMExecutor(lanes=lanes)
+        seconds = await run(orm_executor)
+        stats = orm_executor.get_stats()
+        print(
+            f"{lanes} lanes: {seconds * 1000:.1f} ms for {REQUESTS} concurrent requests, "
+            f"max queue depth {stats.max_queue_depth}, "
+            f"max wait {stats.max_wait_seconds * 1000:.1f} ms",
+        )
+        await orm_executor.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+"""
+Compare finding the mounted app using Starlette's router and `PrefixDispatcher`.
+
+Run using `python -m benchmarks.bench_routing`.
+"""
+import asyncio
+
+from starlette.routing import Mount, Router
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from fastapi_django.routing import PrefixDispatcher
+
+from .utils import measure
+
+MOUNTS = 50
+REQUESTS = 10_000
+
+
+async def app(_scope: Scope, _receive: Receive, _send: Send) -> None:
+    pass
+
+
+async def receive() -> dict:
+    return {"type": "http.request"}
+
+
+async def send(_message: dict) -> None:
+    pass
+
+
+def main() -> None:
+    prefixes = [f"/api/v{i}" for i in range(MOUNTS)]
+    router = Router([
+        *(Mount(prefix, app) for prefix in prefixes),
+        # Catch-all, like Django
+        Mount("/", app),
+    ])
+    dispatcher = PrefixDispatcher(dict.fromkeys(prefixes, app), default=app)
+
+    cases = {
+        "first mount": "/api/v0/somethings/1/",
+        "last mount": f"/api/v{MOUNTS - 1}/somethings/1/",
+        "catch-all": "/admin/something/something/1/change/",
+    }
+    for case_name, path in cases.items():
+        scope = {"type": "http", "method": "GET", "path": path, "root_path": "", "headers": []}
+
+        for name, asgi_app in (("Router", router), ("PrefixDispatcher", dispatcher)):
+            async def dispatch(asgi_app: ASGIApp = asgi_app, scope: Scope = scope) -> None:
+                for _ in range(REQUESTS):
+                    await asgi_app(dict(scope), receive, send)
+
+            seconds = measure(lambda dispatch=dispatch: asyncio.run(dispatch()))
+            print(f"{case_name} ({name}): {seconds / REQUESTS * 1_000_000:.2f} µs/request")
+
+
+if __name__ == "__main__":
+    main()
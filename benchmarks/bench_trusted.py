@@ -0,0 +1,65 @@
+"""
+Compare validated and trusted conversion, and the response serialization.
+
+Run using `python -m benchmarks.bench_trusted`.
+"""
+import asyncio
+
+from .utils import measure, setup_django
+
+setup_django()
+
+from django.db import connection, models  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from fastapi_django.models import django_to_pydantic_model  # noqa: E402
+from fastapi_django.responses import DTOResponse  # noqa: E402
+
+ROWS = 10_000
+
+
+class Row(models.Model):
+    name = models.CharField(max_length=255)
+    age = models.IntegerField(null=True, blank=True)
+    size = models.FloatField(null=True, blank=True)
+    joined = models.DateTimeField(null=True, blank=True)
+    email = models.EmailField(null=True, blank=True)
+
+    class Meta:
+        app_label = "benchmarks"
+
+
+RowDTO = django_to_pydantic_model(Row)
+
+
+def main() -> None:
+    with connection.schema_editor() as schema_editor:
+        schema_editor.create_model(Row)
+    Row.objects.bulk_create(
+        Row(name=f"name {i}", age=i, size=i / 10, email=f"mail{i}@example.com")
+        for i in range(ROWS)
+    )
+    rows = list(Row.objects.values(*RowDTO._get_django_values_names()))
+
+    for trusted in (False, True):
+        seconds = measure(lambda trusted=trusted: RowDTO._from_django_values(
+            [row.copy() for row in rows],
+            trusted,
+        ))
+        print(f"convert (trusted={trusted}): {seconds / ROWS * 1_000_000:.2f} µs/row")
+
+    dtos = RowDTO._from_django_values([row.copy() for row in rows], True)
+    response_field = create_response_field(name="response", type_=list[RowDTO])
+    seconds = measure(lambda: JSONResponse(asyncio.run(serialize_response(
+        field=response_field,
+        response_content=dtos,
+    ))))
+    print(f"response (response_model): {seconds / ROWS * 1_000_000:.2f} µs/row")
+    seconds = measure(lambda: DTOResponse(dtos))
+    print(f"response (DTOResponse): {seconds / ROWS * 1_000_000:.2f} µs/row")
+
+
+if __name__ == "__main__":
+    main()
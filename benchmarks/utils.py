@@ -0,0 +1,51 @@
+import gc
+import time
+from collections.abc import Callable
+from typing import Any
+
+import django
+from django.conf import settings
+
+
+def setup_django() -> None:
+    """Configure a minimal standalone Django for running the benchmarks."""
+
+    if settings.configured:
+        return
+
+    settings.configure(
+        INSTALLED_APPS=[
+            "django.contrib.contenttypes",
+            "django.contrib.auth",
+        ],
+        DATABASES={
+            "default": {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": ":memory:",
+            },
+        },
+        USE_TZ=True,
+        DEFAULT_AUTO_FIELD="django.db.models.BigAutoField",
+    )
+    django.setup()
+
+
+def measure(
+    func: Callable[[], Any],
+    *,
+    rounds: int = 5,
+) -> float:
+    """Run ``func`` ``rounds`` times and return the best time in seconds."""
+
+    best = float("inf")
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best
@@ -0,0 +1,148 @@
+from collections.abc import Sequence
+
+import pydantic
+from asgiref.sync import sync_to_async
+from django.db import models, router, transaction
+
+from .cache import notify_model_change
+from .models import DjangoModelBase
+
+
+class BulkWriteResult(pydantic.BaseModel):
+    """Response of bulk create/upsert/update endpoints."""
+
+    count: int = pydantic.Field(..., description="Number of rows written")
+
+
+def _get_django_model(dtos: Sequence[DjangoModelBase]) -> type[models.Model]:
+    django_model = type(dtos[0])._django_model
+    if django_model is None:
+        raise TypeError(f"{type(dtos[0]).__name__} was not created by django_to_pydantic_model()")
+    return django_model
+
+
+def _get_upsert_update_fields(
+    django_model: type[models.Model],
+    dto_class: type[DjangoModelBase],
+    unique_fields: Sequence[str],
+) -> list[str]:
+    """Return all fields written by the DTO, except the primary key and the unique fields."""
+
+    unique_field_names = {django_model._meta.get_field(name).name for name in unique_fields}
+    return [
+        django_field.name
+        for django_field
+        in dto_class._django_fields.values()
+        if (
+            isinstance(django_field, models.Field)
+            and django_field.concrete
+            and not django_field.primary_key
+            and not isinstance(django_field, models.FileField | models.ManyToManyField)
+            and django_field.name not in unique_field_names
+        )
+    ]
+
+
+def bulk_create(
+    dtos: Sequence[DjangoModelBase],
+    *,
+    batch_size: int = 1000,
+    update_conflicts: bool = False,
+    unique_fields: Sequence[str] | None = None,
+    update_fields: Sequence[str] | None = None,
+) -> list[models.Model]:
+    """
+    Create Django instances for all DTOs using `QuerySet.bulk_create()`.
+
+    All rows are written in one transaction, using one query per ``batch_size``
+    rows. Pass ``update_conflicts=True`` and ``unique_fields`` to update existing rows
+    instead (upsert), updating all fields written by the DTO except the unique ones
+    unless ``update_fields`` is given. See `DjangoModelBase.to_django()` for the
+    fields written. No signals are sent and ``save()`` is not called, but caches
+    depending on the model are invalidated (see `notify_model_change()`).
+    """
+
+    if not dtos:
+        return []
+
+    django_model = _get_django_model(dtos)
+    dto_class = type(dtos[0])
+    if update_conflicts and update_fields is None:
+        update_fields = _get_upsert_update_fields(django_model, dto_class, unique_fields or ())
+
+    objs = dto_class.to_django_many(dtos)
+    using = router.db_for_write(django_model)
+    with transaction.atomic(using=using):
+        created = django_model._default_manager.db_manager(using).bulk_create(
+            objs,
+            batch_size=batch_size,
+            update_conflicts=update_conflicts,
+            unique_fields=unique_fields,
+            update_fields=update_fields,
+        )
+        notify_model_change(django_model, using=using)
+    return created
+
+
+def bulk_update(
+    dtos: Sequence[DjangoModelBase],
+    *,
+    batch_size: int = 1000,
+    fields: Sequence[str] | None = None,
+) -> int:
+    """
+    Update the rows of all DTOs (by primary key) using `QuerySet.bulk_update()`.
+
+    All rows are written in one transaction, using one query per ``batch_size``
+    rows. Updates all fields written by the DTO unless ``fields`` is given. Returns
+    the number of rows updated. Caches are invalidated like for `bulk_create()`.
+
+    Django builds a ``CASE`` expression per row and field here, which is slow for
+    many rows. Prefer `bulk_create()` using ``update_conflicts=True`` if creating
+    missing rows is fine.
+    """
+
+    if not dtos:
+        return 0
+
+    django_model = _get_django_model(dtos)
+    dto_class = type(dtos[0])
+    if fields is None:
+        fields = _get_upsert_update_fields(django_model, dto_class, ())
+
+    objs = dto_class.to_django_many(dtos)
+    using = router.db_for_write(django_model)
+    with transaction.atomic(using=using):
+        updated = django_model._default_manager.db_manager(using).bulk_update(objs, fields, batch_size=batch_size)
+        notify_model_change(django_model, using=using)
+    return updated
+
+
+async def abulk_create(
+    dtos: Sequence[DjangoModelBase],
+    *,
+    batch_size: int = 1000,
+    update_conflicts: bool = False,
+    unique_fields: Sequence[str] | None = None,
+    update_fields: Sequence[str] | None = None,
+) -> list[models.Model]:
+    """Async version of `bulk_create()`, running everything using a single `sync_to_async()` call."""
+
+    return await sync_to_async(bulk_create)(
+        dtos,
+        batch_size=batch_size,
+        update_conflicts=update_conflicts,
+        unique_fields=unique_fields,
+        update_fields=update_fields,
+    )
+
+
+async def abulk_update(
+    dtos: Sequence[DjangoModelBase],
+    *,
+    batch_size: int = 1000,
+    fields: Sequence[str] | None = None,
+) -> int:
+    """Async version of `bulk_update()`, running everything using a single `sync_to_async()` call."""
+
+    return await sync_to_async(bulk_update)(dtos, batch_size=batch_size, fields=fields)
@@ -0,0 +1,4 @@
+from .backends import CacheBackend, DjangoCacheBackend, LRUCacheBackend
+from .instances import DTOCache, DTOCacheStats
+from .invalidation import get_dto_models, invalidate_models, notify_model_change
+from .responses import cache_response
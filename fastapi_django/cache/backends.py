@@ -0,0 +1,115 @@
+import abc
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from django.core.cache import caches
+
+
+class CacheBackend(abc.ABC):
+    """
+    Storage used by the caches in `fastapi_django.cache`.
+
+    ``timeout`` is given in seconds, ``None`` means the value should be kept forever
+    (as long as the backend is able to). Missing keys are just left out of the result
+    of `get_many()`. The async methods call the sync ones by default, backends doing
+    I/O should override them.
+    """
+
+    @abc.abstractmethod
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        ...
+
+    @abc.abstractmethod
+    def set_many(self, values: Mapping[str, Any], timeout: float | None = None) -> None:
+        ...
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        ...
+
+    def get(self, key: str) -> Any | None:
+        return self.get_many([key]).get(key)
+
+    def set(self, key: str, value: Any, timeout: float | None = None) -> None:
+        self.set_many({key: value}, timeout)
+
+    async def aget_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        return self.get_many(keys)
+
+    async def aset_many(self, values: Mapping[str, Any], timeout: float | None = None) -> None:
+        self.set_many(values, timeout)
+
+    async def aget(self, key: str) -> Any | None:
+        return (await self.aget_many([key])).get(key)
+
+    async def aset(self, key: str, value: Any, timeout: float | None = None) -> None:
+        await self.aset_many({key: value}, timeout)
+
+
+class LRUCacheBackend(CacheBackend):
+    """
+    In-process cache keeping the ``max_size`` most recently used entries.
+
+    Each process has its own cache, so use `DjangoCacheBackend` if invalidation needs
+    to reach other processes.
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        self.max_size = max_size
+        # Maps the key to (expires at, value), most recently used last
+        self._entries: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        now = time.monotonic()
+        values = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                expires_at, value = entry
+                if expires_at is not None and expires_at <= now:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                values[key] = value
+        return values
+
+    def set_many(self, values: Mapping[str, Any], timeout: float | None = None) -> None:
+        expires_at = time.monotonic() + timeout if timeout is not None else None
+        with self._lock:
+            for key, value in values.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DjangoCacheBackend(CacheBackend):
+    """Store the entries using Django's cache framework, see ``settings.CACHES``."""
+
+    def __init__(self, alias: str = "default") -> None:
+        self.alias = alias
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        return caches[self.alias].get_many(list(keys))
+
+    def set_many(self, values: Mapping[str, Any], timeout: float | None = None) -> None:
+        caches[self.alias].set_many(dict(values), timeout)
+
+    def clear(self) -> None:
+        caches[self.alias].clear()
+
+    async def aget_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        return await caches[self.alias].aget_many(list(keys))
+
+    async def aset_many(self, values: Mapping[str, Any], timeout: float | None = None) -> None:
+        await caches[self.alias].aset_many(dict(values), timeout)
@@ -0,0 +1,223 @@
+import dataclasses
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from typing import Any, Generic, TypeVar
+
+from django.db import models
+
+from ..models import DjangoModelBase
+from .invalidation import get_dto_models, on_model_change
+
+DTOT = TypeVar("DTOT", bound=DjangoModelBase)
+
+
+@dataclasses.dataclass(frozen=True)
+class DTOCacheStats:
+    # Number of DTOs returned from the cache
+    hits: int
+    # Number of DTOs not found in the cache (or outdated), these needed to be loaded
+    misses: int
+    # Number of DTOs removed because the cache was full
+    evictions: int
+    # Number of DTOs currently cached
+    size: int
+
+
+class DTOCache(Generic[DTOT]):
+    """
+    Cache of DTOs for single rows, keyed by the primary key.
+
+    Keeps the ``max_size`` most recently used DTOs. Saving or deleting a row removes
+    its DTO, changes of any other model the DTO depends on (see `get_dto_models()`)
+    clear the whole cache. Changes not sending any signals need to call `invalidate()`.
+
+    If the model has a field changing on every update (like ``updated_at`` using
+    ``auto_now=True``), pass its name as ``version_field``. Cached DTOs are then checked
+    against the database using one cheap query, so changes made by other processes are
+    noticed, too.
+
+    The returned DTOs are shared, never modify them. See `DjangoModelBase.from_django()`
+    for ``trusted``. Create caches once (like the DTOs), they stay connected to the
+    Django signals forever.
+    """
+
+    def __init__(
+        self,
+        dto_class: type[DTOT],
+        *,
+        queryset: models.QuerySet | None = None,
+        max_size: int = 1024,
+        version_field: str | None = None,
+        trusted: bool | None = None,
+    ) -> None:
+        if dto_class._django_model is None:
+            raise ValueError(f"{dto_class.__name__} was not created by django_to_pydantic_model()")
+
+        self.dto_class = dto_class
+        self.model_class = dto_class._django_model
+        self.queryset = queryset if queryset is not None else self.model_class._default_manager.all()
+        self.max_size = max_size
+        self.version_field = version_field
+        self.trusted = trusted
+
+        # Maps the primary key to (version, DTO), most recently used last
+        self._entries: OrderedDict[Hashable, tuple[Any, DTOT]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Incremented on every invalidation, so DTOs loaded while the data changed are
+        # not cached
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        on_model_change(get_dto_models(dto_class), self._handle_model_change)
+
+    def _handle_model_change(
+        self,
+        model_class: type[models.Model],
+        instance: models.Model | None,
+    ) -> None:
+        if model_class is self.model_class and instance is not None:
+            self.invalidate(instance.pk)
+        else:
+            self.clear()
+
+    def _get_load_queryset(self) -> models.QuerySet:
+        if self.version_field is None:
+            return self.dto_class.project(self.queryset)
+        return self.dto_class.apply_related(self.queryset.only(
+            *self.dto_class._get_django_only_names(),
+            self.version_field,
+        ))
+
+    def _get_cached(
+        self,
+        pks: list[Hashable],
+    ) -> tuple[dict[Hashable, tuple[Any, DTOT]], int]:
+        with self._lock:
+            cached = {}
+            for pk in pks:
+                entry = self._entries.get(pk)
+                if entry is not None:
+                    self._entries.move_to_end(pk)
+                    cached[pk] = entry
+            return cached, self._generation
+
+    def _get_valid(
+        self,
+        cached: dict[Hashable, tuple[Any, DTOT]],
+        versions: dict[Hashable, Any] | None,
+    ) -> dict[Hashable, DTOT]:
+        return {
+            pk: dto
+            for pk, (version, dto)
+            in cached.items()
+            if versions is None or (pk in versions and versions[pk] == version)
+        }
+
+    def _add(
+        self,
+        pks: list[Hashable],
+        dtos: dict[Hashable, DTOT],
+        objs: list[models.Model],
+        loaded_dtos: list[DTOT],
+        generation: int,
+    ) -> dict[Hashable, DTOT]:
+        """Cache the loaded objects (and their DTOs) and return the DTOs for all pks in the given order."""
+
+        with self._lock:
+            self._hits += len(dtos)
+            self._misses += len(pks) - len(dtos)
+            for obj, dto in zip(objs, loaded_dtos, strict=True):
+                dtos[obj.pk] = dto
+                if generation != self._generation:
+                    # The data changed while loading, it might be outdated already
+                    continue
+                version = getattr(obj, self.version_field) if self.version_field is not None else None
+                self._entries[obj.pk] = (version, dto)
+                self._entries.move_to_end(obj.pk)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+        return {
+            pk: dtos[pk]
+            for pk
+            in pks
+            if pk in dtos
+        }
+
+    def get_many(self, pks: Iterable[Hashable]) -> dict[Hashable, DTOT]:
+        """
+        Return the DTOs for the given primary keys, rows not existing are left out.
+
+        Only DTOs not cached already are loaded from the database, using one query (plus
+        the ones needed for the relations, see `DjangoModelBase.apply_related()`).
+        """
+
+        pks = list(dict.fromkeys(pks))
+        cached, generation = self._get_cached(pks)
+        versions = None
+        if self.version_field is not None and cached:
+            versions = dict(
+                self.queryset.filter(pk__in=cached.keys()).values_list("pk", self.version_field),
+            )
+        dtos = self._get_valid(cached, versions)
+
+        missing_pks = [pk for pk in pks if pk not in dtos]
+        objs = list(self._get_load_queryset().filter(pk__in=missing_pks)) if missing_pks else []
+        loaded_dtos = self.dto_class.from_django_many(objs, trusted=self.trusted)
+        return self._add(pks, dtos, objs, loaded_dtos, generation)
+
+    async def aget_many(self, pks: Iterable[Hashable]) -> dict[Hashable, DTOT]:
+        """Async version of `get_many()`."""
+
+        pks = list(dict.fromkeys(pks))
+        cached, generation = self._get_cached(pks)
+        versions = None
+        if self.version_field is not None and cached:
+            versions = {
+                pk: version
+                async for pk, version
+                in self.queryset.filter(pk__in=cached.keys()).values_list("pk", self.version_field)
+            }
+        dtos = self._get_valid(cached, versions)
+
+        missing_pks = [pk for pk in pks if pk not in dtos]
+        objs = [
+            obj
+            async for obj
+            in self._get_load_queryset().filter(pk__in=missing_pks)
+        ] if missing_pks else []
+        loaded_dtos = await self.dto_class._afrom_django_many(objs, self.trusted)
+        return self._add(pks, dtos, objs, loaded_dtos, generation)
+
+    def get(self, pk: Hashable) -> DTOT | None:
+        """Return the DTO for the primary key, ``None`` if the row does not exist."""
+
+        return self.get_many([pk]).get(pk)
+
+    async def aget(self, pk: Hashable) -> DTOT | None:
+        """Async version of `get()`."""
+
+        return (await self.aget_many([pk])).get(pk)
+
+    def invalidate(self, *pks: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            for pk in pks:
+                self._entries.pop(pk, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def get_stats(self) -> DTOCacheStats:
+        return DTOCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            size=len(self._entries),
+        )
@@ -0,0 +1,196 @@
+import threading
+import uuid
+from collections.abc import Callable, Iterable
+from typing import Any, TypeAlias, cast
+
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from ..models import DjangoModelBase
+from .backends import CacheBackend
+
+VERSION_KEY_PREFIX = "fastapi_django:version:"
+
+ModelChangeCallback: TypeAlias = Callable[[type[models.Model], models.Model | None], None]
+
+# Maps the models to the backends caching data depending on them, see `track_models()`
+_tracked_models: dict[type[models.Model], set[CacheBackend]] = {}
+# Maps the models to the functions to call on changes, see `on_model_change()`
+_model_change_callbacks: dict[type[models.Model], list[ModelChangeCallback]] = {}
+_model_change_callbacks_lock = threading.Lock()
+
+
+def get_dto_models(dto_class: type[DjangoModelBase]) -> frozenset[type[models.Model]]:
+    """
+    Return all models the data of the DTO depends on.
+
+    This includes the models of nested relations, the through models of many to many
+    relations and the models referenced by foreign keys. The latter are needed because
+    deleting them may change the foreign key without sending any signals for the
+    model itself (``on_delete=models.SET_NULL`` and friends).
+    """
+
+    dto_models: set[type[models.Model]] = set()
+    if dto_class._django_model is not None:
+        dto_models.add(dto_class._django_model)
+
+    relation_fields = [
+        *dto_class._django_fields.values(),
+        *(django_field for django_field, _ in dto_class._django_relations.values()),
+    ]
+    for django_field in relation_fields:
+        if not django_field.is_relation or django_field.related_model is None:
+            continue
+        dto_models.add(cast(type[models.Model], django_field.related_model))
+        # Many to many fields store the through model on the remote field, the reverse
+        # relations on themselves
+        through_model = (
+            getattr(django_field.remote_field, "through", None)
+            or getattr(django_field, "through", None)
+        )
+        if through_model is not None:
+            dto_models.add(through_model)
+
+    for _, nested_model_class in dto_class._django_relations.values():
+        dto_models |= get_dto_models(nested_model_class)
+
+    return frozenset(dto_models)
+
+
+def _get_version_key(model_class: type[models.Model]) -> str:
+    return f"{VERSION_KEY_PREFIX}{model_class._meta.label_lower}"
+
+
+def _new_version() -> str:
+    # Random versions instead of counters, so backends may lose the version at any time
+    # (evicted or expired) without old entries becoming valid again
+    return uuid.uuid4().hex
+
+
+async def aget_model_versions(
+    backend: CacheBackend,
+    model_classes: Iterable[type[models.Model]],
+) -> list[str]:
+    """Return the current versions of the models, in the given order."""
+
+    keys = [_get_version_key(model_class) for model_class in model_classes]
+    versions = await backend.aget_many(keys)
+    missing_versions = {
+        key: _new_version()
+        for key
+        in keys
+        if key not in versions
+    }
+    if missing_versions:
+        await backend.aset_many(missing_versions)
+        versions.update(missing_versions)
+    return [versions[key] for key in keys]
+
+
+def invalidate_models(
+    *model_classes: type[models.Model],
+    backend: CacheBackend | None = None,
+) -> None:
+    """
+    Invalidate everything cached for the given models.
+
+    Happens automatically when saving or deleting instances. Use this after changes not
+    sending any signals, like `QuerySet.update()` or `QuerySet.bulk_create()`. Uses all
+    backends tracking the models (see `track_models()`) if no backend is given.
+    """
+
+    backends: dict[CacheBackend, list[type[models.Model]]] = {}
+    for model_class in model_classes:
+        model_backends = {backend} if backend is not None else _tracked_models.get(model_class, set())
+        for model_backend in model_backends:
+            backends.setdefault(model_backend, []).append(model_class)
+
+    for model_backend, backend_model_classes in backends.items():
+        model_backend.set_many({
+            _get_version_key(model_class): _new_version()
+            for model_class
+            in backend_model_classes
+        })
+
+
+def _handle_model_change(
+    sender: type[models.Model],
+    instance: models.Model | None = None,
+    **kwargs: Any,
+) -> None:
+    callbacks = list(_model_change_callbacks.get(sender, ()))
+
+    def notify() -> None:
+        for callback in callbacks:
+            callback(sender, instance)
+
+    notify()
+    # Requests running while the transaction is still open might cache the old data
+    # again, so notify again once the data is visible to everyone
+    connection = transaction.get_connection(kwargs.get("using") or "default")
+    if connection.in_atomic_block:
+        transaction.on_commit(notify, using=connection.alias)
+
+
+def _handle_m2m_change(sender: type[models.Model], action: str, **kwargs: Any) -> None:
+    if action.startswith("post_"):
+        # The instance passed is the one whose relation changed, not a through model
+        # instance - the callbacks cannot use it
+        _handle_model_change(sender, using=kwargs.get("using"))
+
+
+def notify_model_change(*model_classes: type[models.Model], using: str | None = None) -> None:
+    """
+    Call the callbacks of the models (see `on_model_change()`) for changes not sending
+    any signals, like `QuerySet.update()` or `QuerySet.bulk_create()`.
+
+    Unlike `invalidate_models()` this also covers everything else depending on the
+    models, like `DTOCache`.
+    """
+
+    for model_class in model_classes:
+        _handle_model_change(model_class, using=using)
+
+
+def on_model_change(
+    model_classes: Iterable[type[models.Model]],
+    callback: ModelChangeCallback,
+) -> None:
+    """
+    Call ``callback(model_class, instance)`` whenever instances of the models change.
+
+    Covers saving and deleting instances and changes of many to many relations (for
+    their through models). ``instance`` is ``None`` if the changed rows are unknown.
+    Inside a transaction the callback is called again after the commit.
+    """
+
+    with _model_change_callbacks_lock:
+        for model_class in model_classes:
+            if model_class not in _model_change_callbacks:
+                # Only connect to the models we need, so deletes of other models may
+                # still be done without fetching the instances
+                dispatch_uid = f"fastapi_django.cache:{model_class._meta.label_lower}"
+                post_save.connect(_handle_model_change, sender=model_class, dispatch_uid=dispatch_uid)
+                post_delete.connect(_handle_model_change, sender=model_class, dispatch_uid=dispatch_uid)
+                m2m_changed.connect(_handle_m2m_change, sender=model_class, dispatch_uid=dispatch_uid)
+            _model_change_callbacks.setdefault(model_class, []).append(callback)
+
+
+def track_models(
+    backend: CacheBackend,
+    model_classes: Iterable[type[models.Model]],
+) -> None:
+    """Invalidate the data cached in ``backend`` whenever instances of the models change."""
+
+    new_model_classes = []
+    with _model_change_callbacks_lock:
+        for model_class in model_classes:
+            model_backends = _tracked_models.setdefault(model_class, set())
+            if backend not in model_backends:
+                model_backends.add(backend)
+                new_model_classes.append(model_class)
+
+    on_model_change(
+        new_model_classes,
+        lambda model_class, _instance: invalidate_models(model_class, backend=backend),
+    )
@@ -0,0 +1,184 @@
+import functools
+import hashlib
+import inspect
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any, ParamSpec
+
+import pydantic
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+from ..formats import DEFAULT_FORMATS, DTOFormat, negotiate_format
+from ..models import DjangoModelBase
+from ..responses import DTOQuerysetResponse, DTOResponse
+from .backends import CacheBackend, LRUCacheBackend
+from .invalidation import aget_model_versions, get_dto_models, track_models
+
+P = ParamSpec("P")
+
+RESPONSE_KEY_PREFIX = "fastapi_django:response:"
+
+# Headers of the cached response sent with a 304 Not Modified as well (RFC 9110)
+_NOT_MODIFIED_HEADERS = ("cache-control", "content-location", "expires", "vary")
+
+# Backend used if none is passed to `cache_response()`
+default_response_cache_backend: CacheBackend = LRUCacheBackend()
+
+
+def _get_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _matches_etag(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so ignore any W/ prefix
+    return etag in (
+        tag.strip().removeprefix("W/")
+        for tag
+        in if_none_match.split(",")
+    )
+
+
+def _get_not_modified_response(response: Response, etag: str) -> Response:
+    not_modified_response = Response(status_code=304, headers={"etag": etag})
+    for name in _NOT_MODIFIED_HEADERS:
+        value = response.headers.get(name)
+        if value is not None:
+            not_modified_response.headers[name] = value
+    return not_modified_response
+
+
+def _get_request_parameter(signature: inspect.Signature) -> inspect.Parameter | None:
+    for parameter in signature.parameters.values():
+        if parameter.annotation is Request:
+            return parameter
+    return None
+
+
+async def _get_response(result: Any, accept: str | None) -> Response:
+    """Convert the result of the endpoint to a response with a rendered body."""
+
+    if isinstance(result, DTOQuerysetResponse):
+        await result.render_queryset(accept)
+        return result
+    if isinstance(result, Response):
+        return result
+    if isinstance(result, pydantic.BaseModel) or (
+        isinstance(result, list)
+        and result
+        and all(isinstance(item, pydantic.BaseModel) for item in result)
+    ):
+        return DTOResponse(result)
+    return JSONResponse(jsonable_encoder(result))
+
+
+def cache_response(
+    *dto_classes: type[DjangoModelBase],
+    backend: CacheBackend | None = None,
+    timeout: float | None = 300,
+    formats: Sequence[DTOFormat] = DEFAULT_FORMATS,
+) -> Callable[[Callable[P, Awaitable[Any]]], Callable[P, Awaitable[Response]]]:
+    """
+    Cache the responses of an async FastAPI endpoint returning the given DTOs.
+
+    Responses are cached per path, query string and format (see
+    `fastapi_django.formats.negotiate_format()`) and get a strong ``ETag``, requests
+    sending a matching ``If-None-Match`` header get a ``304 Not Modified``. Pass the
+    ``formats`` the response of the endpoint negotiates, otherwise different formats
+    may be cached using the same key. Saving or
+    deleting instances of any model the DTOs depend on (see `get_dto_models()`)
+    invalidates all cached responses. Changes not sending any signals need to call
+    `invalidate_models()`.
+
+    Use below the route decorator::
+
+        @router.get("/somethings/", response_model=list[SomethingDTO])
+        @cache_response(SomethingDTO)
+        async def get_somethings() -> ...:
+            ...
+
+    Only responses with status code 200 are cached, streaming responses are never
+    cached. Returned DTOs are rendered using `DTOResponse`, so they are not validated
+    against ``response_model`` again.
+    """
+
+    response_backend = backend or default_response_cache_backend
+    model_classes = sorted(
+        {
+            model_class
+            for dto_class
+            in dto_classes
+            for model_class
+            in get_dto_models(dto_class)
+        },
+        key=lambda model_class: model_class._meta.label_lower,
+    )
+    track_models(response_backend, model_classes)
+
+    def decorator(func: Callable[P, Awaitable[Any]]) -> Callable[P, Awaitable[Response]]:
+        signature = inspect.signature(func, eval_str=True)
+        request_parameter = _get_request_parameter(signature)
+        add_request_parameter = request_parameter is None
+        if request_parameter is None:
+            # Let FastAPI pass the request, too
+            request_parameter = inspect.Parameter(
+                "_cache_request",
+                inspect.Parameter.KEYWORD_ONLY,
+                annotation=Request,
+            )
+            signature = signature.replace(parameters=[
+                *signature.parameters.values(),
+                request_parameter,
+            ])
+        request_parameter_name = request_parameter.name
+        key_prefix = f"{RESPONSE_KEY_PREFIX}{func.__module__}.{func.__qualname__}:"
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> Response:
+            request: Request = (
+                kwargs.pop(request_parameter_name)  # type: ignore
+                if add_request_parameter
+                else kwargs[request_parameter_name]
+            )
+            accept = request.headers.get("accept")
+            versions = await aget_model_versions(response_backend, model_classes)
+            key = key_prefix + hashlib.blake2b(
+                "\n".join((
+                    request.url.path,
+                    request.url.query,
+                    # Not the header itself, clients send way too many variants
+                    negotiate_format(accept, formats).name,
+                    *versions,
+                )).encode(),
+                digest_size=16,
+            ).hexdigest()
+
+            cached = await response_backend.aget(key)
+            if cached is None:
+                response = await _get_response(await func(*args, **kwargs), accept)
+                if response.status_code != 200 or isinstance(response, StreamingResponse):
+                    return response
+                etag = _get_etag(response.body)
+                response.headers["etag"] = etag
+                await response_backend.aset(
+                    key,
+                    (etag, response.body, response.raw_headers),
+                    timeout,
+                )
+            else:
+                etag, body, raw_headers = cached
+                response = Response(body)
+                response.raw_headers = list(raw_headers)
+
+            if _matches_etag(request.headers.get("if-none-match"), etag):
+                return _get_not_modified_response(response, etag)
+            return response
+
+        wrapper.__signature__ = signature  # type: ignore
+        return wrapper
+
+    return decorator
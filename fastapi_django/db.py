@@ -0,0 +1,176 @@
+import contextlib
+import dataclasses
+import threading
+import time
+from collections.abc import Sequence
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.core import signals
+from django.db import connections
+from django.db.backends.signals import connection_created
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .executor import ORMExecutor
+
+
+@dataclasses.dataclass(frozen=True)
+class DBConnectionStats:
+    # Number of requests handled by `DjangoDBConnectionMiddleware`
+    requests: int
+    # Number of those requests using an already open connection
+    reused: int
+    # Number of connections opened by any thread (see Django's connection_created signal)
+    connections_created: int
+    # Time spent opening connections at the start of requests
+    connect_seconds: float
+    # Number of connections left open by the last request, these will be reused
+    open_connections: int
+
+    @property
+    def reuse_rate(self) -> float:
+        return self.reused / self.requests if self.requests else 0.0
+
+
+class _DBConnectionMetrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._requests = 0
+            self._reused = 0
+            self._connections_created = 0
+            self._connect_seconds = 0.0
+            self._open_connections = 0
+
+    def add_connection_created(self) -> None:
+        with self._lock:
+            self._connections_created += 1
+
+    def add_request(self, *, reused: bool, connect_seconds: float) -> None:
+        with self._lock:
+            self._requests += 1
+            self._reused += reused
+            self._connect_seconds += connect_seconds
+
+    def set_open_connections(self, open_connections: int) -> None:
+        self._open_connections = open_connections
+
+    def get_stats(self) -> DBConnectionStats:
+        return DBConnectionStats(
+            requests=self._requests,
+            reused=self._reused,
+            connections_created=self._connections_created,
+            connect_seconds=self._connect_seconds,
+            open_connections=self._open_connections,
+        )
+
+
+db_connection_metrics = _DBConnectionMetrics()
+
+
+def _handle_connection_created(**_kwargs: Any) -> None:
+    db_connection_metrics.add_connection_created()
+
+
+connection_created.connect(
+    _handle_connection_created,
+    dispatch_uid="fastapi_django.db:connection_created",
+)
+
+
+# Number of requests currently using the connections of a thread, see
+# `DjangoDBConnectionMiddleware`. Only accessed from that thread itself
+_thread_requests = threading.local()
+
+
+def get_db_connection_stats() -> DBConnectionStats:
+    """Return statistics about the database connections used by the FastAPI mounts."""
+
+    return db_connection_metrics.get_stats()
+
+
+class DjangoDBConnectionMiddleware:
+    """
+    Manage the Django database connections for each request, like Django itself does.
+
+    Django only closes unusable connections and connections older than ``CONN_MAX_AGE``
+    in the ``request_started`` and ``request_finished`` signals, which are not sent for
+    requests handled by FastAPI. This middleware sends them in the thread running the
+    ORM code (see `asgiref.sync.sync_to_async()`), so connections are reused across
+    requests as configured - including ``CONN_HEALTH_CHECKS``.
+
+    The connections for ``aliases`` are opened at the start of the request, so the time
+    spent connecting can be measured. Pass an empty sequence to connect lazily on first
+    use instead. See `get_db_connection_stats()`.
+
+    Pass an ``executor`` to run the ORM code of each request in one of its lanes, see
+    `ORMExecutor`. The connections are then managed in the thread of that lane.
+
+    Concurrent requests may share the thread (and thus the connections): the shared
+    thread of `sync_to_async()`, or a lane when there are more requests than lanes.
+    Closing a connection would break the others (like a streaming response reading
+    a cursor), so the signals are only sent by the first request starting and the
+    last request finishing in the thread - connections are only recycled once the
+    thread is idle.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        aliases: Sequence[str] = ("default",),
+        executor: ORMExecutor | None = None,
+    ) -> None:
+        self.app = app
+        self.aliases = aliases
+        self.executor = executor
+
+    def _start_request(self, scope: Scope) -> None:
+        active_requests = getattr(_thread_requests, "active", 0)
+        if not active_requests:
+            signals.request_started.send(sender=self.__class__, scope=scope)
+        _thread_requests.active = active_requests + 1
+
+        reused = True
+        connect_seconds = 0.0
+        try:
+            for alias in self.aliases:
+                connection = connections[alias]
+                if connection.connection is not None:
+                    continue
+                reused = False
+                start = time.perf_counter()
+                connection.ensure_connection()
+                connect_seconds += time.perf_counter() - start
+        except BaseException:
+            self._finish_request()
+            raise
+        db_connection_metrics.add_request(reused=reused, connect_seconds=connect_seconds)
+
+    def _finish_request(self) -> None:
+        _thread_requests.active -= 1
+        if not _thread_requests.active:
+            signals.request_finished.send(sender=self.__class__)
+
+        db_connection_metrics.set_open_connections(sum(
+            1
+            for connection
+            in connections.all(initialized_only=True)
+            if connection.connection is not None
+        ))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async with self.executor.lane() if self.executor is not None else contextlib.nullcontext():
+            # Both need to run in the same thread as the ORM code, connections are thread local
+            await sync_to_async(self._start_request, thread_sensitive=True)(scope)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                await sync_to_async(self._finish_request, thread_sensitive=True)()
@@ -0,0 +1,249 @@
+import contextlib
+import dataclasses
+import threading
+import time
+import weakref
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import ClassVar, ParamSpec, TypeVar
+
+import asgiref
+from asgiref.sync import SyncToAsync, ThreadSensitiveContext, sync_to_async
+from django.db import connections
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# Internals of asgiref the lanes (and fastapi_django.testing) rely on, tested with
+# asgiref 3.7 - 3.12 (see pyproject.toml)
+_ASGIREF_INTERNALS = ("context_to_thread_executor", "thread_sensitive_context", "single_thread_executor")
+
+
+def _check_asgiref_internals() -> None:
+    """
+    Raise RuntimeError if the installed asgiref lacks the internals used for the lanes.
+
+    Fails loudly, otherwise a changed asgiref would silently run all ORM code in the
+    shared thread again (or break sharing the connections in tests).
+    """
+
+    missing = [name for name in _ASGIREF_INTERNALS if not hasattr(SyncToAsync, name)]
+    if missing:
+        raise RuntimeError(
+            f"asgiref {asgiref.__version__} is not supported, SyncToAsync has no "
+            f"{', '.join(missing)}",
+        )
+
+
+@dataclasses.dataclass(frozen=True)
+class ORMExecutorStats:
+    # Number of lanes, each running the ORM code in its own thread (and connection)
+    lanes: int
+    # Number of requests currently assigned to a lane
+    active_requests: int
+    # Number of sync calls submitted to the lanes
+    calls: int
+    # Number of sync calls currently waiting for their lane's thread
+    queue_depth: int
+    # Highest queue depth seen so far
+    max_queue_depth: int
+    # Total and highest time sync calls waited for their lane's thread
+    wait_seconds: float
+    max_wait_seconds: float
+
+
+class _ORMExecutorMetrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def add_queued(self) -> None:
+        with self._lock:
+            self.calls += 1
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+    def add_started(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.queue_depth -= 1
+            self.wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+
+class _LaneThreadPoolExecutor(ThreadPoolExecutor):
+    """Single thread executor recording how long calls wait for the thread."""
+
+    def __init__(self, metrics: _ORMExecutorMetrics, thread_name_prefix: str) -> None:
+        super().__init__(max_workers=1, thread_name_prefix=thread_name_prefix)
+        self._metrics = metrics
+
+    def submit(self, fn: Callable[P, T], /, *args: P.args, **kwargs: P.kwargs) -> Future[T]:
+        queued_at = time.perf_counter()
+        self._metrics.add_queued()
+
+        def run() -> T:
+            self._metrics.add_started(time.perf_counter() - queued_at)
+            return fn(*args, **kwargs)
+
+        return super().submit(run)
+
+
+@dataclasses.dataclass(eq=False)
+class _Lane:
+    executor: _LaneThreadPoolExecutor
+    # Used as the key for asgiref to find the executor, never entered itself
+    context: ThreadSensitiveContext
+    active_requests: int = 0
+
+
+class ORMExecutor:
+    """
+    Run the ORM code of concurrent requests in parallel, using a fixed number of lanes.
+
+    Django's async ORM uses `sync_to_async(thread_sensitive=True)`, which runs all
+    calls in one shared thread - so queries of concurrent requests never run in
+    parallel. Each lane is a thread of its own (and thus has its own database
+    connections). A request is assigned to the least busy lane using `lane()` and runs
+    all its sync code in that lane's thread, so it uses the same connection for its
+    whole lifetime.
+
+    Lanes are not exclusive: with more concurrent requests than lanes, requests share
+    a lane - its thread and connections. Like with Django's async ORM, keep
+    transactions inside one sync function (run using `sync_to_async()`), never spanning
+    an ``await``, otherwise another request's queries end up in the transaction.
+    `fastapi_django.db.DjangoDBConnectionMiddleware` only recycles the connections of
+    a lane once no request uses it anymore.
+
+    Size ``lanes`` to the database connection budget of the process, every lane will
+    keep its own connection open (see ``CONN_MAX_AGE``).
+    """
+
+    # All created executors, see `_get_all_lane_executors()`
+    _instances: ClassVar["weakref.WeakSet[ORMExecutor]"] = weakref.WeakSet()
+
+    def __init__(
+        self,
+        lanes: int = 4,
+        *,
+        thread_name_prefix: str = "orm",
+    ) -> None:
+        if lanes < 1:
+            raise ValueError("At least one lane is needed")
+        _check_asgiref_internals()
+
+        self._metrics = _ORMExecutorMetrics()
+        self._lanes = [
+            _Lane(
+                executor=_LaneThreadPoolExecutor(self._metrics, f"{thread_name_prefix}-{i}"),
+                context=ThreadSensitiveContext(),
+            )
+            for i
+            in range(lanes)
+        ]
+        for lane in self._lanes:
+            SyncToAsync.context_to_thread_executor[lane.context] = lane.executor
+        self._lock = threading.Lock()
+        self._next_lane = 0
+        self._closed = False
+        self._instances.add(self)
+
+    @classmethod
+    def _get_all_lane_executors(cls) -> list[ThreadPoolExecutor]:
+        """Return the executors of all lanes of all executors, used for testing."""
+
+        return [
+            lane.executor
+            for orm_executor
+            in list(cls._instances)
+            for lane
+            in orm_executor._lanes
+        ]
+
+    def _acquire_lane(self) -> _Lane:
+        with self._lock:
+            # Least busy lane, starting the search at a different lane every time so
+            # idle lanes are used in turns
+            lanes = self._lanes[self._next_lane:] + self._lanes[:self._next_lane]
+            lane = min(lanes, key=lambda lane: lane.active_requests)
+            lane.active_requests += 1
+            self._next_lane = (self._next_lane + 1) % len(self._lanes)
+            return lane
+
+    def _release_lane(self, lane: _Lane) -> None:
+        with self._lock:
+            lane.active_requests -= 1
+
+    @contextlib.asynccontextmanager
+    async def lane(self) -> AsyncIterator[None]:
+        """
+        Run all sync code inside the block in the thread of one lane.
+
+        Nesting is fine, nested blocks (and blocks inside any other
+        `asgiref.sync.ThreadSensitiveContext`) stay in the current thread.
+        """
+
+        if SyncToAsync.thread_sensitive_context.get(None) is not None:
+            yield
+            return
+        if self._closed:
+            raise RuntimeError("ORMExecutor is closed")
+
+        lane = self._acquire_lane()
+        try:
+            async with self._use_lane(lane):
+                yield
+        finally:
+            self._release_lane(lane)
+
+    async def dependency(self) -> AsyncIterator[None]:
+        """
+        FastAPI dependency assigning the request to a lane, see `lane()`.
+
+        Use like ``dependencies=[Depends(orm_executor.dependency)]`` on the app or
+        router.
+        """
+
+        async with self.lane():
+            yield
+
+    def get_stats(self) -> ORMExecutorStats:
+        return ORMExecutorStats(
+            lanes=len(self._lanes),
+            active_requests=sum(lane.active_requests for lane in self._lanes),
+            calls=self._metrics.calls,
+            queue_depth=self._metrics.queue_depth,
+            max_queue_depth=self._metrics.max_queue_depth,
+            wait_seconds=self._metrics.wait_seconds,
+            max_wait_seconds=self._metrics.max_wait_seconds,
+        )
+
+    async def aclose(self) -> None:
+        """
+        Close the database connections of all lanes and stop their threads.
+
+        Call this on shutdown of the app (like ``app.add_event_handler("shutdown",
+        orm_executor.aclose)``), otherwise the connections of the lanes are never
+        closed. Calling it again does nothing.
+        """
+
+        if self._closed:
+            return
+        self._closed = True
+        for lane in self._lanes:
+            async with self._use_lane(lane):
+                await sync_to_async(connections.close_all)()
+            SyncToAsync.context_to_thread_executor.pop(lane.context, None)
+            lane.executor.shutdown()
+        self._instances.discard(self)
+
+    @contextlib.asynccontextmanager
+    async def _use_lane(self, lane: _Lane) -> AsyncIterator[None]:
+        token = SyncToAsync.thread_sensitive_context.set(lane.context)
+        try:
+            yield
+        finally:
+            SyncToAsync.thread_sensitive_context.reset(token)
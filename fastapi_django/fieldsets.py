@@ -0,0 +1,194 @@
+import dataclasses
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Annotated, Generic, TypeVar
+
+from fastapi import HTTPException, Query, status
+
+from .models import DjangoModelBase
+from .models.models import _create_pydantic_model
+
+DTOT = TypeVar("DTOT", bound=DjangoModelBase)
+
+# Number of subset DTOs kept per process, see `get_subset_dto()`
+DEFAULT_MAX_VARIANTS = 256
+
+
+@dataclasses.dataclass(frozen=True)
+class SubsetDTOStats:
+    # Number of subset DTOs created
+    created: int
+    # Number of calls returning an already created subset DTO
+    cache_hits: int
+    # Number of subset DTOs dropped to stay below the maximum number of variants
+    evicted: int
+    # Number of subset DTOs currently cached
+    size: int
+
+
+class _SubsetDTOCache:
+    """
+    Bounded LRU cache of the subset DTOs created for sparse fieldsets.
+
+    Clients choose the fields, so the number of possible subsets is huge. Unlike
+    `DTORegistry` only the ``max_variants`` last used subset DTOs are kept.
+    """
+
+    def __init__(self, max_variants: int = DEFAULT_MAX_VARIANTS) -> None:
+        self.max_variants = max_variants
+        self._models: OrderedDict[tuple[type[DjangoModelBase], frozenset[str]], type[DjangoModelBase]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._created = 0
+        self._cache_hits = 0
+        self._evicted = 0
+
+    def get_or_create(self, dto_class: type[DjangoModelBase], names: frozenset[str]) -> type[DjangoModelBase]:
+        key = (dto_class, names)
+        with self._lock:
+            subset_dto_class = self._models.get(key)
+            if subset_dto_class is not None:
+                self._models.move_to_end(key)
+                self._cache_hits += 1
+                return subset_dto_class
+
+            subset_dto_class = _create_subset_dto(dto_class, names)
+            self._created += 1
+            self._models[key] = subset_dto_class
+            while len(self._models) > self.max_variants:
+                self._models.popitem(last=False)
+                self._evicted += 1
+            return subset_dto_class
+
+    def get_stats(self) -> SubsetDTOStats:
+        return SubsetDTOStats(
+            created=self._created,
+            cache_hits=self._cache_hits,
+            evicted=self._evicted,
+            size=len(self._models),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+            self._created = 0
+            self._cache_hits = 0
+            self._evicted = 0
+
+
+subset_dto_cache = _SubsetDTOCache()
+
+
+def get_subset_dto_stats() -> SubsetDTOStats:
+    """Return statistics about the subset DTOs created by `get_subset_dto()`."""
+
+    return subset_dto_cache.get_stats()
+
+
+def get_selectable_fields(dto_class: type[DjangoModelBase]) -> dict[str, str]:
+    """
+    Return the fields of the DTO clients may select, mapping the public name to the field name.
+
+    The public name is the key in the dumped data (the alias, if any). Only fields
+    backed by a Django field and nested relations can be selected.
+    """
+
+    selectable = {}
+    for name, field_info in dto_class.model_fields.items():
+        if name in dto_class._django_fields or name in dto_class._django_relations:
+            selectable[field_info.alias or name] = name
+    return selectable
+
+
+def _create_subset_dto(dto_class: type[DjangoModelBase], names: frozenset[str]) -> type[DjangoModelBase]:
+    # Same as calling django_to_pydantic_model(include=...), but skipping the registry
+    # (which keeps every model forever)
+    django_model = dto_class._django_model
+    if django_model is None:
+        raise TypeError(f"{dto_class.__name__} was not created by django_to_pydantic_model()")
+
+    include = set()
+    relations = {}
+    for name in names:
+        if name in dto_class._django_relations:
+            _, nested_model_class = dto_class._django_relations[name]
+            relations[name] = nested_model_class
+            continue
+        django_field = dto_class._django_fields[name]
+        include.add(django_field.name)
+        # Foreign keys are only included if both names are
+        if hasattr(django_field, "attname"):
+            include.add(django_field.attname)
+
+    subset_dto_class = _create_pydantic_model(
+        django_model,
+        skip_unknown_field_types=True,
+        include=include,
+        exclude=None,
+        relations=relations or None,
+    )
+    subset_dto_class.django_trusted = dto_class.django_trusted
+    return subset_dto_class
+
+
+def get_subset_dto(dto_class: type[DTOT], fields: Iterable[str]) -> type[DTOT]:
+    """
+    Return a DTO containing only the given fields of ``dto_class``, by public name.
+
+    The subset DTO is created like using ``django_to_pydantic_model(include=...)``,
+    so querysets converted using it only load the selected columns (see
+    `DjangoModelBase.project()`). Custom validators or fields of ``dto_class`` are not
+    copied. Subset DTOs are cached, keeping a bounded number of variants (see
+    `get_subset_dto_stats()`). Raises ValueError for fields not selectable (see
+    `get_selectable_fields()`).
+    """
+
+    selectable = get_selectable_fields(dto_class)
+    fields = set(fields)
+    unknown = fields - selectable.keys()
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    if fields == selectable.keys():
+        return dto_class
+
+    names = frozenset(selectable[field] for field in fields)
+    return subset_dto_cache.get_or_create(dto_class, names)  # type: ignore
+
+
+class SparseFields(Generic[DTOT]):
+    """
+    FastAPI dependency for the ``fields`` query parameter selecting the fields to send.
+
+    Returns the DTO to use for the response, see `get_subset_dto()`::
+
+        somethings_fields = SparseFields(SomethingDTO)
+
+        @router.get("/somethings/", response_model=list[SomethingDTO])
+        async def get_somethings(
+            dto_class: Annotated[type[SomethingDTO], Depends(somethings_fields)],
+        ) -> DTOQuerysetResponse:
+            return DTOQuerysetResponse(dto_class, dto_class.project(Something.objects.all()))
+
+    Only use this for endpoints returning DTO responses (like `DTOQuerysetResponse`),
+    FastAPI would validate other results against the full ``response_model``.
+    """
+
+    def __init__(self, dto_class: type[DTOT]) -> None:
+        self.dto_class = dto_class
+
+    def __call__(
+        self,
+        fields: Annotated[
+            str | None,
+            Query(description="Comma separated list of the fields to return, all fields if not given"),
+        ] = None,
+    ) -> type[DTOT]:
+        selected = [field.strip() for field in (fields or "").split(",") if field.strip()]
+        if not selected:
+            return self.dto_class
+        try:
+            return get_subset_dto(self.dto_class, selected)
+        except ValueError as e:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, str(e)) from e
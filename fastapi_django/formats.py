@@ -0,0 +1,256 @@
+import csv
+import dataclasses
+import datetime
+import io
+import operator
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any, TypeAlias
+
+import pydantic_core
+from django.db import models
+
+from .models import DjangoModelBase
+from .utils import class_cache
+
+try:  # pragma: no cover
+    import msgpack  # type: ignore[import]
+    HAS_MSGPACK = True
+except ImportError:  # pragma: no cover
+    HAS_MSGPACK = False
+
+Encoder: TypeAlias = Callable[[Any], Any]
+ColumnEncoders: TypeAlias = tuple[tuple[str, Encoder], ...]
+
+
+@dataclasses.dataclass(frozen=True)
+class DTOFormat:
+    """A format DTO responses may be sent in, see `negotiate_format()`."""
+
+    name: str
+    media_type: str
+    # Additional media types clients may ask for, like ``application/x-msgpack``
+    aliases: tuple[str, ...] = ()
+
+
+JSON = DTOFormat("json", "application/json")
+NDJSON = DTOFormat("ndjson", "application/x-ndjson", aliases=("application/jsonl",))
+CSV = DTOFormat("csv", "text/csv; charset=utf-8")
+MSGPACK = DTOFormat("msgpack", "application/msgpack", aliases=("application/x-msgpack",))
+
+# Formats negotiated by default, the first one is used if the client accepts anything
+DEFAULT_FORMATS: tuple[DTOFormat, ...] = (JSON, NDJSON, CSV, *((MSGPACK,) if HAS_MSGPACK else ()))
+
+
+def _parse_accept(accept: str) -> list[tuple[str, float]]:
+    """Return the media types (without parameters) accepted by the client, best first."""
+
+    media_types = []
+    for item in accept.split(","):
+        media_type, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            media_types.append((media_type.strip().lower(), quality))
+    # Sorting is stable, so the order of the client wins for equal qualities
+    return sorted(media_types, key=lambda item: -item[1])
+
+
+def negotiate_format(
+    accept: str | None,
+    formats: Sequence[DTOFormat] = DEFAULT_FORMATS,
+) -> DTOFormat:
+    """
+    Return the format to use for the ``Accept`` header of the request.
+
+    Falls back to the first format if the client accepts anything (or none of the
+    formats), so clients not sending a header (or only asking for formats we do not
+    support) still get the usual response.
+    """
+
+    if not accept:
+        return formats[0]
+
+    for media_type, _ in _parse_accept(accept):
+        if media_type in ("*/*", "application/*"):
+            return formats[0]
+        for dto_format in formats:
+            if media_type == dto_format.media_type.partition(";")[0] or media_type in dto_format.aliases:
+                return dto_format
+    return formats[0]
+
+
+def _get_column_name(dto_class: type[DjangoModelBase], name: str) -> str:
+    field_info = dto_class.model_fields.get(name)
+    if field_info is not None and field_info.alias:
+        return field_info.alias
+    return name
+
+
+def _get_dumped_field_names(dto_class: type[DjangoModelBase]) -> tuple[str, ...]:
+    return (*dto_class.model_fields, *dto_class.__pydantic_decorators__.computed_fields)
+
+
+def get_column_names(dto_class: type[DjangoModelBase]) -> tuple[str, ...]:
+    """Return the keys of the data dumped by the DTO (using the aliases), in order."""
+
+    return tuple(
+        _get_column_name(dto_class, name)
+        for name
+        in _get_dumped_field_names(dto_class)
+    )
+
+
+def _encode_msgpack_datetime(value: datetime.datetime) -> Any:
+    # The timestamp extension type cannot store naive datetimes
+    if value.tzinfo is None:
+        return value.isoformat()
+    return msgpack.Timestamp.from_datetime(value)
+
+
+def _encode_json(value: Any) -> str:
+    return pydantic_core.to_json(value).decode()
+
+
+def _encode_csv_value(value: Any) -> Any:
+    value = pydantic_core.to_jsonable_python(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, dict | list):
+        return _encode_json(value)
+    return value
+
+
+_isoformat = operator.methodcaller("isoformat")
+
+# Encoders by Django field class, the first matching one is used. Values of fields
+# not listed here are written as they are.
+_MSGPACK_ENCODERS: tuple[tuple[type[models.Field], Encoder], ...] = (
+    (models.DateTimeField, _encode_msgpack_datetime),
+    (models.DateField, _isoformat),
+    (models.TimeField, _isoformat),
+    (models.DecimalField, str),
+    (models.UUIDField, str),
+    (models.DurationField, pydantic_core.to_jsonable_python),
+)
+_CSV_ENCODERS: tuple[tuple[type[models.Field], Encoder], ...] = (
+    (models.DateTimeField, _isoformat),
+    (models.DateField, _isoformat),
+    (models.TimeField, _isoformat),
+    (models.BooleanField, lambda value: "true" if value else "false"),
+    (models.DurationField, pydantic_core.to_jsonable_python),
+    (models.BinaryField, pydantic_core.to_jsonable_python),
+    (models.JSONField, _encode_json),
+    (models.ManyToManyField, _encode_json),
+)
+
+
+@class_cache
+def _get_column_encoders(dto_class: type[DjangoModelBase], format_name: str) -> ColumnEncoders:
+    """
+    Return the encoders of all columns needing one for the format, by column name.
+
+    The encoders are chosen using the Django fields of the DTO, so converting the
+    rows only touches the columns needing it. Nested relations and fields not backed
+    by a Django field are encoded by value.
+    """
+
+    field_encoders = _MSGPACK_ENCODERS if format_name == MSGPACK.name else _CSV_ENCODERS
+    encoders = []
+    for name in _get_dumped_field_names(dto_class):
+        encoder: Encoder | None
+        django_field = dto_class._django_fields.get(name)
+        if name in dto_class._django_relations or django_field is None:
+            # msgpack encodes anything unknown using the default of the packer
+            encoder = None if format_name == MSGPACK.name else _encode_csv_value
+        else:
+            encoder = next(
+                (
+                    field_encoder
+                    for field_class, field_encoder
+                    in field_encoders
+                    if isinstance(django_field, field_class)
+                ),
+                None,
+            )
+        if encoder is not None:
+            encoders.append((_get_column_name(dto_class, name), encoder))
+    return tuple(encoders)
+
+
+def _encode_columns(rows: list[dict[str, Any]], encoders: ColumnEncoders) -> None:
+    # Column by column, so the encoder is only looked up once per column
+    for column_name, encoder in encoders:
+        for row in rows:
+            value = row.get(column_name)
+            if value is not None:
+                row[column_name] = encoder(value)
+
+
+def dump_rows_msgpack(dto_class: type[DjangoModelBase], rows: list[dict[str, Any]]) -> bytes:
+    """
+    Encode the rows (as dumped by the DTO in python mode) as a sequence of MessagePack maps.
+
+    Rows are changed in place. Datetimes use the timestamp extension type, decimals,
+    UUIDs and other values without a MessagePack type are sent as strings.
+    """
+
+    if not HAS_MSGPACK:  # pragma: no cover
+        raise RuntimeError("MessagePack requires the msgpack package to be installed")
+
+    _encode_columns(rows, _get_column_encoders(dto_class, MSGPACK.name))
+    packer = msgpack.Packer(default=pydantic_core.to_jsonable_python)
+    return b"".join(packer.pack(row) for row in rows)
+
+
+def dump_rows_csv(
+    dto_class: type[DjangoModelBase],
+    rows: list[dict[str, Any]],
+    *,
+    header: bool = False,
+) -> bytes:
+    """
+    Encode the rows (as dumped by the DTO in python mode) as CSV lines.
+
+    Rows are changed in place. Relations and JSON values are written as JSON,
+    ``None`` as an empty string.
+    """
+
+    column_names = get_column_names(dto_class)
+    _encode_columns(rows, _get_column_encoders(dto_class, CSV.name))
+    values: Iterable[Sequence[Any]]
+    if len(column_names) == 1:
+        values = ((row[column_names[0]],) for row in rows)
+    else:
+        values = map(operator.itemgetter(*column_names), rows)
+
+    output = io.StringIO()
+    writer = csv.writer(output)
+    if header:
+        writer.writerow(column_names)
+    writer.writerows(values)
+    return output.getvalue().encode()
+
+
+def get_format_responses(formats: Sequence[DTOFormat] = DEFAULT_FORMATS) -> dict[int | str, dict[str, Any]]:
+    """
+    Return the ``responses`` to pass to the route, documenting the formats in OpenAPI.
+
+    JSON is documented by FastAPI already (using the ``response_model``).
+    """
+
+    return {
+        200: {
+            "content": {
+                dto_format.media_type.partition(";")[0]: {}
+                for dto_format
+                in formats
+                if dto_format != JSON
+            },
+        },
+    }
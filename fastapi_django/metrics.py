@@ -0,0 +1,252 @@
+import bisect
+import time
+from collections.abc import Callable, Hashable, Sequence
+
+from django.urls import Resolver404, resolve
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds of the histogram buckets, an implicit +Inf bucket is added
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# Operation of requests not handled by any FastAPI route (not found, Django, ...)
+UNKNOWN_OPERATION = "unknown"
+
+_STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+
+
+def resolve_django_operation(scope: Scope) -> str:
+    """
+    Return the view name of the Django URL the request matches, like ``"admin:index"``.
+
+    Django does not expose the `ResolverMatch` of a request to ASGI middlewares, so
+    the path is resolved again (which is cheap compared to handling the request).
+    Requests not matching any URL use the operation id "unknown".
+    """
+
+    path = scope["path"]
+    root_path = scope.get("root_path", "")
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    try:
+        return resolve(path).view_name
+    except Resolver404:
+        return UNKNOWN_OPERATION
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Histogram:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = buckets
+        # Not cumulative, the last entry is the +Inf bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum: float = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def render(self, name: str, labels: str) -> list[str]:
+        lines = []
+        count = 0
+        for upper_bound, bucket_count in zip((*self.buckets, "+Inf"), self.counts, strict=True):
+            count += bucket_count
+            lines.append(f'{name}_bucket{{{labels},le="{upper_bound}"}} {count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {count}")
+        return lines
+
+
+class _OperationMetrics:
+    def __init__(self, mount: str, operation_id: str) -> None:
+        # Rendered once, so recording a request never needs to build any label strings
+        self.labels = (
+            f'mount="{_escape_label_value(mount)}",'
+            f'operation_id="{_escape_label_value(operation_id)}"'
+        )
+        self.status_counts = [0] * len(_STATUS_CLASSES)
+        self.duration = _Histogram(DURATION_BUCKETS)
+        self.response_size = _Histogram(SIZE_BUCKETS)
+
+    def add_request(self, status_code: int, duration_seconds: float, response_size: int) -> None:
+        self.status_counts[min(max(status_code // 100, 1), 5) - 1] += 1
+        self.duration.observe(duration_seconds)
+        self.response_size.observe(response_size)
+
+
+class _MountMetrics:
+    def __init__(self, mount: str, resolve_operation: Callable[[Scope], str] | None = None) -> None:
+        self.mount = mount
+        self.labels = f'mount="{_escape_label_value(mount)}"'
+        self.resolve_operation = resolve_operation
+        self.in_progress = 0
+        self.operations_by_id: dict[str, _OperationMetrics] = {}
+        # Cache of the operation for every endpoint (of the matched route)
+        self.operations: dict[Hashable, _OperationMetrics] = {}
+
+    def _get_operation_by_id(self, operation_id: str) -> _OperationMetrics:
+        if operation_id not in self.operations_by_id:
+            self.operations_by_id[operation_id] = _OperationMetrics(self.mount, operation_id)
+        return self.operations_by_id[operation_id]
+
+    def _get_operation(self, scope: Scope) -> _OperationMetrics:
+        if self.resolve_operation is not None:
+            return self._get_operation_by_id(self.resolve_operation(scope))
+
+        endpoint = scope.get("endpoint")
+        operation = self.operations.get(endpoint)
+        if operation is not None:
+            return operation
+
+        operation_id = UNKNOWN_OPERATION
+        for route in getattr(scope.get("app"), "routes", ()):
+            if isinstance(route, APIRoute) and route.endpoint is endpoint:
+                operation_id = route.operation_id or route.unique_id
+                break
+        operation = self.operations[endpoint] = self._get_operation_by_id(operation_id)
+        return operation
+
+    def add_request(
+        self,
+        scope: Scope,
+        status_code: int,
+        duration_seconds: float,
+        response_size: int,
+    ) -> None:
+        self._get_operation(scope).add_request(status_code, duration_seconds, response_size)
+
+
+class _RequestMetrics:
+    """
+    Request metrics of all mounts, see `RequestMetricsMiddleware`.
+
+    Requests are recorded in the event loop thread, so no locks are needed. Every
+    worker process collects its own metrics.
+    """
+
+    def __init__(self) -> None:
+        self._mounts: dict[str, _MountMetrics] = {}
+
+    def get_mount(self, mount: str, resolve_operation: Callable[[Scope], str] | None = None) -> _MountMetrics:
+        if mount not in self._mounts:
+            self._mounts[mount] = _MountMetrics(mount, resolve_operation)
+        return self._mounts[mount]
+
+    def clear(self) -> None:
+        for mount_metrics in self._mounts.values():
+            mount_metrics.operations.clear()
+            mount_metrics.operations_by_id.clear()
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text format."""
+
+        mounts = list(self._mounts.values())
+        operations = [
+            operation
+            for mount_metrics
+            in mounts
+            for operation
+            in list(mount_metrics.operations_by_id.values())
+        ]
+
+        lines = [
+            "# HELP http_requests_total Number of handled requests.",
+            "# TYPE http_requests_total counter",
+        ]
+        for operation in operations:
+            lines.extend(
+                f'http_requests_total{{{operation.labels},status="{status_class}"}} {count}'
+                for status_class, count
+                in zip(_STATUS_CLASSES, operation.status_counts, strict=True)
+                if count
+            )
+        lines.extend([
+            "# HELP http_requests_in_progress Number of requests currently being handled.",
+            "# TYPE http_requests_in_progress gauge",
+        ])
+        lines.extend(
+            f"http_requests_in_progress{{{mount_metrics.labels}}} {mount_metrics.in_progress}"
+            for mount_metrics
+            in mounts
+        )
+        lines.extend([
+            "# HELP http_request_duration_seconds Time until the response was sent completely.",
+            "# TYPE http_request_duration_seconds histogram",
+        ])
+        for operation in operations:
+            lines.extend(operation.duration.render("http_request_duration_seconds", operation.labels))
+        lines.extend([
+            "# HELP http_response_size_bytes Size of the response body.",
+            "# TYPE http_response_size_bytes histogram",
+        ])
+        for operation in operations:
+            lines.extend(operation.response_size.render("http_response_size_bytes", operation.labels))
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = _RequestMetrics()
+
+
+def render_prometheus_metrics() -> str:
+    """Return the metrics recorded by `RequestMetricsMiddleware` in the Prometheus text format."""
+
+    return request_metrics.render()
+
+
+class RequestMetricsMiddleware:
+    """
+    Record the number, duration and response size of requests per operation.
+
+    Metrics are labelled by ``mount`` and the operation id of the FastAPI route, all
+    other requests (like not found) use the operation id "unknown". Apps not using
+    FastAPI routes pass ``resolve_operation``, returning the operation id of a request
+    (like `resolve_django_operation()` for Django). Keep the number of operation ids
+    bounded, every one adds its own time series. The number of
+    requests in progress is labelled by ``mount`` only, as the route is not known
+    before the request has been handled.
+
+    Add this to every mount, not to an app including other mounts - requests would
+    be counted twice. Use `render_prometheus_metrics()` to expose the metrics.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        mount: str,
+        resolve_operation: Callable[[Scope], str] | None = None,
+    ) -> None:
+        self.app = app
+        self.mount_metrics = request_metrics.get_mount(mount, resolve_operation)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        response_size = 0
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        mount_metrics = self.mount_metrics
+        mount_metrics.in_progress += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            mount_metrics.in_progress -= 1
+            mount_metrics.add_request(scope, status_code, time.perf_counter() - start, response_size)
+
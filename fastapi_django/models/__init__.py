@@ -1,2 +1,4 @@
 from .dict import model_to_dict
+from .fields import register_field_type
 from .models import DjangoModelBase, django_to_pydantic_model
+from .registry import get_dto_registry_stats
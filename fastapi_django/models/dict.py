@@ -1,14 +1,67 @@
-from typing import Any
+import functools
+from typing import Any, TypeAlias
 
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.db import models
 from django.db.models import FileField
 
+# How to read the value of a single field, see `_get_model_to_dict_plan()`
+READ_ATTRIBUTE = 0  # getattr(instance, attname)
+READ_VALUE = 1  # field.value_from_object(instance)
+READ_FILE_URL = 2  # URL of the attached file, skipped if no file is set
+READ_MANY_TO_MANY_PKS = 3  # list of the related primary keys
+
+ModelToDictPlan: TypeAlias = tuple[tuple[str, int, Any], ...]
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_model_to_dict_plan(
+    model_class: type[models.Model],
+    include: frozenset[str] | None,
+    exclude: frozenset[str] | None,
+) -> ModelToDictPlan:
+    """
+    Calculate which fields `model_to_dict()` needs to read and how to read them.
+
+    Returns a tuple of ``(name, read_mode, accessor)`` entries, where ``accessor`` is
+    the attname for ``READ_ATTRIBUTE`` and the field for all other modes. The plan is
+    cached, so walking the model fields only happens once per model and options.
+    """
+
+    plan: list[tuple[str, int, Any]] = []
+    for field in model_class._meta.get_fields():
+        if include is not None and field.name not in include:
+            continue
+        if exclude and field.name in exclude:
+            continue
+        if isinstance(field, FileField):
+            plan.append((field.name, READ_FILE_URL, field))
+            continue
+        if isinstance(field, models.ManyToManyField):
+            plan.append((field.name, READ_MANY_TO_MANY_PKS, field.attname))
+            continue
+        if isinstance(field, models.ForeignObjectRel):
+            # Skip reverse relations: need to be handled separately
+            continue
+        if isinstance(field, GenericForeignKey):
+            # Skip generic foreign keys: need to be handled separately
+            continue
+        # If no special handling is needed we would just call the fields value_from_object
+        # method - which only reads the attname for most fields. Do this directly, but
+        # still respect custom implementations.
+        if type(field).value_from_object is models.Field.value_from_object:
+            plan.append((field.name, READ_ATTRIBUTE, field.attname))
+        else:
+            plan.append((field.name, READ_VALUE, field))
+    return tuple(plan)
+
 
 def model_to_dict(
     instance: models.Model,
     include: set[str] | None = None,
     exclude: set[str] | None = None,
+    *,
+    include_many_to_many: bool = False,
 ) -> dict[str, Any]:
     """
     Return a dict containing the data in ``instance``.
@@ -21,19 +74,27 @@ def model_to_dict(
     ``exclude`` is an optional list of field names. If provided, exclude the
     named from the returned dict, even if they are listed in the ``fields``
     argument.
+
+    Many to many fields are returned as a list of the related primary keys if they
+    have been prefetched (in the order they were loaded), see
+    `DjangoModelBase.get_prefetch_related()`. Otherwise they are left out, unless
+    ``include_many_to_many`` is set - loading the primary keys ordered by primary key
+    then costs one query per field, so only do this for single instances.
     """
 
-    opts = instance._meta
+    plan = _get_model_to_dict_plan(
+        instance.__class__,
+        frozenset(include) if include is not None else None,
+        frozenset(exclude) if exclude else None,
+    )
     data = {}
-    for field in opts.get_fields():
-        if include is not None and field.name not in include:
-            continue
-        if exclude and field.name in exclude:
-            continue
-        if isinstance(field, FileField):
+    for name, read_mode, accessor in plan:
+        if read_mode == READ_ATTRIBUTE:
+            data[name] = getattr(instance, accessor)
+        elif read_mode == READ_FILE_URL:
             # Check if a file has been set
             # Comparison to None does not work because the field still contains a FieldFile Object
-            field_file = field.value_from_object(instance)
+            field_file = accessor.value_from_object(instance)
             # If the FileField is *not set*, then field_file is not None
             # (it is still a FieldFile object even if the field is blank), but it is not False in every way
             # you would expect either.
@@ -43,17 +104,17 @@ def model_to_dict(
             # bool(field_file): False
             if field_file:
                 # If field_file is True, then a file is currently attached to the FileField
-                data[field.name] = field_file.url
-            continue
-        if isinstance(field, models.ManyToManyField):
-            # Skip ManyToManyFields: need to be handled separately
-            continue
-        if isinstance(field, models.ForeignObjectRel):
-            # Skip reverse relations: need to be handled separately
-            continue
-        if isinstance(field, GenericForeignKey):
-            # Skip generic foreign keys: need to be handled separately
-            continue
-        # If no special handling is needed, just call the fields value_from_object method on the instance
-        data[field.name] = field.value_from_object(instance)
+                data[name] = field_file.url
+        elif read_mode == READ_MANY_TO_MANY_PKS:
+            # Unsaved instances cannot have any relations. Prefetched data is used as
+            # it is (DjangoModelBase.get_prefetch_related() orders it by primary key),
+            # otherwise only the ordered primary keys are loaded (if requested).
+            if instance.pk is None:
+                data[name] = []
+            elif accessor in getattr(instance, "_prefetched_objects_cache", {}):
+                data[name] = [related.pk for related in getattr(instance, accessor).all()]
+            elif include_many_to_many:
+                data[name] = list(getattr(instance, accessor).order_by("pk").values_list("pk", flat=True))
+        else:
+            data[name] = accessor.value_from_object(instance)
     return data
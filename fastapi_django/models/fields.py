@@ -1,8 +1,9 @@
 import datetime
 import decimal
+import functools
 from collections.abc import Callable
 from types import UnionType
-from typing import Any, TypeAlias, cast
+from typing import Annotated, Any, TypeAlias, cast
 from uuid import UUID
 
 import pydantic
@@ -10,6 +11,7 @@ from django.contrib.contenttypes.fields import GenericForeignKey
 from django.db import models
 from django.db.models.fields import reverse_related
 from django.db.models.fields.reverse_related import ForeignObjectRel
+from pydantic_core import PydanticCustomError
 
 # Follow pydantic schema for email validation
 try:  # pragma: no cover
@@ -21,12 +23,40 @@ except ImportError:  # pragma: no cover
 FieldType: TypeAlias = models.Field | ForeignObjectRel | GenericForeignKey
 JSONValue: TypeAlias = bool | float | int | str | None
 JSONType: TypeAlias = dict[str, JSONValue] | list[JSONValue] | JSONValue
+FieldOptions: TypeAlias = tuple[
+    type | UnionType | Callable[[FieldType], type | UnionType],
+    Callable[[FieldType], dict[str, Any]] | None,
+]
+
+
+def _get_str_validator(type_adapter: pydantic.TypeAdapter) -> Callable[[str], str]:
+    # Only validate, keep the value as stored by Django - types like pydantic.AnyUrl
+    # would convert (and normalize) it, so trusted data (which is not validated) would
+    # differ and could not be serialized without warnings.
+    def validate(value: str) -> str:
+        try:
+            type_adapter.validate_python(value)
+        except pydantic.ValidationError as e:
+            error = e.errors()[0]
+            raise PydanticCustomError(error["type"], error["msg"]) from e
+        return value
+
+    return validate
+
+
+URLStr: TypeAlias = Annotated[
+    str,
+    pydantic.AfterValidator(_get_str_validator(pydantic.TypeAdapter(pydantic.AnyUrl))),
+]
+IPAddressStr: TypeAlias = Annotated[
+    str,
+    pydantic.AfterValidator(_get_str_validator(pydantic.TypeAdapter(pydantic.IPvAnyAddress))),
+]
+
+
 FIELD_TYPE_MAP: dict[
     type[FieldType],  # models.Field is to strict, would not catch ManyToOneRel and others
-    tuple[
-        type | UnionType | Callable[[FieldType], type | UnionType],
-        Callable[[FieldType], dict[str, Any]] | None,
-    ] | None,
+    FieldOptions | None,
 ] = {
     # Normal fields
     # see https://docs.djangoproject.com/en/4.2/ref/models/fields/#field-types
@@ -44,7 +74,10 @@ FIELD_TYPE_MAP: dict[
     models.FileField: (str, None),  # TODO: What fits best here?
     # TODO: What fits best here? models.FilePathField: (pydantic.FilePath, None),
     models.FloatField: (float, None),
-    models.GenericIPAddressField: (pydantic.IPvAnyAddress, None),
+    models.GenericIPAddressField: (
+        lambda _: IPAddressStr,  # type: ignore  # Annotated types are callable, so wrap it
+        lambda _: {'json_schema_extra': {'format': 'ipvanyaddress'}},
+    ),
     # TODO: What fits best here? models.ImageField: (pydantic.FilePath, None),
     models.IntegerField: (int, None),
     models.JSONField: (JSONType, None),  # type: ignore
@@ -56,7 +89,10 @@ FIELD_TYPE_MAP: dict[
     models.SmallIntegerField: (int, None),
     models.TextField: (str, lambda f: {'max_length': f.max_length}),  # type: ignore
     models.TimeField: (datetime.time, None),
-    models.URLField: (pydantic.AnyUrl, None),
+    models.URLField: (
+        lambda _: URLStr,  # type: ignore  # Annotated types are callable, so wrap it
+        lambda f: {'max_length': f.max_length, 'json_schema_extra': {'format': 'uri'}},  # type: ignore
+    ),
     models.UUIDField: (UUID, None),
 
     # Relationships
@@ -68,7 +104,15 @@ FIELD_TYPE_MAP: dict[
         ),
         None,
     ),
-    models.ManyToManyField: None,  # skip
+    models.ManyToManyField: (
+        # List of the primary keys of the related instances
+        lambda f: list[  # type: ignore
+            _get_pydantic_field_type_from_django_field(
+                cast(type[models.Model], f.related_model)._meta.pk,  # type: ignore
+            )
+        ],
+        None,
+    ),
     models.OneToOneField: (
         # Use type of target field
         lambda f: _get_pydantic_field_type_from_django_field(
@@ -87,35 +131,50 @@ FIELD_TYPE_MAP: dict[
 }
 
 
-def _get_pydantic_field_options_from_django_field(
-    field: FieldType,
-) -> tuple[
-    type | UnionType | Callable[[FieldType], type | UnionType],
-    Callable[[FieldType], dict[str, Any]] | None,
-] | None:
-    pydantic_type = None
-    pydantic_params_callback = None
-
-    # Easy resolving of type, search for direct usage...
-    if field.__class__ in FIELD_TYPE_MAP:
-        pydantic_options = FIELD_TYPE_MAP[field.__class__]
-        if pydantic_options is None:
-            return None  # skip field
-        pydantic_type, pydantic_params_callback = pydantic_options
-
-    # ... if this fails search by instances check
+@functools.cache
+def _resolve_field_options(
+    field_class: type[FieldType],
+) -> FieldOptions | None:
+    """
+    Find the options for a Django field class, using the most specific entry.
+
+    Walks the MRO of the class, so subclasses of known fields (like custom CharFields)
+    use the mapping of their closest registered base class. The result is cached per
+    class, use `register_field_type()` to change the mapping.
+    """
+
+    for base_class in field_class.__mro__:
+        if base_class in FIELD_TYPE_MAP:
+            return FIELD_TYPE_MAP[base_class]  # type: ignore
+    return None  # unknown field type
+
+
+def register_field_type(
+    django_field_class: type[FieldType],
+    pydantic_type: type | UnionType | Callable[[FieldType], type | UnionType] | None,
+    pydantic_params_callback: Callable[[FieldType], dict[str, Any]] | None = None,
+) -> None:
+    """
+    Register the pydantic type to use for a Django field class (and its subclasses).
+
+    ``pydantic_type`` may be a callable to determine the type based on the field
+    instance, ``pydantic_params_callback`` may return additional parameters for
+    `pydantic.Field()`. Pass ``None`` as ``pydantic_type`` to skip fields of this class.
+
+    Register fields before creating any pydantic models, as those are cached.
+    """
+
     if pydantic_type is None:
-        for django_field_type, pydantic_options in FIELD_TYPE_MAP.items():
-            if isinstance(field, django_field_type):
-                if pydantic_options is None:
-                    return None  # skip field
-                pydantic_type, pydantic_params_callback = pydantic_options
-                break
+        FIELD_TYPE_MAP[django_field_class] = None
+    else:
+        FIELD_TYPE_MAP[django_field_class] = (pydantic_type, pydantic_params_callback)
+    _resolve_field_options.cache_clear()
 
-    # pydantic_type cannot be None now, now also make mypy happy
-    assert pydantic_type is not None  # noqa: S101
 
-    return pydantic_type, pydantic_params_callback
+def _get_pydantic_field_options_from_django_field(
+    field: FieldType,
+) -> FieldOptions | None:
+    return _resolve_field_options(field.__class__)  # type: ignore
 
 
 def _get_pydantic_field_type_from_django_field(
@@ -1,39 +1,855 @@
+import itertools
+import warnings
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
 from types import EllipsisType
-from typing import Any, Generic, Self, cast, overload
+from typing import Any, ClassVar, Generic, Self, cast, overload
 
 import pydantic
+import pydantic_core
+from asgiref.sync import sync_to_async
+from django.db import models
 from pydantic_core._pydantic_core import PydanticUndefined, PydanticUndefinedType
 
+from ..phases import PHASE_CONVERSION, PHASE_SERIALIZATION, profile_phase
+from ..utils import abatched, class_cache, get_json_serialization_config, get_list_type_adapter
 from .dict import model_to_dict
-from .fields import _get_pydantic_field_options_from_django_field
+from .fields import FieldType, _get_pydantic_field_options_from_django_field
+from .registry import dto_registry
 from .types import DjangoModelT
 
+# Maximum number of rows to load many to many relations for in one query
+MANY_TO_MANY_BATCH_SIZE = 1000
+
+
+@class_cache
+def _get_model_to_dict_include(model_class: type["DjangoModelBase"]) -> frozenset[str]:
+    """Return the names of the Django fields read by the pydantic model."""
+
+    return frozenset(
+        field.alias or name
+        for name, field
+        in model_class.model_fields.items()
+        if name not in model_class._django_relations
+    )
+
+
+@class_cache
+def _get_django_write_fields(model_class: type["DjangoModelBase"]) -> tuple[str, ...]:
+    """
+    Return the attnames of the fields `DjangoModelBase.to_django()` writes to the Django instance.
+
+    The attname is the name of the pydantic field as well. File fields (only
+    containing the URL) and many to many relations (requiring a saved instance) are
+    not written.
+    """
+
+    return tuple(
+        django_field.attname
+        for django_field
+        in model_class._django_fields.values()
+        if (
+            isinstance(django_field, models.Field)
+            and django_field.concrete
+            and not isinstance(django_field, models.FileField | models.ManyToManyField)
+        )
+    )
+
+
+# Defaults of the config options changing how pydantic writes JSON
+_JSON_SERIALIZATION_CONFIG_DEFAULTS: dict[str, Any] = {
+    "ser_json_timedelta": "iso8601",
+    "ser_json_bytes": "utf8",
+}
+
+
+def _get_relation_name(django_field: FieldType) -> str:
+    """Return the name used to access the relation on model instances."""
+
+    if isinstance(django_field, models.ForeignObjectRel):
+        return django_field.get_accessor_name() or django_field.name
+    return django_field.name
+
+
+def _is_single_relation(django_field: FieldType) -> bool:
+    """Return whether the relation points to (at most) one instance."""
+
+    return bool(django_field.many_to_one or django_field.one_to_one)
+
+
+def _prefix_prefetch(prefix: str, prefetch: models.Prefetch) -> models.Prefetch:
+    return models.Prefetch(
+        f"{prefix}__{prefetch.prefetch_through}",
+        queryset=prefetch.queryset,
+    )
+
+
+async def _aiterator_with_prefetch(
+    queryset: models.QuerySet[DjangoModelT],
+    *,
+    chunk_size: int,
+) -> AsyncIterator[DjangoModelT]:
+    """
+    Like `QuerySet.aiterator()`, but also supports `prefetch_related()`.
+
+    Prefetching happens for each chunk, see `QuerySet.iterator()`.
+    """
+
+    if not queryset._prefetch_related_lookups:  # type: ignore
+        async for obj in queryset.aiterator(chunk_size=chunk_size):
+            yield obj
+        return
+
+    sync_iterator = queryset.iterator(chunk_size=chunk_size)
+
+    def next_chunk() -> list[DjangoModelT]:
+        return list(itertools.islice(sync_iterator, chunk_size))
+
+    while True:
+        chunk = await sync_to_async(next_chunk)()
+        for obj in chunk:
+            yield obj
+        if len(chunk) < chunk_size:
+            break
+
 
 class DjangoModelBase(pydantic.BaseModel, Generic[DjangoModelT]):
+    # Build the pydantic-core schema on first validation/serialization only, so
+    # importing lots of models stays fast
+    model_config = pydantic.ConfigDict(defer_build=True)
+
+    # Set by django_to_pydantic_model(), maps the pydantic field names to the Django
+    # fields they were created from
+    _django_model: ClassVar[type[models.Model] | None] = None
+    _django_fields: ClassVar[dict[str, FieldType]] = {}
+    # Relations using nested models, maps the pydantic field name to the relation
+    # and the nested model
+    _django_relations: ClassVar[dict[str, tuple[FieldType, type["DjangoModelBase"]]]] = {}
+
+    # Data read from the database already passed Django's validation. Set this to
+    # True to skip validation when converting from Django by default, see
+    # `_validate_django_data()`.
+    django_trusted: ClassVar[bool] = False
+
+    @classmethod
+    def _build_deferred_model(cls) -> None:
+        """
+        Build the pydantic-core schema, if it has been deferred.
+
+        Instances created using a `TypeAdapter` or `model_construct()` cannot be
+        serialized before the model has been built. Nested models are only built as part
+        of this model, so build them, too.
+        """
+
+        if not cls.__pydantic_complete__:
+            cls.model_rebuild()
+        for _, nested_model_class in cls._django_relations.values():
+            nested_model_class._build_deferred_model()
+
     @classmethod
     def _get_django_data(
         cls,
         obj: DjangoModelT,
     ) -> dict[str, Any]:
-        return model_to_dict(obj)
+        # Only read the fields we need, so we don't load unused many to many relations.
+        # Relations not prefetched are loaded, see _warn_many_to_many_not_prefetched()
+        data = model_to_dict(
+            obj,
+            include=_get_model_to_dict_include(cls),  # type: ignore
+            include_many_to_many=True,
+        )
+        for name, (django_field, nested_model_class) in cls._django_relations.items():
+            if _is_single_relation(django_field):
+                # Reverse one to one relations raise an exception derived from
+                # AttributeError if no related instance exists
+                related_obj = getattr(obj, name, None)
+                data[name] = (
+                    nested_model_class._get_django_data(related_obj)
+                    if related_obj is not None
+                    else None
+                )
+            else:
+                data[name] = [
+                    nested_model_class._get_django_data(related_obj)
+                    for related_obj
+                    in getattr(obj, name).all()
+                ]
+        return data
+
+    @classmethod
+    def _construct_from_django_data(
+        cls: type[Self],
+        data: dict[str, Any],
+    ) -> Self:
+        """Create an instance from trusted data without validation, including nested models."""
+
+        for name, (django_field, nested_model_class) in cls._django_relations.items():
+            if name not in data:
+                continue
+            if _is_single_relation(django_field):
+                if data[name] is not None:
+                    data[name] = nested_model_class._construct_from_django_data(data[name])
+            else:
+                data[name] = [
+                    nested_model_class._construct_from_django_data(nested_data)
+                    for nested_data
+                    in data[name]
+                ]
+
+        field_names = _get_model_to_dict_include(cls) | cls._django_relations.keys()
+        return cls.model_construct(**{
+            name: value
+            for name, value
+            in data.items()
+            # model_construct() would keep unknown values, too
+            if name in field_names
+        })
+
+    @classmethod
+    def _is_trusted(cls, trusted: bool | None) -> bool:
+        return cls.django_trusted if trusted is None else trusted
+
+    @classmethod
+    def _validate_django_data(
+        cls: type[Self],
+        data: list[dict[str, Any]],
+        trusted: bool | None = None,
+    ) -> list[Self]:
+        """
+        Create instances from data read from Django.
+
+        When trusted (see `django_trusted`) no validation happens at all. The data is
+        used as it is, so types are not converted - for example a string assigned to an
+        integer field of the Django instance stays a string.
+        """
+
+        cls._build_deferred_model()
+        if cls._is_trusted(trusted):
+            return [
+                cls._construct_from_django_data(item)
+                for item
+                in data
+            ]
+
+        return get_list_type_adapter(cls).validate_python(data)
+
+    @classmethod
+    def _can_use_django_values(cls) -> bool:
+        """
+        Return whether rows may be loaded using `QuerySet.values()`.
+
+        This is only possible for models created by `django_to_pydantic_model()`
+        without nested relations, and only as long as nobody changed how the data is
+        read from the Django instances.
+        """
+
+        return (
+            cls._django_model is not None
+            and not cls._django_relations
+            and cls._get_django_data.__func__ is DjangoModelBase._get_django_data.__func__  # type: ignore
+        )
+
+    @classmethod
+    def _get_django_many_to_many_fields(cls) -> list[models.ManyToManyField]:
+        return [
+            django_field
+            for django_field
+            in cls._django_fields.values()
+            if isinstance(django_field, models.ManyToManyField)
+        ]
+
+    @classmethod
+    def _get_django_values_names(cls) -> tuple[str, ...]:
+        """Return the names to pass to `QuerySet.values()` to load the data."""
+
+        names = cls._get_django_column_names()
+        if cls._get_django_many_to_many_fields():
+            # Needed to load the many to many relations, see _add_many_to_many_values()
+            names = (*names, "pk")
+        return names
+
+    @classmethod
+    def _get_django_column_names(cls) -> tuple[str, ...]:
+        """Return the names of all model fields backed by a column of the model table."""
+
+        return tuple(
+            django_field.name
+            for django_field
+            in cls._django_fields.values()
+            if not isinstance(django_field, models.ManyToManyField)
+        )
+
+    @classmethod
+    def _get_django_values_data(
+        cls,
+        rows: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Convert rows returned by `QuerySet.values()` to match `model_to_dict()`."""
+
+        file_fields = [
+            django_field
+            for django_field
+            in cls._django_fields.values()
+            if isinstance(django_field, models.FileField)
+        ]
+        if not file_fields:
+            return rows
+
+        for row in rows:
+            for file_field in file_fields:
+                # Like model_to_dict(): Use the URL if a file is set, skip the field otherwise
+                file_name = row.pop(file_field.name)
+                if file_name:
+                    row[file_field.name] = file_field.storage.url(file_name)
+        return rows
+
+    @classmethod
+    def _add_many_to_many_values(
+        cls,
+        rows: list[dict[str, Any]],
+    ) -> None:
+        """
+        Add the primary keys of all many to many relations to the rows.
+
+        Uses one query on the through table per relation for all rows (split into
+        batches of `MANY_TO_MANY_BATCH_SIZE` rows), never one query per row. The
+        primary keys are ordered like `model_to_dict()` does.
+        """
+
+        for django_field in cls._get_django_many_to_many_fields():
+            through_model = cast(type[models.Model], django_field.remote_field.through)
+            source_attname = cast(
+                models.ForeignKey,
+                through_model._meta.get_field(django_field.m2m_field_name()),  # type: ignore
+            ).attname
+            target_attname = cast(
+                models.ForeignKey,
+                through_model._meta.get_field(django_field.m2m_reverse_field_name()),
+            ).attname
+
+            related_pks: dict[Any, list[Any]] = {row["pk"]: [] for row in rows}
+            pks = list(related_pks.keys())
+            for offset in range(0, len(pks), MANY_TO_MANY_BATCH_SIZE):
+                relations = through_model._default_manager.filter(**{
+                    f"{source_attname}__in": pks[offset:offset + MANY_TO_MANY_BATCH_SIZE],
+                }).order_by(target_attname).values_list(source_attname, target_attname)
+                for source_pk, target_pk in relations:
+                    related_pks[source_pk].append(target_pk)
+
+            for row in rows:
+                row[django_field.name] = related_pks[row["pk"]]
+
+    @classmethod
+    def _from_django_values(
+        cls: type[Self],
+        rows: list[dict[str, Any]],
+        trusted: bool | None = None,
+    ) -> list[Self]:
+        """Convert rows returned by `QuerySet.values()`, may query many to many relations."""
+
+        if cls._get_django_many_to_many_fields():
+            cls._add_many_to_many_values(rows)
+
+        with profile_phase(PHASE_CONVERSION):
+            return cls._validate_django_data(cls._get_django_values_data(rows), trusted)
+
+    @classmethod
+    async def _afrom_django_values(
+        cls: type[Self],
+        rows: list[dict[str, Any]],
+        trusted: bool | None = None,
+    ) -> list[Self]:
+        """Async version of `_from_django_values()`."""
+
+        if cls._get_django_many_to_many_fields():
+            await sync_to_async(cls._add_many_to_many_values)(rows)
+
+        with profile_phase(PHASE_CONVERSION):
+            return cls._validate_django_data(cls._get_django_values_data(rows), trusted)
+
+    @classmethod
+    def _can_dump_django_values_json(cls) -> bool:
+        """
+        Return whether rows returned by `QuerySet.values()` may be written to JSON directly.
+
+        This requires `_can_use_django_values()` and a model serializing exactly the
+        Django fields as they are, so no additional or computed fields, no custom
+        validators or serializers, no serialization aliases and no config changing
+        how values are written to JSON (like ``ser_json_timedelta``).
+        """
+
+        decorators = cls.__pydantic_decorators__
+        return (
+            cls._can_use_django_values()
+            and cls.model_fields.keys() == cls._django_fields.keys()
+            and all(
+                _JSON_SERIALIZATION_CONFIG_DEFAULTS.get(key) == value
+                for key, value
+                in get_json_serialization_config(cls).items()
+            )
+            and all(
+                field_info.serialization_alias in (None, field_info.alias)
+                for field_info
+                in cls.model_fields.values()
+            )
+            and not decorators.validators
+            and not decorators.field_validators
+            and not decorators.root_validators
+            and not decorators.field_serializers
+            and not decorators.model_serializers
+            and not decorators.model_validators
+            and not decorators.computed_fields
+        )
+
+    @classmethod
+    def _convert_django_values_json_data(
+        cls,
+        rows: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        # The keys of the rows already are the aliases of the fields, in the same order.
+        # Only the file fields need to be replaced by their URL and the primary key added
+        # for many to many relations must be removed again.
+        file_fields = [
+            django_field
+            for django_field
+            in cls._django_fields.values()
+            if isinstance(django_field, models.FileField)
+        ]
+        has_many_to_many_fields = bool(cls._get_django_many_to_many_fields())
+        if not file_fields and not has_many_to_many_fields:
+            return rows
+
+        for row in rows:
+            for file_field in file_fields:
+                file_name = row[file_field.name]
+                row[file_field.name] = file_field.storage.url(file_name) if file_name else None
+            if has_many_to_many_fields:
+                del row["pk"]
+        return rows
+
+    @classmethod
+    def _get_django_values_json_data(
+        cls,
+        rows: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """
+        Convert rows returned by `QuerySet.values()` to the data the model would dump.
+
+        The result can be passed to `pydantic_core.to_json()` directly, see
+        `_can_dump_django_values_json()`. May query many to many relations.
+        """
+
+        if cls._get_django_many_to_many_fields():
+            cls._add_many_to_many_values(rows)
+
+        return cls._convert_django_values_json_data(rows)
+
+    @classmethod
+    async def _aget_django_values_json_data(
+        cls,
+        rows: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Async version of `_get_django_values_json_data()`."""
+
+        if cls._get_django_many_to_many_fields():
+            await sync_to_async(cls._add_many_to_many_values)(rows)
+
+        return cls._convert_django_values_json_data(rows)
 
     @overload
     @classmethod
-    def from_django(cls, obj: None) -> None: ...
+    def from_django(cls, obj: None, *, trusted: bool | None = None) -> None: ...
 
     @overload
     @classmethod
-    def from_django(cls: type[Self], obj: DjangoModelT) -> Self: ...
+    def from_django(cls: type[Self], obj: DjangoModelT, *, trusted: bool | None = None) -> Self: ...
 
     @classmethod
     def from_django(
         cls: type[Self],
         obj: DjangoModelT | None,
+        *,
+        trusted: bool | None = None,
     ) -> Self | None:
+        """
+        Convert a Django instance.
+
+        Pass ``trusted=True`` to skip validation, defaults to `django_trusted`.
+        """
+
         if obj is None:
             return None
 
-        return cls.model_validate(cls._get_django_data(obj))
+        with profile_phase(PHASE_CONVERSION):
+            cls._build_deferred_model()
+            if cls._is_trusted(trusted):
+                return cls._construct_from_django_data(cls._get_django_data(obj))
+
+            return cls.model_validate(cls._get_django_data(obj))
+
+    @classmethod
+    def _get_django_only_names(cls) -> tuple[str, ...]:
+        """Return the names to pass to `QuerySet.only()`, including `select_related()` ones."""
+
+        names = list(cls._get_django_column_names())
+        for name, (django_field, nested_model_class) in cls._django_relations.items():
+            if not _is_single_relation(django_field):
+                continue
+            names.append(name)
+            if nested_model_class._django_model is not None:
+                names.extend(
+                    f"{name}__{nested_name}"
+                    for nested_name
+                    in nested_model_class._get_django_only_names()
+                )
+        return tuple(names)
+
+    @classmethod
+    def get_select_related(cls) -> tuple[str, ...]:
+        """Return the lookups to pass to `QuerySet.select_related()` to load all nested relations."""
+
+        lookups = []
+        for name, (django_field, nested_model_class) in cls._django_relations.items():
+            if _is_single_relation(django_field):
+                lookups.append(name)
+                lookups.extend(
+                    f"{name}__{nested_lookup}"
+                    for nested_lookup
+                    in nested_model_class.get_select_related()
+                )
+        return tuple(lookups)
+
+    @classmethod
+    def get_prefetch_related(cls) -> tuple[models.Prefetch, ...]:
+        """
+        Return the lookups to pass to `QuerySet.prefetch_related()` to load all nested relations.
+
+        Together with `get_select_related()` this loads all data using a fixed number
+        of queries (one for the model and relations using joins, plus one for each
+        relation pointing to many instances).
+        """
+
+        lookups: list[models.Prefetch] = [
+            # Only the primary keys are used, in order, see model_to_dict()
+            models.Prefetch(
+                django_field.name,
+                queryset=cast(
+                    type[models.Model],
+                    django_field.related_model,
+                )._default_manager.only("pk").order_by("pk"),
+            )
+            for django_field
+            in cls._get_django_many_to_many_fields()
+        ]
+        for name, (django_field, nested_model_class) in cls._django_relations.items():
+            if _is_single_relation(django_field):
+                lookups.extend(
+                    _prefix_prefetch(name, nested_lookup)
+                    for nested_lookup
+                    in nested_model_class.get_prefetch_related()
+                )
+            else:
+                related_model = cast(type[models.Model], django_field.related_model)
+                lookups.append(models.Prefetch(
+                    name,
+                    queryset=nested_model_class.apply_related(related_model._default_manager.all()),
+                ))
+        return tuple(lookups)
+
+    @classmethod
+    def apply_related(
+        cls,
+        queryset: models.QuerySet[DjangoModelT],
+    ) -> models.QuerySet[DjangoModelT]:
+        """Apply `get_select_related()` and `get_prefetch_related()` to the queryset."""
+
+        select_related = cls.get_select_related()
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        prefetch_related = cls.get_prefetch_related()
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+    @classmethod
+    def project(
+        cls,
+        queryset: models.QuerySet[DjangoModelT],
+    ) -> models.QuerySet[DjangoModelT]:
+        """
+        Restrict the queryset to load only the columns used by this model.
+
+        Uses `QuerySet.only()`, so the queryset still returns model instances. Foreign
+        keys will load their ``_id`` column. Nested relations are loaded using
+        `apply_related()`. For models not created by `django_to_pydantic_model()`
+        the queryset is returned unchanged.
+        """
+
+        if cls._django_model is None:
+            return queryset
+
+        return cls.apply_related(queryset.only(*cls._get_django_only_names()))
+
+    @classmethod
+    def from_django_many(
+        cls: type[Self],
+        objs: Iterable[DjangoModelT],
+        *,
+        trusted: bool | None = None,
+    ) -> list[Self]:
+        """
+        Convert many Django instances, validating all of them in one go.
+
+        Prefetch the relations (see `apply_related()`), otherwise every instance needs
+        queries of its own - a warning is emitted for many to many relations.
+        """
+
+        objs = list(objs)
+        cls._warn_many_to_many_not_prefetched(objs)
+        with profile_phase(PHASE_CONVERSION):
+            return cls._validate_django_data(
+                [
+                    cls._get_django_data(obj)
+                    for obj
+                    in objs
+                ],
+                trusted,
+            )
+
+    @classmethod
+    def _warn_many_to_many_not_prefetched(cls, objs: list[DjangoModelT]) -> None:
+        if len(objs) < 2 or objs[0].pk is None:
+            return
+        prefetched = getattr(objs[0], "_prefetched_objects_cache", {})
+        names = [
+            django_field.name
+            for django_field
+            in cls._get_django_many_to_many_fields()
+            if django_field.name not in prefetched
+        ]
+        if names:
+            warnings.warn(
+                f"Many to many relations of {cls.__name__} not prefetched, loading them costs "
+                f"one query per instance: {', '.join(names)} (see apply_related())",
+                RuntimeWarning,
+                stacklevel=3,
+            )
+
+    def _get_django_write_data(self) -> dict[str, Any]:
+        return {
+            attname: getattr(self, attname)
+            for attname
+            in _get_django_write_fields(type(self))
+        }
+
+    def to_django(self, instance: DjangoModelT | None = None) -> DjangoModelT:
+        """
+        Create an (unsaved) Django instance from the data, or update ``instance``.
+
+        Only fields backed by a column of the model are written, file fields and many
+        to many relations are not. Django's validation (``full_clean()``) is not run.
+        """
+
+        data = self._get_django_write_data()
+        if instance is None:
+            return cast(type[DjangoModelT], self._django_model)(**data)
+
+        for attname, value in data.items():
+            setattr(instance, attname, value)
+        return instance
+
+    @classmethod
+    def to_django_many(cls, dtos: Iterable[Self]) -> list[DjangoModelT]:
+        """Create many (unsaved) Django instances, see `to_django()`."""
+
+        django_model = cast(type[DjangoModelT], cls._django_model)
+        return [
+            django_model(**dto._get_django_write_data())
+            for dto
+            in dtos
+        ]
+
+    @classmethod
+    def from_queryset(
+        cls: type[Self],
+        queryset: models.QuerySet[DjangoModelT],
+        *,
+        trusted: bool | None = None,
+    ) -> list[Self]:
+        """
+        Convert all rows of the queryset.
+
+        When possible the rows are loaded using `QuerySet.values()`, so no Django
+        instances need to be created at all.
+        """
+
+        if not cls._can_use_django_values():
+            return cls.from_django_many(cls.apply_related(queryset), trusted=trusted)
+
+        return cls._from_django_values(
+            list(queryset.values(*cls._get_django_values_names())),
+            trusted,
+        )
+
+    @classmethod
+    async def afrom_queryset(
+        cls: type[Self],
+        queryset: models.QuerySet[DjangoModelT] | AsyncIterable[DjangoModelT],
+        *,
+        trusted: bool | None = None,
+    ) -> list[Self]:
+        """Async version of `from_queryset()`, also accepts any async iterable of instances."""
+
+        if (
+            isinstance(queryset, models.QuerySet)
+            and cls._can_use_django_values()
+        ):
+            return await cls._afrom_django_values(
+                [
+                    row
+                    async for row
+                    in queryset.values(*cls._get_django_values_names())
+                ],
+                trusted,
+            )
+
+        if isinstance(queryset, models.QuerySet):
+            return await cls._afrom_django_many(
+                [
+                    obj
+                    async for obj
+                    in cls.apply_related(queryset)
+                ],
+                trusted,
+            )
+
+        return await cls._afrom_django_many([obj async for obj in queryset], trusted)
+
+    @classmethod
+    async def _afrom_django_many(
+        cls: type[Self],
+        objs: list[DjangoModelT],
+        trusted: bool | None,
+    ) -> list[Self]:
+        """Like `from_django_many()`, running it in a thread if relations may need queries."""
+
+        if cls._django_relations or cls._get_django_many_to_many_fields():
+            # Relations may need to be loaded from the database, as we don't know
+            # whether they have been prefetched (like relations apply_related()
+            # does not cover)
+            return await sync_to_async(cls.from_django_many)(objs, trusted=trusted)
+        return cls.from_django_many(objs, trusted=trusted)
+
+    @classmethod
+    def dump_queryset_json(
+        cls,
+        queryset: models.QuerySet[DjangoModelT],
+        *,
+        trusted: bool | None = None,
+    ) -> bytes:
+        """
+        Convert all rows of the queryset to a JSON array.
+
+        For trusted data (see `from_django()`) the rows are loaded using
+        `QuerySet.values()` and written to JSON directly, without creating any model
+        instances - if the model allows to (see `_can_dump_django_values_json()`).
+        Otherwise this dumps the result of `from_queryset()`.
+        """
+
+        if cls._is_trusted(trusted) and cls._can_dump_django_values_json():
+            data = cls._get_django_values_json_data(
+                list(queryset.values(*cls._get_django_values_names())),
+            )
+            with profile_phase(PHASE_SERIALIZATION):
+                return pydantic_core.to_json(data)
+
+        dtos = cls.from_queryset(queryset, trusted=trusted)
+        with profile_phase(PHASE_SERIALIZATION):
+            return get_list_type_adapter(cls).dump_json(dtos, by_alias=True)
+
+    @classmethod
+    async def adump_queryset_json(
+        cls,
+        queryset: models.QuerySet[DjangoModelT],
+        *,
+        trusted: bool | None = None,
+    ) -> bytes:
+        """Async version of `dump_queryset_json()`."""
+
+        if cls._is_trusted(trusted) and cls._can_dump_django_values_json():
+            data = await cls._aget_django_values_json_data(
+                [
+                    row
+                    async for row
+                    in queryset.values(*cls._get_django_values_names())
+                ],
+            )
+            with profile_phase(PHASE_SERIALIZATION):
+                return pydantic_core.to_json(data)
+
+        dtos = await cls.afrom_queryset(queryset, trusted=trusted)
+        with profile_phase(PHASE_SERIALIZATION):
+            return get_list_type_adapter(cls).dump_json(dtos, by_alias=True)
+
+    @classmethod
+    async def aiter_queryset_chunks(
+        cls: type[Self],
+        queryset: models.QuerySet[DjangoModelT],
+        *,
+        chunk_size: int = 2000,
+        trusted: bool | None = None,
+    ) -> AsyncIterator[list[Self]]:
+        """
+        Convert the rows of the queryset in chunks of (at most) ``chunk_size`` rows.
+
+        Uses `QuerySet.aiterator()`, so only one chunk needs to be kept in memory.
+        """
+
+        rows: AsyncIterator[Any]
+        convert: Callable[[list[Any]], Awaitable[list[Self]]]
+        if cls._can_use_django_values():
+            rows = queryset.values(*cls._get_django_values_names()).aiterator(
+                chunk_size=chunk_size,
+            )
+
+            async def convert(chunk: list[dict[str, Any]]) -> list[Self]:
+                return await cls._afrom_django_values(chunk, trusted)
+        else:
+            rows = _aiterator_with_prefetch(cls.apply_related(queryset), chunk_size=chunk_size)
+
+            async def convert(chunk: list[DjangoModelT]) -> list[Self]:
+                return await cls._afrom_django_many(chunk, trusted)
+
+        async for chunk in abatched(rows, chunk_size):
+            yield await convert(chunk)
+
+
+def _get_pydantic_relation_field(
+    django_field: FieldType,
+    nested_model_class: type[DjangoModelBase],
+) -> tuple[Any, Any]:
+    title = str(getattr(django_field, "verbose_name", django_field.name))
+    description = str(getattr(django_field, "help_text", ""))
+
+    if not _is_single_relation(django_field):
+        return (
+            list[nested_model_class],  # type: ignore
+            pydantic.Field(..., title=title, description=description),
+        )
+
+    # Reverse one to one relations may always be empty
+    if (
+        isinstance(django_field, models.ForeignObjectRel)
+        or getattr(django_field, "null", False)
+    ):
+        return (
+            nested_model_class | None,
+            pydantic.Field(None, title=title, description=description),
+        )
+
+    return (
+        nested_model_class,
+        pydantic.Field(..., title=title, description=description),
+    )
 
 
 def django_to_pydantic_model(
@@ -42,11 +858,64 @@ def django_to_pydantic_model(
     skip_unknown_field_types: bool = True,
     include: set[str] | None = None,
     exclude: set[str] | None = None,
+    relations: dict[str, type[DjangoModelBase]] | None = None,
+) -> type[DjangoModelBase[DjangoModelT]]:
+    """
+    Create a pydantic model for the given Django model.
+
+    ``relations`` allows to use nested models for relations (foreign keys, one to one,
+    many to many and reverse relations), mapping the name of the relation to the
+    pydantic model to use. Relations pointing to many instances will result in a list.
+    Relations are always added, regardless of ``include`` and ``exclude``. Use
+    `DjangoModelBase.apply_related()` to load them without any N+1 queries.
+
+    Models are cached, calling this again using the same arguments will return the
+    same pydantic model. See `get_dto_registry_stats()`.
+    """
+
+    return dto_registry.get_or_create(
+        (
+            model_class,
+            skip_unknown_field_types,
+            frozenset(include) if include is not None else None,
+            frozenset(exclude) if exclude is not None else None,
+            frozenset(relations.items()) if relations else None,
+        ),
+        lambda: _create_pydantic_model(
+            model_class,
+            skip_unknown_field_types=skip_unknown_field_types,
+            include=include,
+            exclude=exclude,
+            relations=relations,
+        ),
+    )
+
+
+def _create_pydantic_model(
+    model_class: type[DjangoModelT],
+    *,
+    skip_unknown_field_types: bool,
+    include: set[str] | None,
+    exclude: set[str] | None,
+    relations: dict[str, type[DjangoModelBase]] | None,
 ) -> type[DjangoModelBase[DjangoModelT]]:
-    pydantic_fields = {}
+    pydantic_fields: dict[str, Any] = {}
+    django_model_fields: dict[str, FieldType] = {}
+    django_model_relations: dict[str, tuple[FieldType, type[DjangoModelBase]]] = {}
+    relations = relations or {}
 
     django_fields = model_class._meta.get_fields(include_hidden=False)
     for django_field in django_fields:
+        relation_name = _get_relation_name(django_field)
+        if django_field.is_relation and relation_name in relations:
+            nested_model_class = relations[relation_name]
+            pydantic_fields[relation_name] = _get_pydantic_relation_field(
+                django_field,
+                nested_model_class,
+            )
+            django_model_relations[relation_name] = (django_field, nested_model_class)
+            continue
+
         if (
             (
                 # Skip excluded fields
@@ -86,7 +955,7 @@ def django_to_pydantic_model(
         # Prepare all variables we are using
         pydantic_type, pydantic_params_callback = pydantic_field_options
         pydantic_default: EllipsisType | PydanticUndefinedType | None = ...
-        pydantic_params = {}
+        pydantic_params: dict[str, Any] = {}
         pydantic_name = django_field.attname if hasattr(django_field, "attname") else django_field.name
 
         # Allow pydantic_type to be a callable so we determine the actual type
@@ -108,8 +977,13 @@ def django_to_pydantic_model(
                 # OpenAPI spec
                 pydantic_default = None
 
-        # Calculate fields default value
-        if hasattr(django_field, "default") and django_field.default:
+        # Many to many relations allowed to be blank may be left empty
+        if isinstance(django_field, models.ManyToManyField) and django_field.blank:
+            pydantic_params["default_factory"] = list
+            pydantic_default = PydanticUndefined  # Ensure we don't have two defaults
+
+        # Calculate fields default value (Django uses NOT_PROVIDED for "no default")
+        if isinstance(django_field, models.Field) and django_field.has_default():
             if callable(django_field.default):
                 pydantic_params["default_factory"] = django_field.default
                 pydantic_default = PydanticUndefined  # Ensure we don't have two defaults
@@ -131,6 +1005,14 @@ def django_to_pydantic_model(
                 **pydantic_params,
             ),
         )
+        django_model_fields[pydantic_name] = django_field
+
+    unknown_relations = relations.keys() - django_model_relations.keys()
+    if unknown_relations:
+        raise ValueError(
+            f"Unknown relations {', '.join(sorted(unknown_relations))} for "
+            f"model {model_class.__name__}",
+        )
 
     pydantic_model_class = cast(
         type[DjangoModelBase[DjangoModelT]],
@@ -142,5 +1024,8 @@ def django_to_pydantic_model(
     )
 
     pydantic_model_class.__doc__ = model_class.__doc__
+    pydantic_model_class._django_model = model_class
+    pydantic_model_class._django_fields = django_model_fields
+    pydantic_model_class._django_relations = django_model_relations
 
     return pydantic_model_class
@@ -0,0 +1,89 @@
+import dataclasses
+import threading
+import time
+from collections.abc import Callable, Hashable
+from typing import Any
+
+import pydantic
+from pydantic_core import SchemaValidator
+
+
+@dataclasses.dataclass(frozen=True)
+class DTORegistryStats:
+    # Number of pydantic models created
+    created: int
+    # Number of calls returning an already created pydantic model
+    cache_hits: int
+    # Total time spent creating the pydantic models
+    build_seconds: float
+    # Number of created pydantic models not validated/serialized yet, their
+    # pydantic-core schema has not been built
+    deferred: int
+
+
+class DTORegistry:
+    """
+    Cache of pydantic models created for Django models.
+
+    Ensures every pydantic model is only created once for the same arguments, see
+    `django_to_pydantic_model()`.
+    """
+
+    def __init__(self) -> None:
+        self._models: dict[Hashable, type[pydantic.BaseModel]] = {}
+        self._lock = threading.Lock()
+        self._cache_hits = 0
+        self._build_seconds = 0.0
+
+    def get_or_create(
+        self,
+        key: Hashable,
+        create: Callable[[], Any],
+    ) -> Any:
+        model_class = self._models.get(key)
+        if model_class is not None:
+            self._cache_hits += 1
+            return model_class
+
+        with self._lock:
+            # Another thread may have created the model while we were waiting
+            model_class = self._models.get(key)
+            if model_class is not None:
+                self._cache_hits += 1
+                return model_class
+
+            start = time.perf_counter()
+            model_class = create()
+            self._build_seconds += time.perf_counter() - start
+            self._models[key] = model_class
+            return model_class
+
+    def get_stats(self) -> DTORegistryStats:
+        return DTORegistryStats(
+            created=len(self._models),
+            cache_hits=self._cache_hits,
+            build_seconds=self._build_seconds,
+            deferred=sum(
+                1
+                for model_class
+                in self._models.values()
+                # Only look into the class itself, accessing the attribute on the mock
+                # validator would build the schema
+                if not isinstance(model_class.__dict__.get("__pydantic_validator__"), SchemaValidator)
+            ),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+            self._cache_hits = 0
+            self._build_seconds = 0.0
+
+
+dto_registry = DTORegistry()
+
+
+def get_dto_registry_stats() -> DTORegistryStats:
+    """Return statistics about the pydantic models created by `django_to_pydantic_model()`."""
+
+    return dto_registry.get_stats()
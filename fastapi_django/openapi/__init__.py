@@ -0,0 +1,7 @@
+from .snapshot import (
+    get_routes_fingerprint,
+    install_openapi_snapshot,
+    load_openapi_snapshot,
+    render_openapi_snapshot,
+    write_openapi_snapshot,
+)
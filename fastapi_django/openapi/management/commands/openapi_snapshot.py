@@ -0,0 +1,56 @@
+import json
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+from fastapi import FastAPI
+
+from ...snapshot import load_openapi_snapshot, render_openapi_snapshot, write_openapi_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the OpenAPI schemas of the APIs in settings.OPENAPI_SNAPSHOT_APPS to "
+        "settings.OPENAPI_SNAPSHOT_DIR, served by install_openapi_snapshot()."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "names",
+            nargs="*",
+            help="Names of the APIs to write the snapshot for, all if not given",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Do not write anything, exit with an error if any snapshot is missing or outdated",
+        )
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        apps: dict[str, str] = getattr(settings, "OPENAPI_SNAPSHOT_APPS", {})
+        directory = Path(getattr(settings, "OPENAPI_SNAPSHOT_DIR", "openapi"))
+        names = options["names"] or list(apps)
+        unknown_names = set(names) - apps.keys()
+        if unknown_names:
+            raise CommandError(f"Unknown APIs: {', '.join(sorted(unknown_names))}")
+
+        outdated = []
+        for name in names:
+            app: FastAPI = import_string(apps[name])
+            path = directory / f"{name}.json"
+            if options["check"]:
+                # Compare the whole schema, so changes of the models are detected, too
+                snapshot = load_openapi_snapshot(path)
+                expected = json.loads(json.dumps(render_openapi_snapshot(app)))
+                if snapshot != expected:
+                    outdated.append(name)
+                continue
+
+            write_openapi_snapshot(app, path)
+            self.stdout.write(f"Wrote OpenAPI snapshot of {name} to {path}")
+
+        if outdated:
+            raise CommandError(f"OpenAPI snapshots missing or outdated: {', '.join(outdated)}")
@@ -0,0 +1,190 @@
+import dataclasses
+import gzip
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI
+from fastapi.dependencies.utils import get_flat_dependant
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+# Only import modules not depending on any models here, this is a Django app
+from ..utils import parse_accept_encoding
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class _OpenAPIVariant:
+    body: bytes
+    gzip_body: bytes
+    etag: str
+    gzip_etag: str
+
+
+def get_routes_fingerprint(app: FastAPI) -> str:
+    """
+    Return a hash of everything defining the routes of the app, used to detect outdated snapshots.
+
+    Covers the paths, methods, operation IDs, parameters and response models. Changes
+    of the models themselves (like new fields) are not detected, use
+    ``manage.py openapi_snapshot --check`` for that.
+    """
+
+    routes = []
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or not route.include_in_schema:
+            continue
+        dependant = get_flat_dependant(route.dependant, skip_repeats=True)
+        routes.append([
+            route.path,
+            sorted(route.methods),
+            route.operation_id or route.unique_id,
+            repr(route.response_model),
+            [
+                [param.name, repr(param.type_)]
+                for params
+                in (
+                    dependant.path_params,
+                    dependant.query_params,
+                    dependant.header_params,
+                    dependant.cookie_params,
+                    dependant.body_params,
+                )
+                for param
+                in params
+            ],
+        ])
+    data = {
+        "title": app.title,
+        "version": app.version,
+        "openapi_version": app.openapi_version,
+        "routes": routes,
+    }
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def render_openapi_snapshot(app: FastAPI) -> dict[str, Any]:
+    """Generate the OpenAPI schema of the app (ignoring any installed snapshot) as a snapshot."""
+
+    app.openapi_schema = None
+    return {
+        "fingerprint": get_routes_fingerprint(app),
+        "schema": app.openapi(),
+    }
+
+
+def write_openapi_snapshot(app: FastAPI, path: str | os.PathLike[str]) -> None:
+    """Generate the OpenAPI schema of the app and write it to ``path``, see `install_openapi_snapshot()`."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(render_openapi_snapshot(app), separators=(",", ":")))
+
+
+def load_openapi_snapshot(path: str | os.PathLike[str]) -> dict[str, Any] | None:
+    """Return the snapshot written by `write_openapi_snapshot()`, ``None`` if there is none."""
+
+    try:
+        return json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return None
+
+
+def _add_server(schema: dict[str, Any], root_path: str) -> dict[str, Any]:
+    # Like FastAPI does for mounted apps, keeping the order of the generated schema
+    # (servers follow the info)
+    servers = [{"url": root_path}, *schema.get("servers", ())]
+    result = {}
+    for key, value in schema.items():
+        if key != "servers":
+            result[key] = value
+        if key == "info":
+            result["servers"] = servers
+    return result
+
+
+def _build_variant(schema: dict[str, Any]) -> _OpenAPIVariant:
+    # Same separators as JSONResponse, so the bytes match the generated schema
+    body = json.dumps(schema, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    return _OpenAPIVariant(
+        body=body,
+        gzip_body=gzip.compress(body, compresslevel=9, mtime=0),
+        etag=etag,
+        gzip_etag=f'{etag[:-1]}-gzip"',
+    )
+
+
+def install_openapi_snapshot(app: FastAPI, path: str | os.PathLike[str]) -> bool:
+    """
+    Serve the OpenAPI schema of the app from the snapshot written to ``path``.
+
+    Generating the schema for many DTOs may take seconds, blocking the worker handling
+    the first request. The snapshot is rendered at build time instead (see
+    ``manage.py openapi_snapshot``) and served as precomputed (and gzip compressed)
+    bytes with an ``ETag``. Call this after all routes have been added.
+
+    Returns whether the snapshot is used. Missing snapshots and snapshots not matching
+    the current routes (see `get_routes_fingerprint()`) are ignored, the schema is
+    generated on the first request as usual then.
+    """
+
+    if not app.openapi_url:
+        return False
+
+    snapshot = load_openapi_snapshot(path)
+    if snapshot is None:
+        logger.info("No OpenAPI snapshot found at %s", path)
+        return False
+    if snapshot.get("fingerprint") != get_routes_fingerprint(app):
+        logger.warning("OpenAPI snapshot %s does not match the routes, run `manage.py openapi_snapshot`", path)
+        return False
+
+    schema: dict[str, Any] = snapshot["schema"]
+    app.openapi_schema = schema
+    server_urls = {server.get("url") for server in app.servers}
+    # By root path, mounted apps list it as a server
+    variants = {"": _build_variant(schema)}
+
+    async def openapi(request: Request) -> Response:
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        if not root_path or not app.root_path_in_servers or root_path in server_urls:
+            root_path = ""
+        variant = variants.get(root_path)
+        if variant is None:
+            variant = variants[root_path] = _build_variant(_add_server(schema, root_path))
+
+        use_gzip = "gzip" in parse_accept_encoding(request.headers.get("accept-encoding", ""))
+        etag = variant.gzip_etag if use_gzip else variant.etag
+        headers = {"etag": etag, "vary": "accept-encoding"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None and any(
+            tag.strip().removeprefix("W/") in (etag, "*")
+            for tag
+            in if_none_match.split(",")
+        ):
+            return Response(status_code=304, headers=headers)
+        if use_gzip:
+            headers["content-encoding"] = "gzip"
+        return Response(
+            variant.gzip_body if use_gzip else variant.body,
+            media_type="application/json",
+            headers=headers,
+        )
+
+    # Replace the route FastAPI added, keeping its position
+    app.router.routes = [
+        Route(app.openapi_url, openapi, include_in_schema=False)
+        if isinstance(route, Route) and route.path == app.openapi_url
+        else route
+        for route
+        in app.router.routes
+    ]
+    return True
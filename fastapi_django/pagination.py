@@ -0,0 +1,260 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from typing import Annotated, Any, Generic, Literal, TypeVar
+
+import pydantic
+import pydantic_core
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models.constants import LOOKUP_SEP
+from fastapi import HTTPException, Query, status
+
+from .models import DjangoModelBase
+
+DTOT = TypeVar("DTOT", bound=DjangoModelBase)
+
+CursorDirection = Literal["next", "prev"]
+
+
+class CursorPage(pydantic.BaseModel, Generic[DTOT]):
+    items: list[DTOT]
+    next: str | None = pydantic.Field(
+        None,
+        description="Cursor to fetch the next page, `null` if this is the last page",
+    )
+    prev: str | None = pydantic.Field(
+        None,
+        description="Cursor to fetch the previous page, `null` if this is the first page",
+    )
+
+
+def encode_cursor(direction: CursorDirection, key: Sequence[Any]) -> str:
+    """Encode the position of a row as an opaque cursor string."""
+
+    payload = json.dumps(
+        {"d": direction, "k": pydantic_core.to_jsonable_python(list(key))},
+        separators=(",", ":"),
+    ).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[CursorDirection, list[Any]]:
+    """Decode a cursor created by `encode_cursor()`, raises ValueError if it is invalid."""
+
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        direction, key = payload["d"], payload["k"]
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor") from e
+    if direction not in ("next", "prev") or not isinstance(key, list):
+        raise ValueError("Invalid cursor")
+    return direction, key
+
+
+class CursorParams:
+    """
+    FastAPI dependency for the query parameters of keyset paginated endpoints.
+
+    Use like ``params: Annotated[CursorParams, Depends()]`` and pass the result to
+    `paginate()` or `apaginate()`.
+    """
+
+    def __init__(
+        self,
+        cursor: Annotated[
+            str | None,
+            Query(description="Cursor as returned in `next` or `prev` of a previous page"),
+        ] = None,
+        limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    ) -> None:
+        self.limit = limit
+        self.direction: CursorDirection = "next"
+        self.key: list[Any] | None = None
+        if cursor is not None:
+            try:
+                self.direction, self.key = decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid cursor") from e
+
+
+def _get_key_names(ordering: Sequence[str]) -> list[str]:
+    return [name.removeprefix("-") for name in ordering]
+
+
+def _get_ordering_field(model: type[models.Model], name: str) -> models.Field:
+    """Return the Django field used for the ordering name, following relations."""
+
+    opts = model._meta
+    *path, field_name = name.split(LOOKUP_SEP)
+    for part in path:
+        opts = opts.get_field(part).related_model._meta  # type: ignore
+    if field_name == "pk":
+        return opts.pk  # type: ignore
+    return opts.get_field(field_name)  # type: ignore
+
+
+def _get_keyset_filter(
+    model: type[models.Model],
+    ordering: Sequence[str],
+    key: Sequence[Any],
+    direction: CursorDirection,
+) -> models.Q:
+    """
+    Build the filter selecting all rows after (or before) the given key.
+
+    For ordering ``(a, b)`` this results in ``a > x OR (a = x AND b > y)``, which can be
+    resolved using an index on the ordering columns. The key comes from the client, so
+    it is converted using the ordering fields - raising a 400 error for tampered
+    cursors instead of failing when running the query.
+    """
+
+    if len(key) != len(ordering):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid cursor")
+
+    keyset_filter = models.Q()
+    equal_filter = models.Q()
+    for ordering_name, value in zip(ordering, key, strict=True):
+        descending = ordering_name.startswith("-")
+        name = ordering_name.removeprefix("-")
+        try:
+            value = _get_ordering_field(model, name).to_python(value)
+        except (ValidationError, ValueError, TypeError) as e:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid cursor") from e
+        # Keys are never NULL, see `paginate()`
+        if value is None:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid cursor")
+        lookup = "gt" if descending == (direction == "prev") else "lt"
+        keyset_filter |= equal_filter & models.Q(**{f"{name}__{lookup}": value})
+        equal_filter &= models.Q(**{name: value})
+    return keyset_filter
+
+
+def _reverse_ordering(ordering: Sequence[str]) -> list[str]:
+    return [
+        name.removeprefix("-") if name.startswith("-") else f"-{name}"
+        for name
+        in ordering
+    ]
+
+
+def _prepare_queryset(
+    dto_class: type[DjangoModelBase],
+    queryset: models.QuerySet,
+    params: CursorParams,
+    ordering: Sequence[str],
+) -> models.QuerySet:
+    if params.key is not None:
+        queryset = queryset.filter(
+            _get_keyset_filter(queryset.model, ordering, params.key, params.direction),
+        )
+    if params.direction == "prev":
+        queryset = queryset.order_by(*_reverse_ordering(ordering))
+    else:
+        queryset = queryset.order_by(*ordering)
+    if dto_class._can_use_django_values():
+        queryset = queryset.values(*dict.fromkeys((
+            *dto_class._get_django_values_names(),
+            *_get_key_names(ordering),
+        )))
+    else:
+        queryset = dto_class.apply_related(queryset)
+    return queryset[:params.limit + 1]
+
+
+def _get_page_rows(rows: list[Any], params: CursorParams) -> tuple[list[Any], bool]:
+    has_more = len(rows) > params.limit
+    rows = rows[:params.limit]
+    if params.direction == "prev":
+        rows.reverse()
+    return rows, has_more
+
+
+def _get_page_keys(
+    dto_class: type[DjangoModelBase],
+    rows: list[Any],
+    ordering: Sequence[str],
+) -> list[list[Any]]:
+    key_names = _get_key_names(ordering)
+    if dto_class._can_use_django_values():
+        return [[row[name] for name in key_names] for row in rows]
+
+    return [
+        [
+            value.pk if isinstance(value, models.Model) else value
+            for value
+            in (getattr(row, name) for name in key_names)
+        ]
+        for row
+        in rows
+    ]
+
+
+def _build_page(
+    dto_class: type[DTOT],
+    items: list[DTOT],
+    keys: list[list[Any]],
+    has_more: bool,
+    params: CursorParams,
+) -> CursorPage[DTOT]:
+    if params.direction == "prev":
+        has_next = params.key is not None
+        has_prev = has_more
+    else:
+        has_next = has_more
+        has_prev = params.key is not None
+
+    return CursorPage[dto_class](  # type: ignore
+        items=items,
+        next=encode_cursor("next", keys[-1]) if has_next and keys else None,
+        prev=encode_cursor("prev", keys[0]) if has_prev and keys else None,
+    )
+
+
+def paginate(
+    dto_class: type[DTOT],
+    queryset: models.QuerySet,
+    params: CursorParams,
+    *,
+    ordering: Sequence[str] = ("pk",),
+    trusted: bool | None = None,
+) -> CursorPage[DTOT]:
+    """
+    Return one page of the queryset using keyset pagination.
+
+    ``ordering`` defines the key used for the cursors, prefix names with "-" for
+    descending order. The key must be unique (end with the primary key when in
+    doubt), non-nullable and should be backed by an index. Every page then costs
+    the same, regardless of how deep it is. See `DjangoModelBase.from_django()`
+    for ``trusted``.
+    """
+
+    queryset = _prepare_queryset(dto_class, queryset, params, ordering)
+    rows, has_more = _get_page_rows(list(queryset), params)
+    keys = _get_page_keys(dto_class, rows, ordering)
+    if dto_class._can_use_django_values():
+        items = dto_class._from_django_values(rows, trusted)
+    else:
+        items = dto_class.from_django_many(rows, trusted=trusted)
+    return _build_page(dto_class, items, keys, has_more, params)
+
+
+async def apaginate(
+    dto_class: type[DTOT],
+    queryset: models.QuerySet,
+    params: CursorParams,
+    *,
+    ordering: Sequence[str] = ("pk",),
+    trusted: bool | None = None,
+) -> CursorPage[DTOT]:
+    """Async version of `paginate()`."""
+
+    queryset = _prepare_queryset(dto_class, queryset, params, ordering)
+    rows, has_more = _get_page_rows([row async for row in queryset], params)
+    keys = _get_page_keys(dto_class, rows, ordering)
+    if dto_class._can_use_django_values():
+        items = await dto_class._afrom_django_values(rows, trusted)
+    else:
+        items = await dto_class._afrom_django_many(rows, trusted)
+    return _build_page(dto_class, items, keys, has_more, params)
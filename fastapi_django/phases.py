@@ -0,0 +1,100 @@
+import collections
+import contextlib
+import contextvars
+import threading
+import time
+from collections.abc import Iterator
+
+# Names of the phases timed using `profile_phase()`
+PHASE_CONVERSION = "conversion"
+PHASE_SERIALIZATION = "serialization"
+
+
+class RequestProfile:
+    """Queries and timings collected for a single request, see `fastapi_django.profiling`."""
+
+    def __init__(self) -> None:
+        # Queries may run in other threads, see `asgiref.sync.sync_to_async()`
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.phase_seconds: dict[str, float] = {}
+        # Number of executions per SQL statement (without the parameters)
+        self.sql_counts: collections.Counter[str] = collections.Counter()
+        # Time already assigned to queries or phases, see `profile_phase()`
+        self.accounted_seconds = 0.0
+
+    def add_query(self, sql: str, seconds: float) -> None:
+        with self._lock:
+            self.queries += 1
+            self.db_seconds += seconds
+            self.sql_counts[sql] += 1
+            self.accounted_seconds += seconds
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + seconds
+            self.accounted_seconds += seconds
+
+    def get_repeated_queries(self, threshold: int) -> list[tuple[str, int]]:
+        """Return the statements executed at least ``threshold`` times, likely N+1 queries."""
+
+        return [
+            (sql, count)
+            for sql, count
+            in self.sql_counts.most_common()
+            if count >= threshold
+        ]
+
+    def get_server_timing(self, total_seconds: float, n_plus_one_threshold: int) -> str:
+        """Return the value of the ``Server-Timing`` header."""
+
+        metrics = [f'db;dur={self.db_seconds * 1000:.2f};desc="{self.queries} queries"']
+        metrics.extend(
+            f"{name};dur={seconds * 1000:.2f}"
+            for name, seconds
+            in self.phase_seconds.items()
+        )
+        repeated_queries = self.get_repeated_queries(n_plus_one_threshold)
+        if repeated_queries:
+            metrics.append(f'n-plus-one;desc="{len(repeated_queries)} repeated queries"')
+        metrics.append(f"total;dur={total_seconds * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+# Set by `fastapi_django.profiling.QueryProfilingMiddleware` while profiling a request
+request_profile_var: contextvars.ContextVar[RequestProfile | None] = contextvars.ContextVar(
+    "fastapi_django_request_profile",
+    default=None,
+)
+
+
+def get_request_profile() -> RequestProfile | None:
+    """Return the profile of the current request, if profiled (see `fastapi_django.profiling`)."""
+
+    return request_profile_var.get()
+
+
+@contextlib.contextmanager
+def profile_phase(name: str) -> Iterator[None]:
+    """
+    Add the time spent in the block to the phase ``name`` of the current request.
+
+    Does nothing if the request is not profiled. Queries and nested phases are not
+    counted, so phases never overlap with each other or the database time.
+    """
+
+    profile = request_profile_var.get()
+    if profile is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    accounted_seconds = profile.accounted_seconds
+    try:
+        yield
+    finally:
+        profile.add_phase(
+            name,
+            time.perf_counter() - start - (profile.accounted_seconds - accounted_seconds),
+        )
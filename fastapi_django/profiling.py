@@ -0,0 +1,165 @@
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# The profile itself is kept free of any dependencies, so the model layer can time
+# its phases as well
+from .phases import PHASE_CONVERSION, PHASE_SERIALIZATION, RequestProfile, request_profile_var
+
+logger = logging.getLogger(__name__)
+
+_CONNECTION_CREATED_DISPATCH_UID = "fastapi_django.profiling:connection_created"
+
+def _profile_query(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    profile = request_profile_var.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.add_query(sql, time.perf_counter() - start)
+
+
+def _install_execute_wrapper(connection: BaseDatabaseWrapper, **_kwargs: Any) -> None:
+    if _profile_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_profile_query)
+
+
+def _install_query_profiling() -> None:
+    """
+    Record the queries of all connections while a request is profiled.
+
+    Connections are thread local (and queries run in other threads than the request,
+    see `sync_to_async()`), so the wrapper is installed on every connection once
+    created, plus the connections already used in this thread. Only called by
+    `QueryProfilingMiddleware`, so processes not profiling any requests (like
+    management commands or tests) never wrap their queries. Connections other threads
+    opened before are not covered, so create the middleware when building the app.
+    """
+
+    connection_created.connect(
+        _install_execute_wrapper,
+        dispatch_uid=_CONNECTION_CREATED_DISPATCH_UID,
+    )
+    for connection in connections.all(initialized_only=True):
+        _install_execute_wrapper(connection)
+
+
+class QueryProfilingMiddleware:
+    """
+    Profile the queries, the conversion and the serialization of each request.
+
+    Reports the number of queries and the time spent in the database, converting
+    Django data to DTOs and serializing the response using a ``Server-Timing`` header
+    (shown in the network tab of the browser's dev tools) and a log line. Statements
+    executed at least ``n_plus_one_threshold`` times are logged as likely N+1 queries.
+
+    Only the conversion and serialization done by this library is timed (see
+    `fastapi_django.phases.profile_phase()`) and streamed responses are only complete
+    in the log line, as the headers are sent before the body. Intended for
+    development, the headers disclose details about the backend.
+
+    Nested apps using this middleware (like mounts) only profile requests not already
+    profiled by an outer app. Queries are only recorded once the middleware has been
+    created with ``enabled=True``, pass ``enabled=False`` (or do not add it at all) to
+    not wrap any queries.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        enabled: bool = True,
+        server_timing: bool = True,
+        n_plus_one_threshold: int = 3,
+        log_level: int = logging.INFO,
+    ) -> None:
+        self.app = app
+        self.enabled = enabled
+        self.server_timing = server_timing
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.log_level = log_level
+        if enabled:
+            _install_query_profiling()
+
+    def _log(self, scope: Scope, status_code: int | None, profile: RequestProfile, total_seconds: float) -> None:
+        repeated_queries = profile.get_repeated_queries(self.n_plus_one_threshold)
+        logger.log(
+            logging.WARNING if repeated_queries else self.log_level,
+            "%s %s %s: %d queries in %.2fms, conversion %.2fms, serialization %.2fms, total %.2fms",
+            scope["method"],
+            scope["path"],
+            status_code,
+            profile.queries,
+            profile.db_seconds * 1000,
+            profile.phase_seconds.get(PHASE_CONVERSION, 0.0) * 1000,
+            profile.phase_seconds.get(PHASE_SERIALIZATION, 0.0) * 1000,
+            total_seconds * 1000,
+            extra={
+                "request_profile": {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": status_code,
+                    "queries": profile.queries,
+                    "db_ms": profile.db_seconds * 1000,
+                    **{
+                        f"{name}_ms": seconds * 1000
+                        for name, seconds
+                        in profile.phase_seconds.items()
+                    },
+                    "total_ms": total_seconds * 1000,
+                    "repeated_queries": [
+                        {"sql": sql, "count": count}
+                        for sql, count
+                        in repeated_queries
+                    ],
+                },
+            },
+        )
+        for sql, count in repeated_queries:
+            logger.warning("Query executed %d times, likely N+1: %s", count, sql)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.enabled or scope["type"] != "http" or request_profile_var.get() is not None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        status_code: int | None = None
+        start = time.perf_counter()
+
+        async def send_with_server_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing",
+                        profile.get_server_timing(
+                            time.perf_counter() - start,
+                            self.n_plus_one_threshold,
+                        ),
+                    )
+            await send(message)
+
+        token = request_profile_var.set(profile)
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            request_profile_var.reset(token)
+            self._log(scope, status_code, profile, time.perf_counter() - start)
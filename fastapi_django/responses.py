@@ -0,0 +1,344 @@
+from collections.abc import AsyncIterator, Mapping, Sequence
+from typing import Any
+
+import pydantic
+import pydantic_core
+from django.db import models
+from starlette.background import BackgroundTask
+from starlette.datastructures import Headers
+from starlette.responses import Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from .formats import CSV, JSON, MSGPACK, NDJSON, DTOFormat, dump_rows_csv, dump_rows_msgpack, negotiate_format
+from .models import DjangoModelBase
+from .phases import PHASE_SERIALIZATION, profile_phase
+from .utils import abatched, get_list_type_adapter
+
+
+class DTOResponse(Response):
+    """
+    Render a pydantic model (or a list of them) directly to JSON.
+
+    FastAPI passes returned responses through as they are, so using this skips
+    validating the returned data against the ``response_model`` again - which is
+    only necessary for data not coming from a trusted source. Keep ``response_model``
+    on the route for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        with profile_phase(PHASE_SERIALIZATION):
+            if isinstance(content, pydantic.BaseModel):
+                return content.__pydantic_serializer__.to_json(content, by_alias=True)
+            if isinstance(content, Sequence):
+                if not content:
+                    return b"[]"
+                return get_list_type_adapter(type(content[0])).dump_json(content, by_alias=True)  # type: ignore
+            return super().render(content)
+
+
+def _set_format_headers(response: Response, dto_format: DTOFormat) -> None:
+    response.raw_headers = [
+        (name, value)
+        for name, value
+        in response.raw_headers
+        if name not in (b"content-type", b"vary")
+    ]
+    response.raw_headers.append((b"content-type", dto_format.media_type.encode("latin-1")))
+    # The response depends on the Accept header, caches must not mix the formats
+    response.raw_headers.append((b"vary", b"accept"))
+
+
+class DTOQuerysetResponse(Response):
+    """
+    Render all rows of a queryset converted to the given DTO as a JSON array.
+
+    The queryset is evaluated when the response is sent, using
+    `DjangoModelBase.adump_queryset_json()`. For trusted data (see
+    `DjangoModelBase.from_django()`) this writes the rows returned by
+    `QuerySet.values()` to JSON directly, without creating any Django instances or
+    DTOs. Keep ``response_model`` on the route for the OpenAPI schema.
+
+    Pass ``formats`` (like `fastapi_django.formats.DEFAULT_FORMATS`) to send the
+    format best matching the ``Accept`` header of the request instead, see
+    `iter_queryset()`.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        dto_class: type[DjangoModelBase],
+        queryset: models.QuerySet,
+        *,
+        trusted: bool | None = None,
+        formats: Sequence[DTOFormat] | None = None,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        background: BackgroundTask | None = None,
+    ) -> None:
+        self.dto_class = dto_class
+        self.queryset = queryset
+        self.trusted = trusted
+        self.formats = formats
+        super().__init__(None, status_code=status_code, headers=headers, background=background)
+
+        self.rendered = False
+
+    async def render_queryset(self, accept: str | None = None) -> None:
+        """
+        Evaluate the queryset and set the body, done automatically when sending the response.
+
+        ``accept`` is the ``Accept`` header of the request, only used if ``formats``
+        were given.
+        """
+
+        if self.rendered:
+            return
+
+        if self.formats is None:
+            self.body = await self.dto_class.adump_queryset_json(self.queryset, trusted=self.trusted)
+        else:
+            dto_format = negotiate_format(accept, self.formats)
+            if dto_format == JSON:
+                self.body = await self.dto_class.adump_queryset_json(self.queryset, trusted=self.trusted)
+            else:
+                self.body = b"".join([
+                    chunk
+                    async for chunk
+                    in iter_queryset(dto_format, self.dto_class, self.queryset, trusted=self.trusted)
+                ])
+            _set_format_headers(self, dto_format)
+        # Headers were initialized without any body, so add the length now
+        self.raw_headers = [
+            (name, value)
+            for name, value
+            in self.raw_headers
+            if name != b"content-length"
+        ]
+        self.raw_headers.append((b"content-length", str(len(self.body)).encode("latin-1")))
+        self.rendered = True
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.render_queryset(Headers(scope=scope).get("accept"))
+        await super().__call__(scope, receive, send)
+
+
+async def _aiter_queryset_json_data(
+    dto_class: type[DjangoModelBase],
+    queryset: models.QuerySet,
+    *,
+    chunk_size: int,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Read the queryset in chunks, returning data to be passed to `pydantic_core.to_json()`."""
+
+    rows = queryset.values(*dto_class._get_django_values_names()).aiterator(chunk_size=chunk_size)
+    async for chunk in abatched(rows, chunk_size):
+        yield await dto_class._aget_django_values_json_data(chunk)
+
+
+def _can_dump_queryset_json_data(dto_class: type[DjangoModelBase], trusted: bool | None) -> bool:
+    return dto_class._is_trusted(trusted) and dto_class._can_dump_django_values_json()
+
+
+async def iter_queryset_json(
+    dto_class: type[DjangoModelBase],
+    queryset: models.QuerySet,
+    *,
+    chunk_size: int = 2000,
+    trusted: bool | None = None,
+) -> AsyncIterator[bytes]:
+    """Serialize all rows of the queryset as one JSON array, chunk by chunk."""
+
+    chunks_json: AsyncIterator[bytes]
+    if _can_dump_queryset_json_data(dto_class, trusted):
+        chunks_json = (
+            pydantic_core.to_json(chunk)
+            async for chunk
+            in _aiter_queryset_json_data(dto_class, queryset, chunk_size=chunk_size)
+        )
+    else:
+        list_type_adapter = get_list_type_adapter(dto_class)
+        chunks_json = (
+            list_type_adapter.dump_json(chunk, by_alias=True)
+            async for chunk
+            in dto_class.aiter_queryset_chunks(queryset, chunk_size=chunk_size, trusted=trusted)
+        )
+
+    yield b"["
+    first = True
+    async for chunk_json in chunks_json:
+        # Dumping the whole chunk is way faster than dumping every single item, just
+        # strip the surrounding brackets so the chunks can be joined
+        if not first:
+            yield b","
+        first = False
+        yield chunk_json[1:-1]
+    yield b"]"
+
+
+async def iter_queryset_ndjson(
+    dto_class: type[DjangoModelBase],
+    queryset: models.QuerySet,
+    *,
+    chunk_size: int = 2000,
+    trusted: bool | None = None,
+) -> AsyncIterator[bytes]:
+    """Serialize all rows of the queryset as newline delimited JSON, chunk by chunk."""
+
+    if _can_dump_queryset_json_data(dto_class, trusted):
+        async for chunk_data in _aiter_queryset_json_data(dto_class, queryset, chunk_size=chunk_size):
+            yield b"".join(
+                pydantic_core.to_json(item) + b"\n"
+                for item
+                in chunk_data
+            )
+        return
+
+    async for chunk in dto_class.aiter_queryset_chunks(queryset, chunk_size=chunk_size, trusted=trusted):
+        yield b"".join(
+            dto.__pydantic_serializer__.to_json(dto, by_alias=True) + b"\n"
+            for dto
+            in chunk
+        )
+
+
+async def _aiter_queryset_python_data(
+    dto_class: type[DjangoModelBase],
+    queryset: models.QuerySet,
+    *,
+    chunk_size: int,
+    trusted: bool | None,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Read the queryset in chunks, returning the data the DTO dumps in python mode."""
+
+    if _can_dump_queryset_json_data(dto_class, trusted):
+        # Values of the rows are python objects as well (dates, decimals, ...)
+        async for chunk_data in _aiter_queryset_json_data(dto_class, queryset, chunk_size=chunk_size):
+            yield chunk_data
+        return
+
+    list_type_adapter = get_list_type_adapter(dto_class)
+    async for chunk in dto_class.aiter_queryset_chunks(queryset, chunk_size=chunk_size, trusted=trusted):
+        yield list_type_adapter.dump_python(chunk, by_alias=True)
+
+
+async def iter_queryset_csv(
+    dto_class: type[DjangoModelBase],
+    queryset: models.QuerySet,
+    *,
+    chunk_size: int = 2000,
+    trusted: bool | None = None,
+) -> AsyncIterator[bytes]:
+    """Serialize all rows of the queryset as CSV (including a header), chunk by chunk."""
+
+    yield dump_rows_csv(dto_class, [], header=True)
+    async for chunk_data in _aiter_queryset_python_data(
+        dto_class,
+        queryset,
+        chunk_size=chunk_size,
+        trusted=trusted,
+    ):
+        yield dump_rows_csv(dto_class, chunk_data)
+
+
+async def iter_queryset_msgpack(
+    dto_class: type[DjangoModelBase],
+    queryset: models.QuerySet,
+    *,
+    chunk_size: int = 2000,
+    trusted: bool | None = None,
+) -> AsyncIterator[bytes]:
+    """
+    Serialize all rows of the queryset as a sequence of MessagePack maps, chunk by chunk.
+
+    Like NDJSON there is no surrounding array (its length would be needed upfront),
+    clients read the rows using ``msgpack.Unpacker``.
+    """
+
+    async for chunk_data in _aiter_queryset_python_data(
+        dto_class,
+        queryset,
+        chunk_size=chunk_size,
+        trusted=trusted,
+    ):
+        yield dump_rows_msgpack(dto_class, chunk_data)
+
+
+_QUERYSET_SERIALIZERS = {
+    JSON.name: iter_queryset_json,
+    NDJSON.name: iter_queryset_ndjson,
+    CSV.name: iter_queryset_csv,
+    MSGPACK.name: iter_queryset_msgpack,
+}
+
+
+def iter_queryset(
+    dto_format: DTOFormat,
+    dto_class: type[DjangoModelBase],
+    queryset: models.QuerySet,
+    *,
+    chunk_size: int = 2000,
+    trusted: bool | None = None,
+) -> AsyncIterator[bytes]:
+    """
+    Serialize all rows of the queryset in the given format, chunk by chunk.
+
+    Values are encoded using the Django fields of the DTO, so no per row conversion
+    (like `fastapi.encoders.jsonable_encoder()`) is needed.
+    """
+
+    return _QUERYSET_SERIALIZERS[dto_format.name](dto_class, queryset, chunk_size=chunk_size, trusted=trusted)
+
+
+class DTOStreamingResponse(StreamingResponse):
+    """
+    Stream all rows of a queryset converted to the given DTO.
+
+    The queryset is read in chunks, so memory usage does not depend on the number of
+    rows. Use ``ndjson=True`` to send newline delimited JSON instead of a JSON array,
+    or pass ``formats`` to choose the format using the ``Accept`` header (see
+    `DTOQuerysetResponse`). See `DjangoModelBase.from_django()` for ``trusted``.
+    """
+
+    def __init__(
+        self,
+        dto_class: type[DjangoModelBase],
+        queryset: models.QuerySet,
+        *,
+        chunk_size: int = 2000,
+        ndjson: bool = False,
+        trusted: bool | None = None,
+        formats: Sequence[DTOFormat] | None = None,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        background: BackgroundTask | None = None,
+    ) -> None:
+        self.dto_class = dto_class
+        self.queryset = queryset
+        self.chunk_size = chunk_size
+        self.trusted = trusted
+        self.formats = formats
+
+        dto_format = NDJSON if ndjson else JSON
+        super().__init__(
+            iter_queryset(dto_format, dto_class, queryset, chunk_size=chunk_size, trusted=trusted),
+            status_code=status_code,
+            headers=headers,
+            media_type=dto_format.media_type,
+            background=background,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.formats is not None:
+            dto_format = negotiate_format(Headers(scope=scope).get("accept"), self.formats)
+            self.body_iterator = iter_queryset(
+                dto_format,
+                self.dto_class,
+                self.queryset,
+                chunk_size=self.chunk_size,
+                trusted=self.trusted,
+            )
+            _set_format_headers(self, dto_format)
+        await super().__call__(scope, receive, send)
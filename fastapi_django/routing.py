@@ -0,0 +1,98 @@
+from collections.abc import Mapping
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class PrefixDispatcher:
+    """
+    Dispatch requests to mounted apps by path prefix, using dict lookups only.
+
+    Starlette checks the regular expression of every route and mount in order, so
+    requests handled by the last (catch-all) mount pay for all others. This looks up
+    the prefixes of the request path instead, longest first, so finding an app only
+    costs one dict lookup per path segment.
+
+    ``mounts`` maps path prefixes (like ``"/api/v1"``) to apps, which get the prefix
+    stripped from the path like using `starlette.routing.Mount`. ``paths`` maps exact
+    paths to apps getting the unchanged path (like the endpoints of a root app). These
+    are matched exactly, so they must not contain path parameters, and variants (like
+    with a trailing slash) are not matched - add those explicitly if needed. All
+    other requests are passed to ``default`` unchanged. Lifespan events are passed to
+    ``lifespan`` if given, otherwise they are just acknowledged.
+    """
+
+    def __init__(
+        self,
+        mounts: Mapping[str, ASGIApp],
+        *,
+        default: ASGIApp,
+        paths: Mapping[str, ASGIApp] | None = None,
+        lifespan: ASGIApp | None = None,
+    ) -> None:
+        for prefix in mounts:
+            if not prefix.startswith("/") or prefix.endswith("/"):
+                raise ValueError(f"Mount prefix must start and must not end with a slash: {prefix!r}")
+        for path in paths or {}:
+            if "{" in path:
+                raise ValueError(f"Paths are matched exactly and must not contain parameters: {path!r}")
+
+        self.mounts = dict(mounts)
+        self.default = default
+        self.paths = dict(paths or {})
+        self.lifespan = lifespan
+        # No prefix is longer, so longer paths can start searching at this length
+        self._max_prefix_length = max((len(prefix) for prefix in self.mounts), default=0)
+
+    def _find_mount(self, path: str) -> tuple[str, ASGIApp] | tuple[None, None]:
+        # Prefixes must end at a path segment boundary, start with the longest possible
+        if len(path) <= self._max_prefix_length:
+            end = len(path)
+        else:
+            end = path.rfind("/", 0, self._max_prefix_length + 1)
+        while end > 0:
+            prefix = path[:end]
+            app = self.mounts.get(prefix)
+            if app is not None:
+                return prefix, app
+            end = path.rfind("/", 0, end)
+        return None, None
+
+    async def _handle_lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            if self.lifespan is not None:
+                await self.lifespan(scope, receive, send)
+            else:
+                await self._handle_lifespan(receive, send)
+            return
+
+        path = scope["path"]
+        app = self.paths.get(path)
+        if app is not None:
+            await app(scope, receive, send)
+            return
+
+        prefix, app = self._find_mount(path)
+        if prefix is None or app is None:
+            await self.default(scope, receive, send)
+            return
+
+        root_path = scope.get("root_path", "")
+        await app(
+            {
+                **scope,
+                "app_root_path": scope.get("app_root_path", root_path),
+                "root_path": root_path + prefix,
+                "path": path[len(prefix):] or "/",
+            },
+            receive,
+            send,
+        )
@@ -0,0 +1,286 @@
+import dataclasses
+import email.utils
+import logging
+import mimetypes
+import os
+import re
+from collections.abc import Sequence
+from pathlib import Path
+
+import anyio
+from starlette.types import Receive, Scope, Send
+
+from .utils import parse_accept_encoding
+
+logger = logging.getLogger(__name__)
+
+# Pre-compressed variants, in order of preference: (content encoding, file suffix)
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)")
+
+Headers = list[tuple[bytes, bytes]]
+
+
+@dataclasses.dataclass(frozen=True)
+class _StaticFileVariant:
+    path: str
+    size: int
+    etag: str
+    # Headers shared by all responses sending this variant, built once
+    headers: Headers
+
+
+@dataclasses.dataclass(frozen=True)
+class _StaticFile:
+    identity: _StaticFileVariant
+    # Maps the content encoding to the pre-compressed variant
+    encoded: dict[str, _StaticFileVariant]
+    last_modified: str
+    mtime: float
+
+
+def _get_content_type(path: str) -> str:
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type in ("application/javascript", "application/json"):
+        content_type += "; charset=utf-8"
+    return content_type
+
+
+def _parse_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """
+    Return the first and last byte of a single range request.
+
+    Raises ValueError if the range cannot be satisfied. Returns None if the range is
+    not supported (like multiple ranges), the whole file should be sent then.
+    """
+
+    match = _RANGE_RE.fullmatch(range_header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # Suffix range, the last n bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("Range not satisfiable")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+class StaticFilesApp:
+    """
+    ASGI app serving the static files in ``directory`` (usually ``STATIC_ROOT``).
+
+    All files are indexed when the app is created, so requests never touch the file
+    system except for reading the file - and paths not in the index are rejected
+    right away. Files must not change afterwards (like after ``collectstatic``), use
+    `build_index()` otherwise.
+
+    Pre-compressed variants (``<name>.br`` and ``<name>.gz``) are sent to clients
+    accepting them. Supports conditional requests (``ETag`` and ``Last-Modified``)
+    and single range requests, files are sent in chunks of ``chunk_size`` bytes.
+    Mount it ahead of Django, so assets never pass through Django.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        chunk_size: int = 64 * 1024,
+        cache_control: str | None = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.chunk_size = chunk_size
+        self.cache_control = cache_control
+        self._files: dict[str, _StaticFile] = {}
+        self.build_index()
+
+    def _build_variant(
+        self,
+        path: Path,
+        stat: os.stat_result,
+        content_type: str,
+        encoding: str | None,
+    ) -> _StaticFileVariant:
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{f"-{encoding}" if encoding else ""}"'
+        headers: Headers = [
+            (b"content-type", content_type.encode("latin-1")),
+            (b"etag", etag.encode("latin-1")),
+            (b"last-modified", email.utils.formatdate(stat.st_mtime, usegmt=True).encode("latin-1")),
+        ]
+        if encoding is not None:
+            headers.append((b"content-encoding", encoding.encode("latin-1")))
+        else:
+            # Ranges always refer to the uncompressed file
+            headers.append((b"accept-ranges", b"bytes"))
+        if self.cache_control is not None:
+            headers.append((b"cache-control", self.cache_control.encode("latin-1")))
+        return _StaticFileVariant(path=str(path), size=stat.st_size, etag=etag, headers=headers)
+
+    def build_index(self) -> None:
+        """Index all files in the directory, done automatically when creating the app."""
+
+        if not self.directory.is_dir():
+            logger.warning("Static files directory %s does not exist", self.directory)
+            self._files = {}
+            return
+
+        stats = {
+            path: path.stat()
+            for path
+            in self.directory.rglob("*")
+            if path.is_file()
+        }
+        files = {}
+        for path, stat in stats.items():
+            content_type = _get_content_type(str(path))
+            encoded = {}
+            for encoding, suffix in ENCODINGS:
+                encoded_path = path.with_name(path.name + suffix)
+                encoded_stat = stats.get(encoded_path)
+                if encoded_stat is not None:
+                    encoded[encoding] = self._build_variant(encoded_path, encoded_stat, content_type, encoding)
+            identity = self._build_variant(path, stat, content_type, None)
+            if encoded:
+                # Caches must not send compressed variants to clients not accepting them
+                for variant in (identity, *encoded.values()):
+                    variant.headers.append((b"vary", b"accept-encoding"))
+            files[path.relative_to(self.directory).as_posix()] = _StaticFile(
+                identity=identity,
+                encoded=encoded,
+                last_modified=email.utils.formatdate(stat.st_mtime, usegmt=True),
+                mtime=stat.st_mtime,
+            )
+        self._files = files
+
+    @staticmethod
+    def _select_variant(static_file: _StaticFile, request_headers: dict[bytes, bytes]) -> _StaticFileVariant:
+        accept_encoding = request_headers.get(b"accept-encoding")
+        if not static_file.encoded or accept_encoding is None:
+            return static_file.identity
+        accepted = parse_accept_encoding(accept_encoding.decode("latin-1"))
+        for encoding, _ in ENCODINGS:
+            if encoding in accepted and encoding in static_file.encoded:
+                return static_file.encoded[encoding]
+        return static_file.identity
+
+    @staticmethod
+    def _is_not_modified(
+        static_file: _StaticFile,
+        variant: _StaticFileVariant,
+        request_headers: dict[bytes, bytes],
+    ) -> bool:
+        if_none_match = request_headers.get(b"if-none-match")
+        if if_none_match is not None:
+            etags = [etag.strip().removeprefix("W/") for etag in if_none_match.decode("latin-1").split(",")]
+            return variant.etag in etags or "*" in etags
+        if_modified_since = request_headers.get(b"if-modified-since")
+        if if_modified_since is not None:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since.decode("latin-1"))
+            except (TypeError, ValueError):
+                return False
+            return int(static_file.mtime) <= since.timestamp()
+        return False
+
+    async def _send_file(
+        self,
+        send: Send,
+        variant: _StaticFileVariant,
+        start: int,
+        length: int,
+        send_body: bool,
+    ) -> None:
+        if not send_body or length == 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async with await anyio.open_file(variant.path, "rb") as file:
+            if start:
+                await file.seek(start)
+            remaining = length
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                # Stop if the file was truncated, the content length is wrong anyway
+                remaining = remaining - len(chunk) if chunk else 0
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+
+    @staticmethod
+    async def _send_status(send: Send, status: int, headers: Sequence[tuple[bytes, bytes]] = ()) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [*headers, (b"content-length", b"0")],
+        })
+        await send({"type": "http.response.body", "body": b""})
+
+    async def __call__(self, scope: Scope, _receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            raise RuntimeError("Static files can only be served for HTTP requests")
+
+        if scope["method"] not in ("GET", "HEAD"):
+            await self._send_status(send, 405, [(b"allow", b"GET, HEAD")])
+            return
+
+        static_file = self._files.get(scope["path"].lstrip("/"))
+        if static_file is None:
+            await self._send_status(send, 404)
+            return
+
+        request_headers = dict(scope["headers"])
+        send_body = scope["method"] == "GET"
+        variant = self._select_variant(static_file, request_headers)
+
+        if self._is_not_modified(static_file, variant, request_headers):
+            await self._send_status(send, 304, [
+                (name, value)
+                for name, value
+                in variant.headers
+                if name in (b"etag", b"last-modified", b"cache-control", b"vary")
+            ])
+            return
+
+        range_header = request_headers.get(b"range")
+        if_range = request_headers.get(b"if-range")
+        if range_header is not None and (if_range is None or if_range.decode("latin-1") in (
+            static_file.identity.etag,
+            static_file.last_modified,
+        )):
+            variant = static_file.identity
+            try:
+                byte_range = _parse_range(range_header.decode("latin-1"), variant.size)
+            except ValueError:
+                await self._send_status(send, 416, [
+                    (b"content-range", f"bytes */{variant.size}".encode("latin-1")),
+                ])
+                return
+            if byte_range is not None:
+                start, end = byte_range
+                await send({
+                    "type": "http.response.start",
+                    "status": 206,
+                    "headers": [
+                        *variant.headers,
+                        (b"content-range", f"bytes {start}-{end}/{variant.size}".encode("latin-1")),
+                        (b"content-length", str(end - start + 1).encode("latin-1")),
+                    ],
+                })
+                await self._send_file(send, variant, start, end - start + 1, send_body)
+                return
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                *variant.headers,
+                (b"content-length", str(variant.size).encode("latin-1")),
+            ],
+        })
+        await self._send_file(send, variant, 0, variant.size, send_body)
@@ -0,0 +1,160 @@
+"""
+pytest fixtures for testing async code and FastAPI apps using the Django ORM.
+
+Enable using ``-p fastapi_django.testing`` (for example in ``addopts`` of pytest.ini).
+"""
+import contextlib
+import sqlite3
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+from asgiref.sync import SyncToAsync
+from django.core import signals
+from django.db import close_old_connections, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+from .executor import ORMExecutor, _check_asgiref_internals
+
+
+def _get_orm_thread_executors() -> list[ThreadPoolExecutor]:
+    """Return the executors of all threads `sync_to_async()` may run ORM code in."""
+
+    _check_asgiref_internals()
+    return [
+        SyncToAsync.single_thread_executor,
+        *ORMExecutor._get_all_lane_executors(),
+    ]
+
+
+@contextlib.contextmanager
+def _share_db_connections() -> Iterator[None]:
+    """
+    Use the connections of the current thread in all threads running ORM code.
+
+    This is what Django's ``LiveServerTestCase`` does for its server thread. It
+    allows the code running in these threads to see (and use) the transaction of the
+    test.
+    """
+
+    shared_connections: list[BaseDatabaseWrapper] = list(connections.all())
+
+    def override() -> None:
+        for connection in shared_connections:
+            connections[connection.alias] = connection
+
+    def reset() -> None:
+        for connection in shared_connections:
+            del connections[connection.alias]
+
+    executors = _get_orm_thread_executors()
+    for connection in shared_connections:
+        connection.inc_thread_sharing()
+    try:
+        for executor in executors:
+            executor.submit(override).result()
+        yield
+    finally:
+        for executor in executors:
+            executor.submit(reset).result()
+        for connection in shared_connections:
+            connection.dec_thread_sharing()
+
+
+@contextlib.contextmanager
+def _keep_db_connections() -> Iterator[None]:
+    """Do not close connections at the start/end of requests, like Django's test client does."""
+
+    signals.request_started.disconnect(close_old_connections)
+    signals.request_finished.disconnect(close_old_connections)
+    try:
+        yield
+    finally:
+        signals.request_started.connect(close_old_connections)
+        signals.request_finished.connect(close_old_connections)
+
+
+@pytest.fixture()
+def async_db(db: None) -> Iterator[None]:  # noqa: ARG001, PT004
+    """
+    Like pytest-django's ``db`` fixture, but also for code using `sync_to_async()`.
+
+    The ``db`` fixture wraps the test in a transaction, which is rolled back afterwards.
+    This is way faster than using ``transactional_db`` (flushing the database after
+    each test), but only works for the connection of the test's thread. The async ORM
+    and `ORMExecutor` run the queries in other threads, so these are changed to use the
+    same connections. Connections are no longer closed at the end of requests either.
+
+    As the connections are shared, the test and the code under test must not use them
+    at the same time - which is fine for the usual sync fixtures and async tests.
+    """
+
+    with _share_db_connections(), _keep_db_connections():
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _async_db_marker(request: pytest.FixtureRequest) -> None:
+    """Use `async_db` for tests marked using ``pytest.mark.async_db``, before any other fixture."""
+
+    if request.node.get_closest_marker("async_db") is not None:
+        request.getfixturevalue("async_db")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers",
+        "async_db: use the async_db fixture, giving access to the database for async code",
+    )
+
+
+def _create_sqlite_snapshots() -> dict[str, sqlite3.Connection]:
+    snapshots = {}
+    for connection in connections.all():
+        if connection.vendor != "sqlite":
+            continue
+        connection.ensure_connection()
+        snapshot = sqlite3.connect(":memory:", check_same_thread=False)
+        connection.connection.backup(snapshot)
+        snapshots[connection.alias] = snapshot
+    return snapshots
+
+
+def _restore_sqlite_snapshots(snapshots: dict[str, sqlite3.Connection]) -> None:
+    for alias, snapshot in snapshots.items():
+        connection = connections[alias]
+        connection.ensure_connection()
+        snapshot.backup(connection.connection)
+
+
+@pytest.fixture(scope="session")
+def sqlite_snapshots(
+    django_db_setup: None,  # noqa: ARG001
+    django_db_blocker: Any,
+) -> Iterator[dict[str, sqlite3.Connection]]:
+    with django_db_blocker.unblock():
+        snapshots = _create_sqlite_snapshots()
+    yield snapshots
+    for snapshot in snapshots.values():
+        snapshot.close()
+
+
+@pytest.fixture()
+def sqlite_snapshot_db(  # noqa: PT004
+    sqlite_snapshots: dict[str, sqlite3.Connection],
+    django_db_blocker: Any,
+) -> Iterator[None]:
+    """
+    Alternative to pytest-django's ``transactional_db`` fixture for SQLite databases.
+
+    Use this for tests which need the data to be committed, like tests of
+    `transaction.on_commit()` callbacks. Instead of flushing all tables after each test,
+    the database is restored from a snapshot taken right after migrating, using SQLite's
+    backup API. This also restores the data created by migrations and resets the
+    primary key sequences. Databases not using SQLite are not reset at all.
+    """
+
+    with django_db_blocker.unblock():
+        yield
+        _restore_sqlite_snapshots(sqlite_snapshots)
@@ -0,0 +1,92 @@
+import functools
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from typing import Any, Concatenate, ParamSpec, TypeVar, cast
+
+import pydantic
+
+_ClassT = TypeVar("_ClassT", bound=type)
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+_T = TypeVar("_T")
+
+
+def class_cache(func: Callable[Concatenate[_ClassT, _P], _R]) -> Callable[Concatenate[_ClassT, _P], _R]:
+    """
+    Cache the results of the function by its arguments, stored on the class passed first.
+
+    Unlike `functools.lru_cache()` this does not keep the classes alive (the results
+    usually reference them, so weak keys would not help either). DTOs created at
+    runtime, like the subset DTOs of `fastapi_django.fieldsets`, are garbage collected
+    together with their cached data once no longer used.
+    """
+
+    attribute_name = f"_class_cache_{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(cls: _ClassT, /, *args: _P.args, **kwargs: _P.kwargs) -> _R:
+        key = (args, tuple(kwargs.items()))
+        # Not inherited, subclasses get their own results
+        cache: dict[Any, _R] | None = cls.__dict__.get(attribute_name)
+        if cache is None:
+            cache = {}
+            setattr(cls, attribute_name, cache)
+        if key not in cache:
+            cache[key] = func(cls, *args, **kwargs)
+        return cache[key]
+
+    return wrapper
+
+
+async def abatched(
+    iterable: AsyncIterable[_T],
+    size: int,
+) -> AsyncIterator[list[_T]]:
+    """Split the async iterable into lists of (at most) ``size`` items."""
+
+    batch = []
+    async for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def get_json_serialization_config(model_class: type[pydantic.BaseModel]) -> pydantic.ConfigDict:
+    """Return the config options of the model changing how pydantic writes JSON."""
+
+    return cast(pydantic.ConfigDict, {
+        key: value
+        for key, value
+        in model_class.model_config.items()
+        if key.startswith("ser_json_")
+    })
+
+
+@class_cache
+def get_list_type_adapter(model_class: type[pydantic.BaseModel]) -> pydantic.TypeAdapter:
+    """Return a type adapter validating and serializing lists of the model."""
+
+    # Only the config of the outermost type is used when serializing, so pass the
+    # one of the model - otherwise the list would be written ignoring options like
+    # ser_json_timedelta, unlike model_dump_json() does
+    return pydantic.TypeAdapter(
+        list[model_class],  # type: ignore
+        config=get_json_serialization_config(model_class) or None,
+    )
+
+
+def parse_accept_encoding(accept_encoding: str) -> set[str]:
+    """Return the content encodings accepted by the client (ignoring any preference)."""
+
+    accepted = set()
+    for item in accept_encoding.split(","):
+        encoding, _, params = item.partition(";")
+        try:
+            quality = float(params.strip().removeprefix("q=") or 1)
+        except ValueError:
+            continue
+        if quality > 0:
+            accepted.add(encoding.strip().lower())
+    return accepted
@@ -0,0 +1,6 @@
+from django.conf import settings
+
+from fastapi_django.executor import ORMExecutor
+
+# Shared by all API versions, so the number of database connections stays bounded
+orm_executor = ORMExecutor(lanes=settings.ORM_EXECUTOR_LANES)
@@ -1,6 +1,11 @@
 from fastapi import FastAPI
 
+from fastapi_django.db import DjangoDBConnectionMiddleware
+from fastapi_django.metrics import RequestMetricsMiddleware
+from fastapi_django.openapi import install_openapi_snapshot
+from fastapi_django.profiling import QueryProfilingMiddleware
 from fastapi_django_test import settings
+from fastapi_django_test.api import orm_executor
 from fastapi_django_test.utils.api.route_names import use_route_names_as_operation_ids
 
 from .endpoints.something import router as something_router
@@ -19,3 +24,20 @@ api_v1 = FastAPI(
 api_v1.include_router(something_router)
 
 use_route_names_as_operation_ids(api_v1)
+
+# Serve the schema rendered by `manage.py openapi_snapshot` (if up to date), instead
+# of generating it on the first request
+install_openapi_snapshot(api_v1, settings.OPENAPI_SNAPSHOT_DIR / "v1.json")
+
+# Reuse the database connections like Django does (see CONN_MAX_AGE) and run the ORM
+# code of concurrent requests in parallel
+api_v1.add_middleware(DjangoDBConnectionMiddleware, executor=orm_executor)
+# Close the connections of the lanes (and stop their threads) on shutdown, this is
+# shared by all versions - closing it again does nothing
+api_v1.add_event_handler("shutdown", orm_executor.aclose)
+
+# Request metrics per operation, see /metrics
+api_v1.add_middleware(RequestMetricsMiddleware, mount="v1")
+
+if settings.QUERY_PROFILING:  # pragma: no cover
+    api_v1.add_middleware(QueryProfilingMiddleware)
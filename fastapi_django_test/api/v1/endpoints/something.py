@@ -1,28 +1,86 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, status
 
-from fastapi_django_test.something.dto import SomethingDTO
+from fastapi_django.bulk import BulkWriteResult, abulk_create
+from fastapi_django.cache import DTOCache, cache_response
+from fastapi_django.fieldsets import SparseFields
+from fastapi_django.formats import DEFAULT_FORMATS, get_format_responses
+from fastapi_django.pagination import CursorPage, CursorParams, apaginate
+from fastapi_django.responses import DTOQuerysetResponse, DTOStreamingResponse
+from fastapi_django_test.something.dto import (
+    SomethingCreateDTO,
+    SomethingDetailDTO,
+    SomethingDTO,
+    SomethingUpsertDTO,
+)
 from fastapi_django_test.something.models import Something
 
 router = APIRouter()
 
+something_detail_cache = DTOCache(SomethingDetailDTO)
+something_fields = SparseFields(SomethingDTO)
+
 
 # Note: You should NEVER just return a list, this is just for demo purposes, use a
 #       object containing the list instead.
-@router.get("/somethings/", response_model=list[SomethingDTO])
-async def get_somethings() -> list[SomethingDTO]:
-    return [
-        SomethingDTO.from_django(something)
-        async for something
-        in Something.objects.all()
-    ]
+# Note: The data is read from our own database, so we trust it (trusted=True). This
+#       allows to write the rows to JSON directly, without creating any Django
+#       instances or DTOs (DTOQuerysetResponse).
+# Note: Responses are cached until any Something changes, see cache_response().
+# Note: Clients may ask for NDJSON, CSV or MessagePack using the Accept header.
+# Note: Clients may select the fields to return using `?fields=id,name`, only those
+#       columns are loaded then.
+@router.get("/somethings/", response_model=list[SomethingDTO], responses=get_format_responses())
+@cache_response(SomethingDTO, formats=DEFAULT_FORMATS)
+async def get_somethings(
+    dto_class: Annotated[type[SomethingDTO], Depends(something_fields)],
+) -> DTOQuerysetResponse:
+    return DTOQuerysetResponse(dto_class, Something.objects.all(), trusted=True, formats=DEFAULT_FORMATS)
+
+
+# Streams the list in chunks, so memory usage stays bounded for any number of rows.
+@router.get("/somethings/stream/", response_model=list[SomethingDTO], responses=get_format_responses())
+async def stream_somethings(
+    dto_class: Annotated[type[SomethingDTO], Depends(something_fields)],
+) -> DTOStreamingResponse:
+    return DTOStreamingResponse(dto_class, Something.objects.all(), formats=DEFAULT_FORMATS)
+
+
+@router.get("/somethings/paginated/", response_model=CursorPage[SomethingDTO])
+async def get_somethings_paginated(
+    params: Annotated[CursorParams, Depends()],
+) -> CursorPage[SomethingDTO]:
+    return await apaginate(SomethingDTO, Something.objects.all(), params)
+
+
+# The whole payload is validated by FastAPI in one go, all rows are then written in
+# batches inside one transaction (and one thread).
+@router.post("/somethings/bulk/", response_model=BulkWriteResult, status_code=status.HTTP_201_CREATED)
+async def create_somethings(
+    somethings: list[SomethingCreateDTO],
+) -> BulkWriteResult:
+    created = await abulk_create(somethings)
+    return BulkWriteResult(count=len(created))
+
+
+# Creates new rows and updates existing ones (by id), using one query per batch.
+@router.put("/somethings/bulk/", response_model=BulkWriteResult)
+async def upsert_somethings(
+    somethings: list[SomethingUpsertDTO],
+) -> BulkWriteResult:
+    written = await abulk_create(somethings, update_conflicts=True, unique_fields=["id"])
+    return BulkWriteResult(count=len(written))
 
 
-@router.get("/somethings/{id}/", response_model=SomethingDTO)
+# Includes the related objects, loaded using a fixed number of queries. The DTOs are
+# cached until the Something (or any related object) changes.
+@router.get("/somethings/{id}/", response_model=SomethingDetailDTO)
 async def get_something_by_id(
     id_: Annotated[int, Path(..., alias="id")],
-) -> list[SomethingDTO]:
-    something = await Something.objects.aget(id=id_)
+) -> SomethingDetailDTO:
+    something = await something_detail_cache.aget(id_)
+    if something is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND)
 
-    return SomethingDTO.from_django(something)
+    return something
@@ -1,13 +1,18 @@
 import pytest
+from asgiref.sync import sync_to_async
 from dirty_equals import Contains, HasLen, IsPartialDict, IsPositiveInt
 from httpx import AsyncClient
 
-from fastapi_django_test.something.models import Something
+from fastapi_django.db import get_db_connection_stats
+from fastapi_django.pagination import encode_cursor
+from fastapi_django_test.something.models import Other, Something
 
 # Mark all tests to use the Django DB:
-# Note: You could also use `pytest.mark.django_db()` as a decorator, but here all tests
+# Note: You could also use `pytest.mark.async_db()` as a decorator, but here all tests
 # need the DB, so this is way easier.
-pytestmark = pytest.mark.django_db(transaction=True)
+# Note: `async_db` (see fastapi_django.testing) rolls back a transaction after each test,
+# like `pytest.mark.django_db()` does - but also works for the async ORM.
+pytestmark = pytest.mark.async_db
 
 
 @pytest.fixture()
@@ -50,4 +55,309 @@ async def test_something_by_id(app):
         response = await ac.get(f"/somethings/{SOMETHING_ID_1}/")
 
     assert response.status_code == 200
-    assert response.json() == IsPartialDict(id=SOMETHING_ID_1)
+    assert response.json() == IsPartialDict(id=SOMETHING_ID_1, main_other=None, others=[])
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures('create_somethings')
+async def test_somethings_stream(app):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/somethings/stream/")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == Contains(
+        IsPartialDict(id=SOMETHING_ID_1),
+    ) & HasLen(1)
+
+
+@pytest.fixture()
+async def create_more_somethings():
+    for i in range(1, 6):
+        await Something.objects.acreate(id=i, name=f"Something {i}")
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures('create_more_somethings')
+async def test_somethings_paginated(app):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        first_page = (await ac.get("/somethings/paginated/", params={"limit": 2})).json()
+        second_page = (await ac.get(
+            "/somethings/paginated/",
+            params={"limit": 2, "cursor": first_page["next"]},
+        )).json()
+        last_page = (await ac.get(
+            "/somethings/paginated/",
+            params={"limit": 2, "cursor": second_page["next"]},
+        )).json()
+        previous_page = (await ac.get(
+            "/somethings/paginated/",
+            params={"limit": 2, "cursor": last_page["prev"]},
+        )).json()
+
+    assert [item["id"] for item in first_page["items"]] == [1, 2]
+    assert first_page["prev"] is None
+    assert [item["id"] for item in second_page["items"]] == [3, 4]
+    assert [item["id"] for item in last_page["items"]] == [5]
+    assert last_page["next"] is None
+    assert previous_page == second_page
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize("cursor", [
+    "invalid",
+    # Not base64
+    "!!!",
+    # Wrong number of key values
+    encode_cursor("next", [1, 2]),
+    # Wrong types of key values
+    encode_cursor("next", ["abc"]),
+    encode_cursor("next", [{"a": 1}]),
+    encode_cursor("next", [None]),
+])
+async def test_somethings_paginated_invalid_cursor(app, cursor):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/somethings/paginated/", params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures('create_somethings')
+async def test_somethings_list_cached(app):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/somethings/")
+        cached_response = await ac.get("/somethings/")
+        not_modified_response = await ac.get(
+            "/somethings/",
+            headers={"If-None-Match": response.headers["etag"]},
+        )
+
+    assert cached_response.content == response.content
+    assert cached_response.headers["etag"] == response.headers["etag"]
+    assert cached_response.headers["content-type"] == "application/json"
+    assert not_modified_response.status_code == 304
+    assert not_modified_response.content == b""
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures('create_somethings')
+async def test_somethings_list_cache_invalidation(app):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/somethings/")
+        await Something.objects.acreate(name='Something 2')
+        changed_response = await ac.get("/somethings/")
+        not_modified_response = await ac.get(
+            "/somethings/",
+            headers={"If-None-Match": response.headers["etag"]},
+        )
+
+    assert changed_response.json() == HasLen(2)
+    assert changed_response.headers["etag"] != response.headers["etag"]
+    assert not_modified_response.status_code == 200
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures('create_somethings')
+async def test_something_by_id_cache_invalidation(app):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        await ac.get(f"/somethings/{SOMETHING_ID_1}/")
+        other = await Other.objects.acreate(name='Other')
+        something = await Something.objects.aget(id=SOMETHING_ID_1)
+        await something.others.aadd(other)
+        response = await ac.get(f"/somethings/{SOMETHING_ID_1}/")
+        other.name = "Changed"
+        await other.asave()
+        changed_response = await ac.get(f"/somethings/{SOMETHING_ID_1}/")
+
+    assert response.json()["others"] == [IsPartialDict(name="Other")]
+    assert changed_response.json()["others"] == [IsPartialDict(name="Changed")]
+
+
+@pytest.mark.anyio()
+async def test_something_by_id_not_found(app):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get(f"/somethings/{SOMETHING_ID_1}/")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures('create_somethings')
+async def test_db_connection_reused(app):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        await ac.get("/somethings/")
+        stats = get_db_connection_stats()
+        await ac.get("/somethings/paginated/")
+        new_stats = get_db_connection_stats()
+
+    assert new_stats.requests == stats.requests + 1
+    assert new_stats.reused == stats.reused + 1
+    assert new_stats.connections_created == stats.connections_created
+    assert new_stats.open_connections == 1
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures('create_somethings')
+async def test_orm_executor_used(app):
+    from fastapi_django_test.api import orm_executor
+
+    calls = orm_executor.get_stats().calls
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        await ac.get(f"/somethings/{SOMETHING_ID_1}/")
+
+    # Connection handling at start and end of the request, loading the Something
+    assert orm_executor.get_stats().calls >= calls + 3
+
+
+@pytest.fixture()
+async def query_profiling():
+    from fastapi_django.profiling import _install_query_profiling
+
+    # The connections shared by async_db were opened before any middleware was
+    # created, so they must be wrapped in the thread running the ORM code
+    await sync_to_async(_install_query_profiling)()
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures('create_somethings', 'query_profiling')
+async def test_query_profiling(app):
+    from fastapi_django.profiling import QueryProfilingMiddleware
+
+    async with AsyncClient(app=QueryProfilingMiddleware(app), base_url="http://test") as ac:
+        response = await ac.get(f"/somethings/{SOMETHING_ID_1}/")
+
+    # Loading the Something and prefetching its others
+    assert response.headers["server-timing"] == Contains('desc="2 queries"', "conversion;dur=", "total;dur=")
+
+
+@pytest.mark.anyio()
+async def test_somethings_bulk_create(app):
+    other = await Other.objects.acreate(name='Other')
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post("/somethings/bulk/", json=[
+            {"name": f"Something {i}", "main_other": other.id if i % 2 else None}
+            for i in range(10)
+        ])
+
+    assert response.status_code == 201
+    assert response.json() == {"count": 10}
+    assert await Something.objects.acount() == 10
+    assert await Something.objects.filter(main_other=other).acount() == 5
+
+
+@pytest.mark.anyio()
+async def test_somethings_bulk_create_invalid(app):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post("/somethings/bulk/", json=[
+            {"name": "Something 1"},
+            {"name": None},
+        ])
+
+    assert response.status_code == 422
+    assert await Something.objects.acount() == 0
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures('create_somethings')
+async def test_somethings_bulk_upsert(app):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/somethings/")
+        upsert_response = await ac.put("/somethings/bulk/", json=[
+            {"id": SOMETHING_ID_1, "name": "Changed", "main_other": None},
+            {"id": 2, "name": "Something 2", "main_other": None},
+        ])
+        changed_response = await ac.get("/somethings/")
+
+    assert upsert_response.status_code == 200
+    assert upsert_response.json() == {"count": 2}
+    assert (await Something.objects.aget(id=SOMETHING_ID_1)).name == "Changed"
+    # No signals are sent by bulk writes, the cache must be invalidated anyway
+    assert changed_response.json() == [
+        IsPartialDict(id=SOMETHING_ID_1, name="Changed"),
+        IsPartialDict(id=2, name="Something 2"),
+    ]
+    assert changed_response.headers["etag"] != response.headers["etag"]
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures('create_somethings')
+async def test_somethings_list_formats(app):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        csv_response = await ac.get("/somethings/", headers={"accept": "text/csv"})
+        ndjson_response = await ac.get("/somethings/", headers={"accept": "application/x-ndjson"})
+        json_response = await ac.get("/somethings/", headers={"accept": "text/html, */*;q=0.8"})
+
+    assert csv_response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert csv_response.headers["vary"] == "accept"
+    assert csv_response.text.splitlines() == ["id,name,main_other,others", "1,Something 1,,[]"]
+    assert ndjson_response.headers["content-type"] == "application/x-ndjson"
+    assert ndjson_response.text == '{"id":1,"name":"Something 1","main_other":null,"others":[]}\n'
+    # Cached per format
+    assert json_response.headers["content-type"] == "application/json"
+    assert json_response.json() == [IsPartialDict(id=SOMETHING_ID_1)]
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures('create_more_somethings')
+async def test_somethings_stream_formats(app):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        csv_response = await ac.get("/somethings/stream/", headers={"accept": "text/csv"})
+        json_response = await ac.get("/somethings/stream/")
+
+    assert csv_response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert csv_response.text.splitlines() == [
+        "id,name,main_other,others",
+        *(f"{i},Something {i},,[]" for i in range(1, 6)),
+    ]
+    assert json_response.json() == HasLen(5)
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures('create_somethings')
+async def test_somethings_stream_msgpack(app):
+    msgpack = pytest.importorskip("msgpack")
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/somethings/stream/", headers={"accept": "application/msgpack"})
+
+    unpacker = msgpack.Unpacker()
+    unpacker.feed(response.content)
+    assert response.headers["content-type"] == "application/msgpack"
+    assert list(unpacker) == [{"id": 1, "name": "Something 1", "main_other": None, "others": []}]
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures('create_somethings', 'query_profiling')
+async def test_somethings_list_fields(app):
+    from fastapi_django.phases import RequestProfile, request_profile_var
+
+    profile = RequestProfile()
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        token = request_profile_var.set(profile)
+        try:
+            response = await ac.get("/somethings/", params={"fields": "id,name"})
+        finally:
+            request_profile_var.reset(token)
+        csv_response = await ac.get("/somethings/", params={"fields": "name"}, headers={"accept": "text/csv"})
+        invalid_response = await ac.get("/somethings/", params={"fields": "id,secret"})
+
+    assert response.json() == [{"id": SOMETHING_ID_1, "name": "Something 1"}]
+    # Only the selected columns are loaded
+    assert list(profile.sql_counts) == [
+        'SELECT "something_something"."id", "something_something"."name" FROM "something_something"',
+    ]
+    assert csv_response.text.splitlines() == ["name", "Something 1"]
+    assert invalid_response.status_code == 400
+    assert invalid_response.json() == {"detail": "Unknown fields: secret"}
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures('create_somethings')
+async def test_somethings_stream_fields(app):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/somethings/stream/", params={"fields": "name,others"})
+
+    assert response.json() == [{"name": "Something 1", "others": []}]
@@ -4,3 +4,13 @@ import pytest
 @pytest.fixture()
 def anyio_backend():
     return 'asyncio'
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    # Flushing the database between tests does not send any signals
+    from fastapi_django.cache.responses import default_response_cache_backend
+    from fastapi_django_test.api.v1.endpoints.something import something_detail_cache
+
+    default_response_cache_backend.clear()
+    something_detail_cache.clear()
@@ -1,20 +1,43 @@
+import logging
 from typing import Any
+from urllib.parse import urlparse
 
 from django.conf import settings
 from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp
 
+from fastapi_django.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    RequestMetricsMiddleware,
+    render_prometheus_metrics,
+    resolve_django_operation,
+)
+from fastapi_django.models import get_dto_registry_stats
+from fastapi_django.profiling import QueryProfilingMiddleware
+from fastapi_django.routing import PrefixDispatcher
+from fastapi_django.staticfiles import StaticFilesApp
 
-def get_fastapi_app() -> FastAPI:
-    """Return FastAPI app including the API and Django endpoints as mounts."""
+logger = logging.getLogger(__name__)
+
+
+def get_fastapi_app() -> PrefixDispatcher:
+    """
+    Return the ASGI app dispatching to the APIs, the generic endpoints and Django.
+
+    Uses `PrefixDispatcher`, so finding the app handling a request does not require
+    checking the routes of all apps in order (Django being the last one).
+    """
 
     from .api.v1 import api_v1
     from .api.v2 import api_v2
     from .asgi import application as django_app
 
     app = FastAPI(
-        # Disable any docs, as the root FastAPI instance does is only necessary to mount
-        # all the other things like the API, Django, etc.
+        # Disable any docs, as the root FastAPI instance is only necessary for some
+        # generic endpoints - the API and Django are mounted using PrefixDispatcher
         openapi_url=None,
         docs_url=None,
         redoc_url=None,
@@ -30,14 +53,53 @@ def get_fastapi_app() -> FastAPI:
     def health() -> dict[str, Any]:
         return {"all": "ok"}
 
+    # ...or metrics of all API operations (in the Prometheus text format)
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def metrics() -> PlainTextResponse:
+        return PlainTextResponse(render_prometheus_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    # Mounted apps never receive any lifespan events, so run their handlers (like
+    # closing the ORM executor, see api.v1) as part of the root app
+    for api in (api_v1, api_v2):
+        app.add_event_handler("startup", api.router.startup)
+        app.add_event_handler("shutdown", api.router.shutdown)
+
     # Mount all API versions
-    app.mount("/api/v1", api_v1)
-    app.mount("/api/v2", api_v2)
+    mounts: dict[str, ASGIApp] = {
+        "/api/v1": api_v1,
+        "/api/v2": api_v2,
+    }
 
-    # Mount Django
+    # Mount Django, handling all other requests
+    django_asgi_app: ASGIApp = django_app  # type: ignore
     if settings.DEBUG:  # pragma: no cover
-        app.mount("/", ASGIStaticFilesHandler(django_app))  # type: ignore
-    else:
-        app.mount("/", django_app)  # type: ignore
+        django_asgi_app = ASGIStaticFilesHandler(django_app)  # type: ignore
+    elif settings.STATIC_ROOT:
+        # Serve the collected static files without passing them through Django
+        mounts[urlparse(settings.STATIC_URL).path.rstrip("/")] = StaticFilesApp(settings.STATIC_ROOT)
+    django_asgi_app = RequestMetricsMiddleware(
+        django_asgi_app,
+        mount="django",
+        resolve_operation=resolve_django_operation,
+    )
+
+    # The mounted APIs profile their requests on their own
+    if settings.QUERY_PROFILING:  # pragma: no cover
+        app.add_middleware(QueryProfilingMiddleware)
+        django_asgi_app = QueryProfilingMiddleware(django_asgi_app)
 
-    return app
+    dto_registry_stats = get_dto_registry_stats()
+    logger.info(
+        "Created %d DTOs in %.3f seconds",
+        dto_registry_stats.created,
+        dto_registry_stats.build_seconds,
+    )
+
+    # The generic endpoints are matched exactly (no path parameters, no trailing slash
+    # variants), all other paths are handled by Django
+    return PrefixDispatcher(
+        mounts,
+        default=django_asgi_app,
+        paths={route.path: app for route in app.routes if isinstance(route, APIRoute)},
+        lifespan=app,
+    )
@@ -38,6 +38,8 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
 
+    'fastapi_django.openapi',
+
     'fastapi_django_test.something',
 ]
 
@@ -85,8 +87,14 @@ if os.environ.get("POSTGRES_DATABASE", None):
                 "PASSWORD": os.environ.get("POSTGRES_PASSWORD", None),
                 "DATABASE": os.environ.get("POSTGRES_DATABASE"),
             },
+            # Keep connections open between requests, see DjangoDBConnectionMiddleware
+            "CONN_MAX_AGE": 60,
+            "CONN_HEALTH_CHECKS": True,
         },
     }
+    # Number of threads running the ORM code of the API, every thread uses its own
+    # connection - see fastapi_django_test.api.orm_executor
+    ORM_EXECUTOR_LANES = int(os.environ.get("ORM_EXECUTOR_LANES", 4))
 else:
     DATABASES = {
         'default': {
@@ -94,6 +102,20 @@ else:
             'NAME': str(BASE_DIR / 'db.sqlite3'),
         },
     }
+    # SQLite only allows one writer at a time anyway
+    ORM_EXECUTOR_LANES = 1
+
+# Add Server-Timing headers and log the queries of all API requests, see
+# fastapi_django.profiling.QueryProfilingMiddleware
+QUERY_PROFILING = os.environ.get("QUERY_PROFILING", "").lower() in ("1", "true", "yes")
+
+# OpenAPI schemas rendered at build time using `manage.py openapi_snapshot`, see
+# fastapi_django.openapi.install_openapi_snapshot()
+OPENAPI_SNAPSHOT_DIR = BASE_DIR / 'openapi'
+OPENAPI_SNAPSHOT_APPS = {
+    'v1': 'fastapi_django_test.api.v1.api_v1',
+    'v2': 'fastapi_django_test.api.v2.api_v2',
+}
 
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
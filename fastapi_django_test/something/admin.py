@@ -1,8 +1,13 @@
 from django.contrib import admin
 
-from .models import Something
+from .models import Other, Something
 
 
 @admin.register(Something)
 class SomethingAdmin(admin.ModelAdmin):
     pass
+
+
+@admin.register(Other)
+class OtherAdmin(admin.ModelAdmin):
+    pass
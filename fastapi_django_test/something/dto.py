@@ -1,6 +1,34 @@
 from fastapi_django.models import django_to_pydantic_model
-from fastapi_django_test.something.models import Something
+from fastapi_django_test.something.models import Other, Something
+
+
+class OtherDTO(django_to_pydantic_model(Other)):  # type: ignore
+    pass
 
 
 class SomethingDTO(django_to_pydantic_model(Something)):  # type: ignore
     pass
+
+
+class SomethingDetailDTO(django_to_pydantic_model(  # type: ignore
+    Something,
+    relations={
+        "main_other": OtherDTO,
+        "others": OtherDTO,
+    },
+)):
+    pass
+
+
+class SomethingCreateDTO(django_to_pydantic_model(  # type: ignore
+    Something,
+    exclude={"id", "others"},
+)):
+    pass
+
+
+class SomethingUpsertDTO(django_to_pydantic_model(  # type: ignore
+    Something,
+    exclude={"others"},
+)):
+    pass
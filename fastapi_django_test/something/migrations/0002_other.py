@@ -0,0 +1,31 @@
+# Generated by Django 4.2.4 on 2026-10-18 08:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('something', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Other',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='something',
+            name='main_other',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='main_somethings', to='something.other'),
+        ),
+        migrations.AddField(
+            model_name='something',
+            name='others',
+            field=models.ManyToManyField(blank=True, related_name='somethings', to='something.other'),
+        ),
+    ]
@@ -1,8 +1,28 @@
 from django.db import models
 
 
+class Other(models.Model):
+    name = models.CharField(max_length=255)
+
+    def __str__(self) -> str:
+        return self.name
+
+
 class Something(models.Model):
     name = models.CharField(max_length=255)
 
+    main_other = models.ForeignKey(
+        Other,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="main_somethings",
+    )
+    others = models.ManyToManyField(
+        Other,
+        blank=True,
+        related_name="somethings",
+    )
+
     def __str__(self) -> str:
         return self.name
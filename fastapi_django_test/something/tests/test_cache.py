@@ -0,0 +1,115 @@
+import pytest
+
+from fastapi_django.cache import DTOCache
+from fastapi_django_test.something.dto import SomethingDetailDTO, SomethingDTO
+from fastapi_django_test.something.models import Other, Something
+
+pytestmark = pytest.mark.async_db
+
+
+@pytest.fixture()
+def setup_db():
+    for i in range(1, 4):
+        Something.objects.create(id=i, name=str(i))
+
+
+@pytest.mark.usefixtures("setup_db")
+def test_dto_cache_get_many(django_assert_num_queries):
+    cache = DTOCache(SomethingDTO)
+
+    with django_assert_num_queries(2):  # Somethings, many to many relation
+        dtos = cache.get_many([2, 1, 4])
+    with django_assert_num_queries(2):  # Only the missing Something 3
+        more_dtos = cache.get_many([1, 3])
+
+    assert [(pk, dto.name) for pk, dto in dtos.items()] == [(2, "2"), (1, "1")]
+    assert [(pk, dto.name) for pk, dto in more_dtos.items()] == [(1, "1"), (3, "3")]
+    assert cache.get_stats().hits == 1
+    assert cache.get_stats().misses == 4
+    assert cache.get_stats().size == 3
+
+
+@pytest.mark.usefixtures("setup_db")
+def test_dto_cache_eviction(django_assert_num_queries):
+    cache = DTOCache(SomethingDTO, max_size=2)
+
+    cache.get_many([1, 2, 3])
+
+    assert cache.get_stats().evictions == 1
+    with django_assert_num_queries(0):
+        assert cache.get(3).name == "3"
+
+
+@pytest.mark.usefixtures("setup_db")
+def test_dto_cache_invalidation():
+    cache = DTOCache(SomethingDTO)
+    cache.get_many([1, 2, 3])
+
+    something = Something.objects.get(id=1)
+    something.name = "changed"
+    something.save()
+    Something.objects.filter(id=2).delete()
+
+    assert cache.get_stats().size == 1
+    assert cache.get(1).name == "changed"
+    assert cache.get(2) is None
+
+
+@pytest.mark.usefixtures("setup_db")
+def test_dto_cache_invalidation_related():
+    cache = DTOCache(SomethingDetailDTO)
+    other = Other.objects.create(id=1, name="other")
+    Something.objects.get(id=1).others.add(other)
+    assert [other.name for other in cache.get(1).others] == ["other"]
+
+    other.name = "changed"
+    other.save()
+
+    assert [other.name for other in cache.get(1).others] == ["changed"]
+
+
+@pytest.mark.usefixtures("setup_db")
+def test_dto_cache_version_field(django_assert_num_queries):
+    cache = DTOCache(SomethingDTO, version_field="name")
+    cache.get_many([1, 2])
+
+    # QuerySet.update() does not send any signals
+    Something.objects.filter(id=1).update(name="changed")
+
+    with django_assert_num_queries(3):  # versions, Something 1 and its many to many relation
+        dtos = cache.get_many([1, 2])
+
+    assert [dto.name for dto in dtos.values()] == ["changed", "2"]
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("setup_db")
+async def test_dto_cache_aget_many():
+    cache = DTOCache(SomethingDTO, version_field="name")
+
+    dtos = await cache.aget_many([1, 2])
+    cached_dtos = await cache.aget_many([1, 2])
+
+    assert cached_dtos == dtos
+    assert await cache.aget(4) is None
+    assert cache.get_stats().hits == 2
+
+
+class UnprefetchedSomethingDetailDTO(SomethingDetailDTO):
+    @classmethod
+    def get_prefetch_related(cls):
+        # Like relations apply_related() does not cover, loaded when converting
+        return ()
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("setup_db")
+async def test_dto_cache_aget_many_unprefetched():
+    cache = DTOCache(UnprefetchedSomethingDetailDTO)
+    other = await Other.objects.acreate(id=1, name="other")
+    await (await Something.objects.aget(id=1)).others.aadd(other)
+
+    dtos = await cache.aget_many([1, 2])
+
+    assert [other.name for other in dtos[1].others] == ["other"]
+    assert dtos[2].others == []
@@ -22,7 +22,7 @@ class SomethingDBTestCase(TestCase):
 
 # SAME AS ABOVE, but using async
 
-pytestmark = pytest.mark.django_db(transaction=True)
+pytestmark = pytest.mark.async_db
 
 
 def test_str():
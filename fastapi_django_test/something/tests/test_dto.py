@@ -0,0 +1,274 @@
+import json
+
+import pytest
+
+from fastapi_django.models import django_to_pydantic_model
+from fastapi_django.models.dict import model_to_dict
+from fastapi_django.pagination import CursorParams, apaginate
+from fastapi_django.responses import iter_queryset_json, iter_queryset_ndjson
+from fastapi_django_test.something.dto import SomethingDetailDTO, SomethingDTO
+from fastapi_django_test.something.models import Other, Something
+
+pytestmark = pytest.mark.async_db
+
+
+# Sync, so the fixture also works for sync tests
+@pytest.fixture()
+def setup_db():
+    Something.objects.create(id=1, name="A")
+    Something.objects.create(id=2, name="B")
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("setup_db")
+async def test_afrom_queryset():
+    dtos = await SomethingDTO.afrom_queryset(Something.objects.order_by("id"))
+
+    assert dtos == [
+        SomethingDTO(id=1, name="A"),
+        SomethingDTO(id=2, name="B"),
+    ]
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("setup_db")
+async def test_afrom_queryset_async_iterable():
+    with pytest.warns(RuntimeWarning, match="not prefetched"):
+        dtos = await SomethingDTO.afrom_queryset(aiter(Something.objects.order_by("id")))
+
+    assert [dto.id for dto in dtos] == [1, 2]
+
+
+@pytest.mark.usefixtures("setup_db")
+def test_from_queryset_matches_from_django():
+    dtos = SomethingDTO.from_queryset(Something.objects.order_by("id"))
+
+    assert dtos == [
+        SomethingDTO.from_django(something)
+        for something
+        in Something.objects.order_by("id")
+    ]
+    assert dtos == [
+        SomethingDTO(id=1, name="A"),
+        SomethingDTO(id=2, name="B"),
+    ]
+
+
+async def _join(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("setup_db")
+@pytest.mark.parametrize("chunk_size", [1, 2, 2000])
+async def test_iter_queryset_json(chunk_size):
+    content = await _join(iter_queryset_json(
+        SomethingDTO,
+        Something.objects.order_by("id"),
+        chunk_size=chunk_size,
+    ))
+
+    assert json.loads(content) == [
+        {"id": 1, "name": "A", "main_other": None, "others": []},
+        {"id": 2, "name": "B", "main_other": None, "others": []},
+    ]
+
+
+@pytest.mark.anyio()
+async def test_iter_queryset_json_empty():
+    content = await _join(iter_queryset_json(SomethingDTO, Something.objects.all()))
+
+    assert json.loads(content) == []
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("setup_db")
+async def test_iter_queryset_ndjson():
+    content = await _join(iter_queryset_ndjson(
+        SomethingDTO,
+        Something.objects.order_by("id"),
+        chunk_size=1,
+    ))
+
+    assert [json.loads(line) for line in content.splitlines()] == [
+        {"id": 1, "name": "A", "main_other": None, "others": []},
+        {"id": 2, "name": "B", "main_other": None, "others": []},
+    ]
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("setup_db")
+@pytest.mark.parametrize("ndjson", [False, True])
+async def test_iter_queryset_json_trusted(ndjson):
+    iter_json = iter_queryset_ndjson if ndjson else iter_queryset_json
+
+    queryset = Something.objects.order_by("id")
+    trusted_content = await _join(iter_json(SomethingDTO, queryset, chunk_size=1, trusted=True))
+    content = await _join(iter_json(SomethingDTO, queryset, chunk_size=1))
+
+    assert trusted_content == content
+    assert b'"name":"B"' in content
+
+
+@pytest.mark.usefixtures("setup_db")
+def test_from_queryset_relations(django_assert_num_queries):
+    other_1 = Other.objects.create(id=1, name="1")
+    other_2 = Other.objects.create(id=2, name="2")
+    Something.objects.filter(id=1).update(main_other=other_1)
+    Something.objects.get(id=1).others.set([other_1, other_2])
+    Something.objects.get(id=2).others.set([other_2])
+
+    with django_assert_num_queries(2):
+        dtos = SomethingDetailDTO.from_queryset(Something.objects.order_by("id"))
+
+    assert [dto.model_dump() for dto in dtos] == [
+        {
+            "id": 1,
+            "name": "A",
+            "main_other": {"id": 1, "name": "1"},
+            "others": [{"id": 1, "name": "1"}, {"id": 2, "name": "2"}],
+        },
+        {
+            "id": 2,
+            "name": "B",
+            "main_other": None,
+            "others": [{"id": 2, "name": "2"}],
+        },
+    ]
+
+
+@pytest.mark.usefixtures("setup_db")
+def test_from_queryset_reverse_relations(django_assert_num_queries):
+    OtherWithSomethingsDTO = django_to_pydantic_model(
+        Other,
+        relations={
+            "main_somethings": SomethingDTO,
+            "somethings": SomethingDTO,
+        },
+    )
+    other = Other.objects.create(id=1, name="1")
+    Something.objects.filter(id=1).update(main_other=other)
+    other.somethings.set([1, 2])
+
+    # Other, main_somethings, somethings plus others for both nested relations
+    with django_assert_num_queries(5):
+        dtos = OtherWithSomethingsDTO.from_queryset(Other.objects.all())
+
+    assert [something.id for something in dtos[0].main_somethings] == [1]
+    assert sorted(something.id for something in dtos[0].somethings) == [1, 2]
+
+
+@pytest.fixture()
+def setup_others():
+    other_1 = Other.objects.create(id=1, name="1")
+    other_2 = Other.objects.create(id=2, name="2")
+    Something.objects.get(id=1).others.set([other_1, other_2])
+    Something.objects.get(id=2).others.set([other_2])
+
+
+@pytest.mark.usefixtures("setup_db", "setup_others")
+def test_from_queryset_many_to_many(django_assert_num_queries):
+    with django_assert_num_queries(2):
+        dtos = SomethingDTO.from_queryset(Something.objects.order_by("id"))
+
+    assert [dto.others for dto in dtos] == [[1, 2], [2]]
+
+
+@pytest.mark.usefixtures("setup_db", "setup_others")
+def test_from_django_many_many_to_many(django_assert_num_queries):
+    with django_assert_num_queries(2):
+        dtos = SomethingDTO.from_django_many(
+            SomethingDTO.apply_related(Something.objects.order_by("id")),
+        )
+
+    assert [dto.others for dto in dtos] == [[1, 2], [2]]
+
+
+@pytest.mark.usefixtures("setup_db")
+def test_many_to_many_order():
+    # Added in reverse order, so the through table is not ordered by the related pk
+    something = Something.objects.get(id=1)
+    for other_id in (3, 1, 2):
+        something.others.add(Other.objects.create(id=other_id, name=str(other_id)))
+    queryset = Something.objects.filter(id=1)
+
+    assert SomethingDTO.from_queryset(queryset)[0].others == [1, 2, 3]
+    assert SomethingDTO.from_django_many(SomethingDTO.apply_related(queryset))[0].others == [1, 2, 3]
+    assert SomethingDTO.from_django(queryset.get()).others == [1, 2, 3]
+    assert SomethingDTO.from_django(queryset.get(), trusted=True).others == [1, 2, 3]
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("setup_db")
+async def test_afrom_queryset_many_to_many():
+    other = await Other.objects.acreate(id=1, name="1")
+    await (await Something.objects.aget(id=1)).others.aset([other])
+
+    dtos = await SomethingDTO.afrom_queryset(Something.objects.order_by("id"))
+    with pytest.warns(RuntimeWarning, match="not prefetched"):
+        iterable_dtos = await SomethingDTO.afrom_queryset(aiter(Something.objects.order_by("id")))
+
+    assert [dto.others for dto in dtos] == [[1], []]
+    assert iterable_dtos == dtos
+
+
+@pytest.mark.usefixtures("setup_db", "setup_others")
+def test_dump_queryset_json(django_assert_num_queries):
+    with django_assert_num_queries(2):
+        content = SomethingDTO.dump_queryset_json(Something.objects.order_by("id"), trusted=True)
+
+    assert content == SomethingDTO.dump_queryset_json(Something.objects.order_by("id"))
+    assert json.loads(content) == [
+        {"id": 1, "name": "A", "main_other": None, "others": [1, 2]},
+        {"id": 2, "name": "B", "main_other": None, "others": [2]},
+    ]
+
+
+@pytest.mark.usefixtures("setup_db", "setup_others")
+def test_dump_queryset_json_relations():
+    content = SomethingDetailDTO.dump_queryset_json(Something.objects.order_by("id"), trusted=True)
+
+    assert sorted(json.loads(content)[0]["others"], key=lambda other: other["id"]) == [
+        {"id": 1, "name": "1"},
+        {"id": 2, "name": "2"},
+    ]
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("setup_db")
+async def test_adump_queryset_json():
+    content = await SomethingDTO.adump_queryset_json(Something.objects.order_by("id"), trusted=True)
+
+    assert content == await SomethingDTO.adump_queryset_json(Something.objects.order_by("id"))
+    assert json.loads(content) == [
+        {"id": 1, "name": "A", "main_other": None, "others": []},
+        {"id": 2, "name": "B", "main_other": None, "others": []},
+    ]
+
+
+class UnprefetchedSomethingDetailDTO(SomethingDetailDTO):
+    @classmethod
+    def get_prefetch_related(cls):
+        # Like relations apply_related() does not cover, loaded when converting
+        return ()
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("setup_db")
+async def test_apaginate_unprefetched():
+    page = await apaginate(UnprefetchedSomethingDetailDTO, Something.objects.all(), CursorParams())
+
+    assert [dto.name for dto in page.items] == ["A", "B"]
+
+
+@pytest.mark.usefixtures("setup_db", "setup_others")
+def test_from_django_many_not_prefetched(django_assert_num_queries):
+    somethings = list(Something.objects.order_by("id"))
+
+    # One query per instance for the many to many relation
+    with django_assert_num_queries(2), pytest.warns(RuntimeWarning, match="not prefetched, .*: others"):
+        dtos = SomethingDTO.from_django_many(somethings)
+
+    assert [dto.others for dto in dtos] == [[1, 2], [2]]
+    assert "others" not in model_to_dict(somethings[0])
+    assert model_to_dict(somethings[0], include_many_to_many=True)["others"] == [1, 2]
@@ -0,0 +1,31 @@
+import pytest
+from asgiref.sync import sync_to_async
+from django.db import transaction
+
+from fastapi_django.testing import _restore_sqlite_snapshots
+from fastapi_django_test.api import orm_executor
+from fastapi_django_test.something.models import Something
+
+
+@pytest.mark.anyio()
+@pytest.mark.async_db()
+async def test_async_db():
+    await Something.objects.acreate(name="A")
+
+    async with orm_executor.lane():
+        in_atomic_block = await sync_to_async(lambda: transaction.get_connection().in_atomic_block)()
+        count = await Something.objects.acount()
+
+    # Sees the transaction of the test
+    assert in_atomic_block
+    assert count == 1
+
+
+@pytest.mark.usefixtures("sqlite_snapshot_db")
+def test_sqlite_snapshot_db(sqlite_snapshots):
+    Something.objects.create(name="A")
+
+    _restore_sqlite_snapshots(sqlite_snapshots)
+
+    assert Something.objects.count() == 0
+    assert Something.objects.create(name="B").pk == 1
@@ -27,3 +27,44 @@ async def test_health(app):
         response = await ac.get("/health")
     assert response.status_code == 200
     assert response.json() == IsPartialDict(all="ok")
+
+
+@pytest.mark.anyio()
+@pytest.mark.async_db()
+async def test_metrics(app):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        await ac.get("/api/v1/somethings/")
+        await ac.get("/api/v1/not-found/")
+        await ac.get("/admin/")
+        await ac.get("/not-found/")
+        response = await ac.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_requests_total{mount="v1",operation_id="getSomethings",status="2xx"}' in response.text
+    assert 'http_requests_total{mount="v1",operation_id="unknown",status="4xx"}' in response.text
+    assert 'http_requests_in_progress{mount="v1"} 0' in response.text
+    assert 'http_request_duration_seconds_count{mount="v1",operation_id="getSomethings"}' in response.text
+    # Django requests are labelled by the view name of the matched URL
+    assert 'http_requests_total{mount="django",operation_id="admin:index",status="3xx"}' in response.text
+    assert 'http_requests_total{mount="django",operation_id="unknown",status="4xx"}' in response.text
+
+
+def test_shutdown_closes_orm_executor(app):
+    from ..api import orm_executor
+    from ..api.v1 import api_v1
+    from ..api.v2 import api_v2
+
+    # The handlers of the mounted APIs run as part of the root app's lifespan
+    for api in (api_v1, api_v2):
+        assert api.router.shutdown in app.lifespan.router.on_shutdown
+        assert orm_executor.aclose in api.router.on_shutdown
+
+
+def test_no_static_root(settings):
+    from ..fastapi import get_fastapi_app
+
+    settings.STATIC_ROOT = None
+    app = get_fastapi_app()
+
+    assert "/static" not in app.mounts
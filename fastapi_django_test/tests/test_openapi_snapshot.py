@@ -0,0 +1,30 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+
+@pytest.fixture()
+def snapshot_dir(settings, tmp_path):
+    settings.OPENAPI_SNAPSHOT_DIR = tmp_path
+    return tmp_path
+
+
+def test_openapi_snapshot(snapshot_dir):
+    from fastapi_django.openapi import load_openapi_snapshot
+    from fastapi_django_test.api.v1 import api_v1
+
+    with pytest.raises(CommandError, match="missing or outdated: v1, v2"):
+        call_command("openapi_snapshot", check=True)
+
+    call_command("openapi_snapshot")
+    call_command("openapi_snapshot", check=True)
+
+    snapshot = load_openapi_snapshot(snapshot_dir / "v1.json")
+    assert snapshot["schema"]["paths"]["/somethings/"]["get"]["operationId"] == "getSomethings"
+    assert snapshot["schema"] == api_v1.openapi()
+    assert (snapshot_dir / "v2.json").exists()
+
+
+@pytest.mark.usefixtures('snapshot_dir')
+def test_openapi_snapshot_unknown():
+    with pytest.raises(CommandError, match="Unknown APIs: v3"):
+        call_command("openapi_snapshot", "v1", "v3")
@@ -0,0 +1,158 @@
+import pytest
+from django.db import models
+from fastapi import FastAPI, Request
+from httpx import AsyncClient
+from starlette.responses import Response
+
+from fastapi_django.cache import LRUCacheBackend, cache_response, get_dto_models, invalidate_models
+from fastapi_django.cache.invalidation import aget_model_versions
+from fastapi_django.cache.responses import _matches_etag
+from fastapi_django.formats import CSV, JSON, negotiate_format
+from fastapi_django.models import django_to_pydantic_model
+
+
+class Other(models.Model):
+    name = models.CharField(max_length=255)
+
+    class Meta:
+        app_label = 'test_cache'
+
+
+class Something(models.Model):
+    name = models.CharField(max_length=255)
+    main_other = models.ForeignKey(Other, on_delete=models.SET_NULL, null=True, blank=True)
+    others = models.ManyToManyField(Other, blank=True, related_name="+")
+
+    class Meta:
+        app_label = 'test_cache'
+
+
+class Unrelated(models.Model):
+    name = models.CharField(max_length=255)
+
+    class Meta:
+        app_label = 'test_cache'
+
+
+@pytest.fixture()
+def anyio_backend():
+    return 'asyncio'
+
+
+OtherDTO = django_to_pydantic_model(Other)
+SomethingDTO = django_to_pydantic_model(Something, exclude={"main_other", "others"})
+SomethingDetailDTO = django_to_pydantic_model(Something, relations={"others": OtherDTO})
+
+
+def test_lru_cache_backend():
+    backend = LRUCacheBackend(max_size=2)
+
+    backend.set("a", 1)
+    backend.set("b", 2)
+    assert backend.get("a") == 1
+    backend.set("c", 3)
+
+    assert backend.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+
+
+def test_lru_cache_backend_timeout(monkeypatch):
+    backend = LRUCacheBackend()
+    now = 1000.0
+    monkeypatch.setattr("fastapi_django.cache.backends.time.monotonic", lambda: now)
+
+    backend.set("a", 1, timeout=10)
+    backend.set("b", 2)
+    now += 10
+
+    assert backend.get_many(["a", "b"]) == {"b": 2}
+
+
+def test_get_dto_models():
+    through_model = Something._meta.get_field("others").remote_field.through
+
+    assert get_dto_models(OtherDTO) == {Other}
+    assert get_dto_models(SomethingDTO) == {Something}
+    assert get_dto_models(SomethingDetailDTO) == {Something, Other, through_model}
+
+
+@pytest.mark.anyio()
+async def test_invalidate_models():
+    backend = LRUCacheBackend()
+    versions = await aget_model_versions(backend, [Something, Other])
+
+    invalidate_models(Other, backend=backend)
+
+    new_versions = await aget_model_versions(backend, [Something, Other])
+    assert new_versions[0] == versions[0]
+    assert new_versions[1] != versions[1]
+
+
+@pytest.mark.parametrize(("if_none_match", "matches"), [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ('"xyz"', False),
+    ("*", True),
+])
+def test_matches_etag(if_none_match, matches):
+    assert _matches_etag(if_none_match, '"abc"') is matches
+
+
+@pytest.mark.anyio()
+async def test_cache_response():
+    backend = LRUCacheBackend()
+    app = FastAPI()
+    calls = []
+
+    @app.get("/somethings/", response_model=list[SomethingDTO])
+    @cache_response(SomethingDTO, backend=backend)
+    async def get_somethings(name: str = "max") -> list[SomethingDTO]:
+        calls.append(name)
+        return [SomethingDTO(id=1, name=name)]
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/somethings/")
+        cached_response = await ac.get("/somethings/")
+        other_response = await ac.get("/somethings/", params={"name": "moritz"})
+        invalidate_models(Unrelated, backend=backend)
+        await ac.get("/somethings/")
+        invalidate_models(Something)
+        invalidated_response = await ac.get("/somethings/")
+
+    assert response.json() == [{"id": 1, "name": "max"}]
+    assert cached_response.json() == [{"id": 1, "name": "max"}]
+    assert other_response.json() == [{"id": 1, "name": "moritz"}]
+    assert invalidated_response.headers["etag"] == response.headers["etag"]
+    assert calls == ["max", "moritz", "max"]
+
+
+@pytest.mark.anyio()
+async def test_cache_response_formats():
+    backend = LRUCacheBackend()
+    app = FastAPI()
+    formats = (CSV, JSON)
+
+    @app.get("/somethings/")
+    @cache_response(SomethingDTO, backend=backend, formats=formats)
+    async def get_somethings(request: Request) -> Response:
+        dto_format = negotiate_format(request.headers.get("accept"), formats)
+        response = Response(dto_format.name, media_type=dto_format.media_type)
+        response.headers["vary"] = "accept"
+        response.headers["cache-control"] = "max-age=60"
+        return response
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        csv_response = await ac.get("/somethings/", headers={"accept": "*/*"})
+        json_response = await ac.get("/somethings/", headers={"accept": "application/json"})
+        not_modified_response = await ac.get(
+            "/somethings/",
+            headers={"accept": "application/json", "if-none-match": json_response.headers["etag"]},
+        )
+
+    # Both would use the JSON key using the default formats
+    assert csv_response.text == "csv"
+    assert json_response.text == "json"
+    assert not_modified_response.status_code == 304
+    assert not_modified_response.headers["vary"] == "accept"
+    assert not_modified_response.headers["cache-control"] == "max-age=60"
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from django.core import signals
+from httpx import AsyncClient
+
+from fastapi_django.db import DjangoDBConnectionMiddleware
+from fastapi_django.executor import ORMExecutor
+
+
+@pytest.fixture()
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture()
+def request_signals():
+    sent = []
+
+    def handle_request_started(**_kwargs):
+        sent.append("started")
+
+    def handle_request_finished(**_kwargs):
+        sent.append("finished")
+
+    signals.request_started.connect(handle_request_started)
+    signals.request_finished.connect(handle_request_finished)
+    yield sent
+    signals.request_started.disconnect(handle_request_started)
+    signals.request_finished.disconnect(handle_request_finished)
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize("lanes", [None, 1])
+async def test_db_connection_middleware_concurrent_requests(request_signals, lanes):
+    stream_started = asyncio.Event()
+    short_done = asyncio.Event()
+    sent_during_stream = []
+
+    async def app(scope, _receive, send):
+        if scope["path"] == "/stream":
+            # Like a streaming response, still reading a cursor after the short
+            # request finished
+            stream_started.set()
+            await short_done.wait()
+            sent_during_stream.extend(request_signals)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    executor = ORMExecutor(lanes) if lanes is not None else None
+    middleware = DjangoDBConnectionMiddleware(app, aliases=(), executor=executor)
+
+    async def short_request(ac):
+        await stream_started.wait()
+        await ac.get("/short")
+        short_done.set()
+
+    try:
+        async with AsyncClient(app=middleware, base_url="http://test") as ac:
+            await asyncio.wait_for(asyncio.gather(ac.get("/stream"), short_request(ac)), timeout=5)
+    finally:
+        if executor is not None:
+            await executor.aclose()
+
+    # Both requests share the thread, the connections must not be closed (by
+    # request_finished) before the streaming request finished as well
+    assert sent_during_stream == ["started"]
+    assert request_signals == ["started", "finished"]
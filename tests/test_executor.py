@@ -0,0 +1,137 @@
+import asyncio
+import threading
+
+import pytest
+from asgiref.sync import SyncToAsync, sync_to_async
+from fastapi import Depends, FastAPI
+from httpx import AsyncClient
+
+from fastapi_django.executor import ORMExecutor
+
+
+@pytest.fixture()
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture()
+async def orm_executor():
+    orm_executor = ORMExecutor(lanes=2)
+    yield orm_executor
+    await orm_executor.aclose()
+
+
+def _get_thread_name() -> str:
+    return threading.current_thread().name
+
+
+@pytest.mark.anyio()
+async def test_orm_executor_lane_affinity(orm_executor):
+    async with orm_executor.lane():
+        thread_name = await sync_to_async(_get_thread_name)()
+        async with orm_executor.lane():
+            nested_thread_name = await sync_to_async(_get_thread_name)()
+        other_thread_name = await sync_to_async(_get_thread_name)()
+
+    assert thread_name.startswith("orm-")
+    assert nested_thread_name == thread_name
+    assert other_thread_name == thread_name
+
+
+@pytest.mark.anyio()
+async def test_orm_executor_parallel(orm_executor):
+    first_started = threading.Event()
+
+    def first() -> bool:
+        first_started.set()
+        return second_done.wait(timeout=5)
+
+    second_done = threading.Event()
+
+    def second() -> bool:
+        result = first_started.wait(timeout=5)
+        second_done.set()
+        return result
+
+    async def run(func):
+        async with orm_executor.lane():
+            return await sync_to_async(func)()
+
+    # Would time out if both ran in the same thread
+    assert await asyncio.gather(run(first), run(second)) == [True, True]
+
+
+@pytest.mark.anyio()
+async def test_orm_executor_stats(orm_executor):
+    async with orm_executor.lane():
+        assert orm_executor.get_stats().active_requests == 1
+        await sync_to_async(_get_thread_name)()
+        await sync_to_async(_get_thread_name)()
+
+    stats = orm_executor.get_stats()
+    assert stats.lanes == 2
+    assert stats.active_requests == 0
+    assert stats.calls == 2
+    assert stats.queue_depth == 0
+    assert stats.max_queue_depth == 1
+    assert stats.wait_seconds >= stats.max_wait_seconds > 0
+
+
+@pytest.mark.anyio()
+async def test_orm_executor_dependency(orm_executor):
+    app = FastAPI(dependencies=[Depends(orm_executor.dependency)])
+
+    @app.get("/")
+    async def get_thread_name() -> str:
+        return await sync_to_async(_get_thread_name)()
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/")
+
+    assert response.json().startswith("orm-")
+    assert orm_executor.get_stats().active_requests == 0
+
+
+@pytest.mark.anyio()
+async def test_orm_executor_shared_lane():
+    orm_executor = ORMExecutor(lanes=1)
+    both_active = asyncio.Barrier(2)
+
+    async def run():
+        async with orm_executor.lane():
+            await both_active.wait()
+            # More requests than lanes, so the lane is shared
+            assert orm_executor.get_stats().active_requests == 2
+            return await sync_to_async(_get_thread_name)()
+
+    try:
+        thread_names = await asyncio.gather(run(), run())
+    finally:
+        await orm_executor.aclose()
+
+    assert thread_names[0] == thread_names[1]
+
+
+def test_orm_executor_lanes():
+    with pytest.raises(ValueError, match="At least one lane"):
+        ORMExecutor(lanes=0)
+
+
+@pytest.mark.anyio()
+async def test_orm_executor_aclose():
+    orm_executor = ORMExecutor(lanes=2)
+
+    await orm_executor.aclose()
+    await orm_executor.aclose()
+
+    assert all(lane.executor._shutdown for lane in orm_executor._lanes)
+    with pytest.raises(RuntimeError, match="closed"):
+        async with orm_executor.lane():
+            pass
+
+
+def test_orm_executor_unsupported_asgiref(monkeypatch):
+    monkeypatch.delattr(SyncToAsync, "context_to_thread_executor")
+
+    with pytest.raises(RuntimeError, match="context_to_thread_executor"):
+        ORMExecutor()
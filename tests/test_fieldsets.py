@@ -0,0 +1,125 @@
+import gc
+import weakref
+
+import pytest
+from django.db import models
+from fastapi import HTTPException
+
+from fastapi_django.fieldsets import (
+    SparseFields,
+    _SubsetDTOCache,
+    get_selectable_fields,
+    get_subset_dto,
+)
+from fastapi_django.formats import CSV, _get_column_encoders
+from fastapi_django.models import django_to_pydantic_model
+from fastapi_django.models.models import _get_django_write_fields, _get_model_to_dict_include
+from fastapi_django.utils import get_list_type_adapter
+
+
+class Something(models.Model):
+    name = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+
+    main_other = models.ForeignKey("Other", on_delete=models.CASCADE, null=True, blank=True)
+    others = models.ManyToManyField("Other", blank=True, related_name="somethings")
+
+    class Meta:
+        app_label = 'test_fieldsets'
+
+
+class Other(models.Model):
+    name = models.CharField(max_length=255)
+
+    class Meta:
+        app_label = 'test_fieldsets'
+
+
+OtherDTO = django_to_pydantic_model(Other)
+SomethingDTO = django_to_pydantic_model(Something)
+SomethingDetailDTO = django_to_pydantic_model(Something, relations={"others": OtherDTO})
+
+
+class TrustedSomethingDTO(SomethingDTO):
+    django_trusted = True
+
+
+def test_get_selectable_fields():
+    assert get_selectable_fields(SomethingDTO) == {
+        "id": "id",
+        "name": "name",
+        "description": "description",
+        "main_other": "main_other_id",
+        "others": "others",
+    }
+
+
+def test_get_subset_dto():
+    dto_class = get_subset_dto(SomethingDTO, ["id", "main_other"])
+
+    assert list(dto_class.model_fields) == ["id", "main_other_id"]
+    # Only the selected columns are loaded
+    assert dto_class._get_django_values_names() == ("id", "main_other")
+    assert dto_class._get_django_only_names() == ("id", "main_other")
+    assert dto_class(id=1, main_other=2).model_dump(by_alias=True) == {"id": 1, "main_other": 2}
+
+
+def test_get_subset_dto_relations():
+    dto_class = get_subset_dto(SomethingDetailDTO, ["name", "others"])
+
+    assert list(dto_class.model_fields) == ["name", "others"]
+    assert dto_class._django_relations["others"][1] is OtherDTO
+
+
+def test_get_subset_dto_cached():
+    assert get_subset_dto(SomethingDTO, ["id", "name"]) is get_subset_dto(SomethingDTO, ["name", "id"])
+    assert get_subset_dto(SomethingDTO, get_selectable_fields(SomethingDTO)) is SomethingDTO
+    assert get_subset_dto(TrustedSomethingDTO, ["id"]).django_trusted
+
+
+def test_get_subset_dto_unknown_fields():
+    with pytest.raises(ValueError, match="Unknown fields: main_other_id, secret"):
+        get_subset_dto(SomethingDTO, ["id", "secret", "main_other_id"])
+
+
+def test_subset_dto_cache_bounded():
+    cache = _SubsetDTOCache(max_variants=2)
+
+    first = cache.get_or_create(SomethingDTO, frozenset({"id"}))
+    cache.get_or_create(SomethingDTO, frozenset({"name"}))
+    assert cache.get_or_create(SomethingDTO, frozenset({"id"})) is first
+    cache.get_or_create(SomethingDTO, frozenset({"description"}))
+
+    stats = cache.get_stats()
+    assert (stats.created, stats.cache_hits, stats.evicted, stats.size) == (3, 1, 1, 2)
+    # The least recently used variant was dropped
+    assert cache.get_or_create(SomethingDTO, frozenset({"id"})) is first
+    assert cache.get_stats().created == 3
+
+
+def test_subset_dto_cache_evicted_collected():
+    cache = _SubsetDTOCache(max_variants=1)
+    subset_dto_class = cache.get_or_create(SomethingDTO, frozenset({"id", "name"}))
+    get_list_type_adapter(subset_dto_class)
+    _get_model_to_dict_include(subset_dto_class)
+    _get_django_write_fields(subset_dto_class)
+    _get_column_encoders(subset_dto_class, CSV.name)
+    subset_dto_ref = weakref.ref(subset_dto_class)
+    del subset_dto_class
+
+    cache.get_or_create(SomethingDTO, frozenset({"id"}))
+    gc.collect()
+
+    # The cached data is stored on the class, not keeping it alive
+    assert subset_dto_ref() is None
+
+
+def test_sparse_fields():
+    sparse_fields = SparseFields(SomethingDTO)
+
+    assert sparse_fields(None) is SomethingDTO
+    assert sparse_fields(" , ") is SomethingDTO
+    assert list(sparse_fields("id, name").model_fields) == ["id", "name"]
+    with pytest.raises(HTTPException) as exc_info:
+        sparse_fields("id,secret")
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,124 @@
+import datetime
+import decimal
+import uuid
+
+import pytest
+from django.db import models
+
+from fastapi_django.formats import (
+    CSV,
+    HAS_MSGPACK,
+    JSON,
+    NDJSON,
+    dump_rows_csv,
+    dump_rows_msgpack,
+    get_column_names,
+    negotiate_format,
+)
+from fastapi_django.models import django_to_pydantic_model
+
+
+class Something(models.Model):
+    name = models.CharField(max_length=255)
+    active = models.BooleanField(default=True)
+    birth = models.DateField(null=True, blank=True)
+    joined = models.DateTimeField(null=True, blank=True)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    key = models.UUIDField()
+    data = models.JSONField(default=dict)
+
+    others = models.ManyToManyField("Other", blank=True)
+
+    class Meta:
+        app_label = 'test_formats'
+
+
+class Other(models.Model):
+    name = models.CharField(max_length=255)
+
+    class Meta:
+        app_label = 'test_formats'
+
+
+SomethingDTO = django_to_pydantic_model(Something)
+
+KEY = uuid.UUID("12345678-1234-5678-1234-567812345678")
+JOINED = datetime.datetime(2023, 1, 2, 3, 4, 5, tzinfo=datetime.UTC)
+
+
+def get_rows():
+    dto = SomethingDTO(
+        id=1,
+        name="max, moritz",
+        active=False,
+        birth=datetime.date(2023, 1, 1),
+        joined=JOINED,
+        price=decimal.Decimal("1.10"),
+        key=KEY,
+        data={"a": 1},
+        others=[1, 2],
+    )
+    return [
+        dto.model_dump(by_alias=True),
+        {**dto.model_dump(by_alias=True), "id": 2, "birth": None, "joined": None},
+    ]
+
+
+@pytest.mark.parametrize(("accept", "expected"), [
+    (None, JSON),
+    ("*/*", JSON),
+    ("text/csv", CSV),
+    ("application/x-ndjson", NDJSON),
+    ("application/jsonl", NDJSON),
+    ("text/html, application/xml;q=0.9", JSON),
+    ("application/json;q=0.5, text/csv", CSV),
+    ("text/csv;q=0, application/x-ndjson;q=0.1", NDJSON),
+    ("application/*, text/csv;q=0.5", JSON),
+])
+def test_negotiate_format(accept, expected):
+    assert negotiate_format(accept, (JSON, NDJSON, CSV)) == expected
+
+
+def test_negotiate_format_restricted():
+    assert negotiate_format("text/csv", (NDJSON,)) == NDJSON
+
+
+def test_dump_rows_csv():
+    content = dump_rows_csv(SomethingDTO, get_rows(), header=True)
+
+    assert content.decode().splitlines() == [
+        "id,name,active,birth,joined,price,key,data,others",
+        '1,"max, moritz",false,2023-01-01,2023-01-02T03:04:05+00:00,1.10,'
+        '12345678-1234-5678-1234-567812345678,"{""a"":1}","[1,2]"',
+        '2,"max, moritz",false,,,1.10,12345678-1234-5678-1234-567812345678,"{""a"":1}","[1,2]"',
+    ]
+
+
+def test_get_column_names():
+    dto_class = django_to_pydantic_model(Something, include={"id", "name"})
+
+    assert get_column_names(dto_class) == ("id", "name")
+    assert dump_rows_csv(dto_class, [{"id": 1, "name": "max"}]) == b"1,max\r\n"
+
+
+@pytest.mark.skipif(not HAS_MSGPACK, reason="msgpack is not installed")
+def test_dump_rows_msgpack():
+    import msgpack
+
+    content = dump_rows_msgpack(SomethingDTO, get_rows())
+
+    unpacker = msgpack.Unpacker(timestamp=3)
+    unpacker.feed(content)
+    rows = list(unpacker)
+    assert rows[0] == {
+        "id": 1,
+        "name": "max, moritz",
+        "active": False,
+        "birth": "2023-01-01",
+        "joined": JOINED,
+        "price": "1.10",
+        "key": str(KEY),
+        "data": {"a": 1},
+        "others": [1, 2],
+    }
+    assert rows[1] == {**rows[0], "id": 2, "birth": None, "joined": None}
@@ -0,0 +1,79 @@
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from fastapi_django.metrics import RequestMetricsMiddleware, _Histogram, request_metrics, resolve_django_operation
+
+
+@pytest.fixture()
+def anyio_backend():
+    return 'asyncio'
+
+
+def test_histogram():
+    histogram = _Histogram((1, 10))
+    for value in (0.5, 1, 5, 50):
+        histogram.observe(value)
+
+    assert histogram.render("size", 'mount="a"') == [
+        'size_bucket{mount="a",le="1"} 2',
+        'size_bucket{mount="a",le="10"} 3',
+        'size_bucket{mount="a",le="+Inf"} 4',
+        'size_sum{mount="a"} 56.5',
+        'size_count{mount="a"} 4',
+    ]
+
+
+@pytest.mark.anyio()
+async def test_request_metrics_middleware():
+    app = FastAPI()
+
+    @app.get("/items/{id}", operation_id="getItem")
+    async def get_item(id: int) -> dict:
+        return {"id": id}
+
+    app.add_middleware(RequestMetricsMiddleware, mount="test_metrics")
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        await ac.get("/items/1")
+        await ac.get("/items/2")
+        invalid_response = await ac.get("/items/invalid")
+        await ac.get("/docs")
+
+    mount_metrics = request_metrics.get_mount("test_metrics")
+    assert mount_metrics.in_progress == 0
+    assert mount_metrics.operations_by_id.keys() == {"getItem", "unknown"}
+    operation = mount_metrics.operations_by_id["getItem"]
+    assert operation.status_counts == [0, 2, 0, 1, 0]
+    assert operation.response_size.sum == 2 * len(b'{"id":1}') + len(invalid_response.content)
+    assert mount_metrics.operations_by_id["unknown"].status_counts == [0, 1, 0, 0, 0]
+
+
+@pytest.mark.parametrize(("path", "root_path", "operation_id"), [
+    ("/admin/", "", "admin:index"),
+    ("/django/admin/login/", "/django", "admin:login"),
+    ("/not-found/", "", "unknown"),
+])
+def test_resolve_django_operation(path, root_path, operation_id):
+    assert resolve_django_operation({"type": "http", "path": path, "root_path": root_path}) == operation_id
+
+
+@pytest.mark.anyio()
+async def test_request_metrics_middleware_resolve_operation():
+    async def app(_scope, _receive, send):
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = RequestMetricsMiddleware(
+        app,
+        mount="test_metrics_resolve",
+        resolve_operation=lambda scope: scope["path"].strip("/"),
+    )
+    async with AsyncClient(app=middleware, base_url="http://test") as ac:
+        await ac.get("/a/")
+        await ac.get("/b/")
+        await ac.get("/a/")
+
+    mount_metrics = request_metrics.get_mount("test_metrics_resolve")
+    assert mount_metrics.operations_by_id["a"].status_counts == [0, 2, 0, 0, 0]
+    assert mount_metrics.operations_by_id["b"].status_counts == [0, 1, 0, 0, 0]
@@ -3,6 +3,7 @@ import decimal
 import uuid
 
 import pydantic
+import pytest
 from dirty_equals import Contains
 from django.db import models
 
@@ -20,7 +21,7 @@ class Something(models.Model):
     email = models.EmailField(null=True, blank=True)
 
     other = models.ForeignKey("Other", on_delete=models.CASCADE, null=True, blank=True)
-    # more_others = models.ManyToManyField("Other", blank=True)
+    more_others = models.ManyToManyField("Other", blank=True, related_name="+")
 
     avatar = models.ImageField()
 
@@ -49,6 +50,7 @@ def test_model_create():
         "joined",
         "email",
         "other_id",
+        "more_others",
         "avatar",
     )
 
@@ -64,6 +66,7 @@ def test_model_create():
     else:
         assert SomethingInPydantic.model_fields["email"].annotation == str | None
     assert SomethingInPydantic.model_fields["other_id"].annotation == uuid.UUID | None
+    assert SomethingInPydantic.model_fields["more_others"].annotation == list[uuid.UUID]
     assert SomethingInPydantic.model_fields["avatar"].annotation == str
 
 
@@ -87,3 +90,51 @@ def test_model_create_exclude():
         set(django_to_pydantic_model(Something, exclude={"id", "name"}).__fields__.keys())
         & {"id", "name"}
     )
+
+
+class Related(models.Model):
+    something = models.ForeignKey(Something, on_delete=models.CASCADE, related_name="relateds")
+    others = models.ManyToManyField(Other, related_name="relateds")
+
+    class Meta:
+        app_label = 'test_models_create'
+
+
+def test_model_create_relations():
+    OtherInPydantic = django_to_pydantic_model(Other)
+    RelatedInPydantic = django_to_pydantic_model(Related, relations={"others": OtherInPydantic})
+    SomethingInPydantic = django_to_pydantic_model(Something, relations={"other": OtherInPydantic})
+
+    assert "other_id" not in SomethingInPydantic.model_fields
+    assert SomethingInPydantic.model_fields["other"].annotation == OtherInPydantic | None
+    assert RelatedInPydantic.model_fields["others"].annotation == list[OtherInPydantic]
+
+
+def test_model_create_relations_plan():
+    OtherInPydantic = django_to_pydantic_model(Other)
+    RelatedInPydantic = django_to_pydantic_model(
+        Related,
+        relations={
+            "something": django_to_pydantic_model(Something, relations={"other": OtherInPydantic}),
+            "others": OtherInPydantic,
+        },
+    )
+
+    assert RelatedInPydantic.get_select_related() == ("something", "something__other")
+    assert [
+        prefetch.prefetch_to
+        for prefetch
+        in RelatedInPydantic.get_prefetch_related()
+    ] == ["something__more_others", "others"]
+    assert RelatedInPydantic._get_django_only_names() == Contains(
+        "id",
+        "something",
+        "something__id",
+        "something__other",
+        "something__other__id",
+    )
+
+
+def test_model_create_unknown_relation():
+    with pytest.raises(ValueError, match="Unknown relations unknown"):
+        django_to_pydantic_model(Something, relations={"unknown": django_to_pydantic_model(Other)})
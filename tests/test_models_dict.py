@@ -116,6 +116,28 @@ def test_model_to_dict_for_foreign_key():
     )
 
 
+def test_model_to_dict_for_many_to_many_unsaved():
+    something = Something(
+        name="max",
+    )
+
+    obj_dict = model_to_dict(something)
+
+    assert obj_dict == IsPartialDict(
+        others=[],
+    )
+
+
+def test_model_to_dict_for_many_to_many_not_prefetched():
+    something = Something(id=1, name="max")
+
+    # Would need a query
+    assert "others" not in model_to_dict(something)
+
+    something._prefetched_objects_cache = {"others": Other.objects.none()}
+    assert model_to_dict(something)["others"] == []
+
+
 def test_model_to_dict_for_file_field():
     something = Something(
         name="max",
@@ -127,3 +149,33 @@ def test_model_to_dict_for_file_field():
     assert obj_dict == IsPartialDict(
         avatar="/web/url/path/to/file.jpg",
     )
+
+
+class UpperCharField(models.CharField):
+    def value_from_object(self, obj):
+        return super().value_from_object(obj).upper()
+
+
+class Custom(models.Model):
+    name = UpperCharField(max_length=255)
+
+    class Meta:
+        app_label = 'test_models_dict'
+
+
+def test_model_to_dict_respects_custom_value_from_object():
+    obj_dict = model_to_dict(Custom(id=1, name="max"))
+
+    assert obj_dict == {"id": 1, "name": "MAX"}
+
+
+def test_model_to_dict_options_do_not_leak():
+    something = Something(
+        name="max",
+        age=123,
+    )
+
+    assert set(model_to_dict(something, include={"name"}).keys()) == {"name"}
+    assert "age" in model_to_dict(something)
+    assert "age" not in model_to_dict(something, exclude={"age"})
+    assert set(model_to_dict(something, include={"age"}).keys()) == {"age"}
@@ -0,0 +1,62 @@
+import pydantic
+from django.db import models
+
+from fastapi_django.models import register_field_type
+from fastapi_django.models.fields import (
+    FIELD_TYPE_MAP,
+    HAS_EMAIL_VALIDATOR,
+    _get_pydantic_field_type_from_django_field,
+    _resolve_field_options,
+)
+
+
+class CustomEmailField(models.EmailField):
+    pass
+
+
+class ColorField(models.CharField):
+    pass
+
+
+class UnknownField(models.Field):
+    pass
+
+
+def test_resolve_exact_class():
+    assert _get_pydantic_field_type_from_django_field(models.IntegerField()) == int
+
+
+def test_resolve_most_specific_base_class():
+    # Would be str if the CharField mapping was used
+    assert _get_pydantic_field_type_from_django_field(CustomEmailField()) == (
+        pydantic.EmailStr if HAS_EMAIL_VALIDATOR else str
+    )
+
+
+def test_resolve_unknown_field():
+    assert _resolve_field_options(UnknownField) is None
+
+
+def test_register_field_type():
+    class Color(str):
+        pass
+
+    assert _get_pydantic_field_type_from_django_field(ColorField(max_length=7)) == str
+
+    try:
+        register_field_type(ColorField, Color)
+
+        assert _get_pydantic_field_type_from_django_field(ColorField(max_length=7)) == Color
+    finally:
+        del FIELD_TYPE_MAP[ColorField]
+        _resolve_field_options.cache_clear()
+
+
+def test_register_field_type_skip():
+    try:
+        register_field_type(ColorField, None)
+
+        assert _resolve_field_options(ColorField) is None
+    finally:
+        del FIELD_TYPE_MAP[ColorField]
+        _resolve_field_options.cache_clear()
@@ -0,0 +1,65 @@
+import datetime
+
+from django.core.files.storage import InMemoryStorage
+from django.db import models
+
+from fastapi_django.models import django_to_pydantic_model, model_to_dict
+
+storage = InMemoryStorage(
+    base_url="/web/url/",
+)
+
+
+class Something(models.Model):
+    name = models.CharField(max_length=255)
+    birth = models.DateField(null=True, blank=True)
+
+    main_other = models.ForeignKey("Other", on_delete=models.CASCADE, null=True, blank=True)
+
+    avatar = models.ImageField(storage=storage, blank=True)
+
+    class Meta:
+        app_label = 'test_models_from_django'
+
+
+class Other(models.Model):
+    name = models.CharField(max_length=255)
+
+    class Meta:
+        app_label = 'test_models_from_django'
+
+
+SomethingDTO = django_to_pydantic_model(Something)
+
+
+def test_from_django_many():
+    somethings = [
+        Something(id=1, name="max", main_other=Other(id=1, name="moritz"), avatar="a.jpg"),
+        Something(id=2, name="moritz", birth=datetime.date(2023, 1, 1), avatar="b.jpg"),
+    ]
+
+    dtos = SomethingDTO.from_django_many(somethings)
+
+    assert dtos == [SomethingDTO.from_django(something) for something in somethings]
+
+
+def test_values_data_matches_model_to_dict():
+    something = Something(id=1, name="max", main_other_id=1, avatar="path/to/file.jpg")
+    row = {
+        "id": 1,
+        "name": "max",
+        "birth": None,
+        "main_other": 1,
+        "avatar": "path/to/file.jpg",
+    }
+
+    assert SomethingDTO._get_django_values_names() == tuple(row.keys())
+    assert SomethingDTO._get_django_values_data([row]) == [model_to_dict(something)]
+
+
+def test_values_data_skips_empty_files():
+    rows = SomethingDTO._get_django_values_data([
+        {"id": 1, "name": "max", "birth": None, "main_other": None, "avatar": ""},
+    ])
+
+    assert "avatar" not in rows[0]
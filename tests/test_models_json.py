@@ -0,0 +1,110 @@
+import datetime
+
+import pydantic
+from django.db import models
+
+from fastapi_django.models import django_to_pydantic_model
+from fastapi_django.responses import DTOResponse
+
+
+class Something(models.Model):
+    name = models.CharField(max_length=255)
+    file = models.FileField(null=True, blank=True)
+
+    class Meta:
+        app_label = 'test_models_json'
+
+
+class Recording(models.Model):
+    duration = models.DurationField()
+    data = models.BinaryField()
+
+    class Meta:
+        app_label = 'test_models_json'
+
+
+SomethingDTO = django_to_pydantic_model(Something)
+RecordingDTO = django_to_pydantic_model(Recording)
+
+
+def test_can_dump_django_values_json():
+    class SubclassDTO(SomethingDTO):
+        pass
+
+    assert SomethingDTO._can_dump_django_values_json()
+    assert SubclassDTO._can_dump_django_values_json()
+
+
+def test_can_dump_django_values_json_additional_fields():
+    class AdditionalFieldDTO(SomethingDTO):
+        extra: int = 1
+
+    class ComputedFieldDTO(SomethingDTO):
+        @pydantic.computed_field  # type: ignore
+        @property
+        def upper_name(self) -> str:
+            return self.name.upper()
+
+    assert not AdditionalFieldDTO._can_dump_django_values_json()
+    assert not ComputedFieldDTO._can_dump_django_values_json()
+
+
+def test_can_dump_django_values_json_custom_validators_and_serializers():
+    class ValidatorDTO(SomethingDTO):
+        @pydantic.field_validator("name")
+        @classmethod
+        def strip_name(cls, value: str) -> str:
+            return value.strip()
+
+    class SerializerDTO(SomethingDTO):
+        @pydantic.field_serializer("name")
+        def serialize_name(self, value: str) -> str:
+            return value.upper()
+
+    assert not ValidatorDTO._can_dump_django_values_json()
+    assert not SerializerDTO._can_dump_django_values_json()
+
+
+def test_can_dump_django_values_json_config():
+    class ConfigDTO(RecordingDTO):
+        model_config = pydantic.ConfigDict(ser_json_timedelta="float", ser_json_bytes="base64")
+
+    class DefaultConfigDTO(RecordingDTO):
+        model_config = pydantic.ConfigDict(ser_json_timedelta="iso8601")
+
+    class SerializationAliasDTO(SomethingDTO):
+        name: str = pydantic.Field(serialization_alias="title")
+
+    assert RecordingDTO._can_dump_django_values_json()
+    assert DefaultConfigDTO._can_dump_django_values_json()
+    assert not ConfigDTO._can_dump_django_values_json()
+    assert not SerializationAliasDTO._can_dump_django_values_json()
+
+
+def test_dump_many_uses_model_config():
+    class ConfigDTO(RecordingDTO):
+        model_config = pydantic.ConfigDict(ser_json_timedelta="float", ser_json_bytes="base64")
+
+    dtos = ConfigDTO.from_django_many([Recording(id=1, duration=datetime.timedelta(seconds=90), data=b"ab")])
+
+    assert dtos[0].model_dump_json() == '{"id":1,"duration":90.0,"data":"YWI="}'
+    assert DTOResponse(dtos).body == f"[{dtos[0].model_dump_json()}]".encode()
+
+
+def test_get_django_values_json_data():
+    rows = [
+        {"id": 1, "name": "max", "file": "max.txt"},
+        {"id": 2, "name": "moritz", "file": ""},
+    ]
+
+    data = SomethingDTO._get_django_values_json_data(rows)
+
+    assert data == [
+        {"id": 1, "name": "max", "file": "/max.txt"},
+        {"id": 2, "name": "moritz", "file": None},
+    ]
+    assert data == [
+        SomethingDTO.model_validate(item).model_dump(by_alias=True)
+        for item
+        in data
+    ]
@@ -0,0 +1,45 @@
+from django.db import models
+
+from fastapi_django.models import DjangoModelBase, django_to_pydantic_model
+
+
+class Something(models.Model):
+    name = models.CharField(max_length=255)
+    description = models.TextField()
+
+    main_other = models.ForeignKey("Other", on_delete=models.CASCADE, null=True, blank=True)
+
+    class Meta:
+        app_label = 'test_models_project'
+
+
+class Other(models.Model):
+    name = models.CharField(max_length=255)
+
+    class Meta:
+        app_label = 'test_models_project'
+
+
+def test_project():
+    SomethingDTO = django_to_pydantic_model(Something, exclude={"description"})
+
+    queryset = SomethingDTO.project(Something.objects.all())
+
+    assert queryset.query.deferred_loading == ({"id", "name", "main_other"}, False)
+
+
+def test_project_include():
+    SomethingDTO = django_to_pydantic_model(Something, include={"id", "name"})
+
+    queryset = SomethingDTO.project(Something.objects.all())
+
+    assert queryset.query.deferred_loading == ({"id", "name"}, False)
+
+
+def test_project_without_django_model():
+    class SomethingDTO(DjangoModelBase[Something]):
+        name: str
+
+    queryset = Something.objects.all()
+
+    assert SomethingDTO.project(queryset) is queryset
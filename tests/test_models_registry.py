@@ -0,0 +1,57 @@
+from django.db import models
+
+from fastapi_django.models import django_to_pydantic_model, get_dto_registry_stats
+
+
+class Something(models.Model):
+    name = models.CharField(max_length=255)
+    age = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        app_label = 'test_models_registry'
+
+
+def test_registry_returns_same_model():
+    assert django_to_pydantic_model(Something) is django_to_pydantic_model(Something)
+    assert (
+        django_to_pydantic_model(Something, include={"id", "name"})
+        is django_to_pydantic_model(Something, include={"name", "id"})
+    )
+
+
+def test_registry_different_arguments():
+    assert django_to_pydantic_model(Something) is not django_to_pydantic_model(Something, exclude={"age"})
+    assert (
+        django_to_pydantic_model(Something, include={"id"})
+        is not django_to_pydantic_model(Something, exclude={"id"})
+    )
+
+
+def test_registry_stats():
+    stats = get_dto_registry_stats()
+
+    SomethingInPydantic = django_to_pydantic_model(Something, include={"name"})
+    django_to_pydantic_model(Something, include={"name"})
+
+    new_stats = get_dto_registry_stats()
+    assert new_stats.created == stats.created + 1
+    assert new_stats.cache_hits == stats.cache_hits + 1
+    assert new_stats.build_seconds > stats.build_seconds
+    assert new_stats.deferred == stats.deferred + 1
+
+    SomethingInPydantic.model_validate({"name": "max"})
+
+    assert get_dto_registry_stats().deferred == stats.deferred
+
+
+def test_deferred_model_serialization():
+    # Models not validated directly yet, instances created by the list validator or
+    # model_construct() must still be serializable
+    dto_class = django_to_pydantic_model(Something, include={"id", "age"})
+    trusted_dto_class = django_to_pydantic_model(Something, include={"name", "age"})
+
+    dtos = dto_class.from_django_many([Something(id=1, age=2)])
+    trusted_dto = trusted_dto_class.from_django(Something(name="max"), trusted=True)
+
+    assert [dto.model_dump() for dto in dtos] == [{"id": 1, "age": 2}]
+    assert trusted_dto.model_dump() == {"name": "max", "age": None}
@@ -0,0 +1,86 @@
+
+import pytest
+from django.db import models
+
+from fastapi_django.models import django_to_pydantic_model
+
+
+class Something(models.Model):
+    name = models.CharField(max_length=255)
+    website = models.URLField(blank=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    avatar = models.ImageField(blank=True)
+
+    main_other = models.ForeignKey("Other", on_delete=models.CASCADE, null=True, blank=True)
+    others = models.ManyToManyField("Other", blank=True, related_name="somethings")
+
+    class Meta:
+        app_label = 'test_models_to_django'
+
+
+class Other(models.Model):
+    name = models.CharField(max_length=255)
+
+    class Meta:
+        app_label = 'test_models_to_django'
+
+
+SomethingDTO = django_to_pydantic_model(Something)
+
+
+def test_to_django():
+    dto = SomethingDTO(
+        id=1,
+        name="max",
+        website="https://example.com/",
+        ip_address="127.0.0.1",
+        avatar="a.jpg",
+        main_other=2,
+        others=[2, 3],
+    )
+
+    something = dto.to_django()
+
+    assert isinstance(something, Something)
+    assert something.pk == 1
+    assert something.name == "max"
+    assert something.website == "https://example.com/"
+    assert something.ip_address == "127.0.0.1"
+    assert something.main_other_id == 2
+    # Files only contain the URL, many to many relations need a saved instance
+    assert not something.avatar
+
+
+def test_to_django_instance():
+    something = Something(id=1, name="max", avatar="a.jpg")
+    dto = SomethingDTO(id=1, name="moritz", website="https://example.com/", ip_address=None, avatar="",
+                       main_other=None, others=[])
+
+    assert dto.to_django(something) is something
+    assert something.name == "moritz"
+    assert something.ip_address is None
+    assert something.avatar.name == "a.jpg"
+
+
+def test_to_django_many():
+    dtos = [
+        SomethingDTO(id=i, name=f"Something {i}", website="https://example.com/",
+                     ip_address="::1", avatar="", main_other=None, others=[])
+        for i in range(3)
+    ]
+
+    somethings = SomethingDTO.to_django_many(dtos)
+
+    assert [something.pk for something in somethings] == [0, 1, 2]
+    assert all(something.ip_address == "::1" for something in somethings)
+
+
+@pytest.mark.parametrize("exclude", [{"id"}, {"id", "main_other", "others"}])
+def test_to_django_excluded_fields(exclude):
+    dto_class = django_to_pydantic_model(Something, exclude=exclude)
+    dto = dto_class(name="max", website="https://example.com/", ip_address=None, avatar="")
+
+    something = dto.to_django()
+
+    assert something.pk is None
+    assert something.name == "max"
@@ -0,0 +1,125 @@
+import datetime
+import warnings
+
+import pydantic
+import pytest
+from django.db import models
+
+from fastapi_django.models import django_to_pydantic_model
+from fastapi_django.responses import DTOResponse
+
+
+class Something(models.Model):
+    name = models.CharField(max_length=255)
+    birth = models.DateField(null=True, blank=True)
+
+    main_other = models.ForeignKey("Other", on_delete=models.CASCADE, null=True, blank=True)
+
+    class Meta:
+        app_label = 'test_models_trusted'
+
+
+class Other(models.Model):
+    name = models.CharField(max_length=255)
+
+    class Meta:
+        app_label = 'test_models_trusted'
+
+
+class Website(models.Model):
+    url = models.URLField()
+    ip_address = models.GenericIPAddressField(null=True)
+
+    class Meta:
+        app_label = 'test_models_trusted'
+
+
+SomethingDTO = django_to_pydantic_model(Something)
+OtherDTO = django_to_pydantic_model(Other)
+SomethingWithOtherDTO = django_to_pydantic_model(Something, relations={"main_other": OtherDTO})
+WebsiteDTO = django_to_pydantic_model(Website)
+
+
+def test_from_django_trusted():
+    something = Something(id=1, name="max", birth=datetime.date(2023, 1, 1), main_other_id=2)
+
+    dto = SomethingDTO.from_django(something, trusted=True)
+
+    assert dto == SomethingDTO.from_django(something)
+    assert dto.model_fields_set == {"id", "name", "birth", "main_other_id"}
+
+
+def test_from_django_trusted_does_not_validate():
+    dto = SomethingDTO.from_django(Something(id="not an int", name="max"), trusted=True)
+
+    assert dto.id == "not an int"
+
+
+def test_from_django_trusted_relations():
+    something = Something(id=1, name="max", main_other=Other(id=2, name="moritz"))
+
+    dtos = SomethingWithOtherDTO.from_django_many([something, Something(id=3, name="a")], trusted=True)
+
+    assert dtos == SomethingWithOtherDTO.from_django_many([something, Something(id=3, name="a")])
+    assert isinstance(dtos[0].main_other, OtherDTO)
+
+
+def test_from_django_trusted_class_default():
+    class TrustedSomethingDTO(SomethingDTO):
+        django_trusted = True
+
+    dto = TrustedSomethingDTO.from_django(Something(id="not an int", name="max"))
+
+    assert dto.id == "not an int"
+
+
+def test_dto_response():
+    dtos = SomethingDTO.from_django_many([
+        Something(id=1, name="max", main_other_id=2),
+        Something(id=2, name="moritz"),
+    ])
+
+    assert DTOResponse(dtos).body == (
+        b'[{"id":1,"name":"max","birth":null,"main_other":2},'
+        b'{"id":2,"name":"moritz","birth":null,"main_other":null}]'
+    )
+    assert DTOResponse(dtos[0]).body == b'{"id":1,"name":"max","birth":null,"main_other":2}'
+    assert DTOResponse([]).body == b"[]"
+
+
+def test_from_django_trusted_url_ip_address():
+    website = Website(id=1, url="https://example.com", ip_address="::1")
+
+    trusted_dto = WebsiteDTO.from_django(website, trusted=True)
+    dto = WebsiteDTO.from_django(website)
+
+    # Values are kept as they are stored, dumping must not warn about unexpected types
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert trusted_dto.model_dump() == dto.model_dump() == {
+            "id": 1,
+            "url": "https://example.com",
+            "ip_address": "::1",
+        }
+        assert trusted_dto.model_dump_json() == dto.model_dump_json()
+
+
+def test_url_ip_address_validation():
+    with pytest.raises(pydantic.ValidationError, match="url_parsing"):
+        WebsiteDTO(id=1, url="not a url", ip_address=None)
+    with pytest.raises(pydantic.ValidationError, match="ip_any_address"):
+        WebsiteDTO(id=1, url="https://example.com", ip_address="not an ip")
+
+    assert WebsiteDTO.model_json_schema()["properties"]["url"] == {
+        "description": "",
+        "format": "uri",
+        "maxLength": 200,
+        "title": "url",
+        "type": "string",
+    }
+    assert WebsiteDTO.model_json_schema()["properties"]["ip_address"] == {
+        "anyOf": [{"type": "string"}, {"type": "null"}],
+        "description": "",
+        "format": "ipvanyaddress",
+        "title": "ip address",
+    }
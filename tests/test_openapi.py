@@ -0,0 +1,106 @@
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette.routing import Mount, Router
+
+from fastapi_django.openapi import (
+    get_routes_fingerprint,
+    install_openapi_snapshot,
+    load_openapi_snapshot,
+    write_openapi_snapshot,
+)
+
+
+@pytest.fixture()
+def anyio_backend():
+    return 'asyncio'
+
+
+def create_app(*, with_other: bool = False) -> FastAPI:
+    app = FastAPI(title="Test")
+
+    @app.get("/somethings/{id}/")
+    def get_something(id: int, verbose: bool = False) -> dict:  # noqa: ARG001
+        return {}
+
+    if with_other:
+        @app.get("/others/")
+        def get_others() -> list:
+            return []
+
+    return app
+
+
+@pytest.fixture()
+def snapshot_path(tmp_path):
+    path = tmp_path / "openapi" / "test.json"
+    write_openapi_snapshot(create_app(), path)
+    return path
+
+
+def test_write_openapi_snapshot(snapshot_path):
+    app = create_app()
+
+    assert load_openapi_snapshot(snapshot_path) == {
+        "fingerprint": get_routes_fingerprint(app),
+        "schema": app.openapi(),
+    }
+    assert load_openapi_snapshot(snapshot_path.with_name("missing.json")) is None
+
+
+def test_routes_fingerprint():
+    assert get_routes_fingerprint(create_app()) == get_routes_fingerprint(create_app())
+    assert get_routes_fingerprint(create_app()) != get_routes_fingerprint(create_app(with_other=True))
+
+
+def test_install_openapi_snapshot_outdated(snapshot_path, caplog):
+    app = create_app(with_other=True)
+
+    assert not install_openapi_snapshot(app, snapshot_path)
+    assert not install_openapi_snapshot(app, snapshot_path.with_name("missing.json"))
+    assert "does not match the routes" in caplog.text
+    assert app.openapi_schema is None
+
+
+@pytest.mark.anyio()
+async def test_openapi_snapshot_served(snapshot_path):
+    app = create_app()
+    expected_schema = app.openapi()
+    app = create_app()
+    assert install_openapi_snapshot(app, snapshot_path)
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/openapi.json", headers={"accept-encoding": "identity"})
+        gzip_response = await ac.get("/openapi.json", headers={"accept-encoding": "gzip"})
+        not_modified_response = await ac.get("/openapi.json", headers={
+            "accept-encoding": "gzip",
+            "if-none-match": gzip_response.headers["etag"],
+        })
+        docs_response = await ac.get("/docs")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == expected_schema
+    assert "content-encoding" not in response.headers
+    assert gzip_response.headers["content-encoding"] == "gzip"
+    assert gzip_response.json() == expected_schema
+    assert gzip_response.headers["etag"] != response.headers["etag"]
+    assert not_modified_response.status_code == 304
+    assert not_modified_response.content == b""
+    assert docs_response.status_code == 200
+
+
+@pytest.mark.anyio()
+async def test_openapi_snapshot_mounted(snapshot_path):
+    app = create_app()
+    assert install_openapi_snapshot(app, snapshot_path)
+    expected_app = create_app()
+
+    async with AsyncClient(app=Router([Mount("/api", app)]), base_url="http://test") as ac:
+        response = await ac.get("/api/openapi.json")
+    async with AsyncClient(app=Router([Mount("/api", expected_app)]), base_url="http://test") as ac:
+        expected_response = await ac.get("/api/openapi.json")
+
+    assert response.json()["servers"] == [{"url": "/api"}]
+    # Same bytes as generated by FastAPI
+    assert response.content == expected_response.content
@@ -0,0 +1,49 @@
+import datetime
+
+import pytest
+from django.db import models
+from fastapi import HTTPException
+
+from fastapi_django.pagination import _get_keyset_filter, decode_cursor, encode_cursor
+
+
+class Member(models.Model):
+    joined = models.DateField()
+
+    class Meta:
+        app_label = 'test_pagination'
+
+
+def test_cursor_roundtrip():
+    cursor = encode_cursor("next", [1, "abc"])
+
+    assert decode_cursor(cursor) == ("next", [1, "abc"])
+
+
+@pytest.mark.parametrize("cursor", ["invalid", "", encode_cursor("next", [1])[:-2] + "!!"])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+def test_keyset_filter():
+    assert _get_keyset_filter(Member, ["pk"], [1], "next") == models.Q(pk__gt=1)
+    assert _get_keyset_filter(Member, ["pk"], [1], "prev") == models.Q(pk__lt=1)
+    assert _get_keyset_filter(Member, ["-pk"], [1], "next") == models.Q(pk__lt=1)
+
+
+def test_keyset_filter_composite():
+    joined = datetime.date(2023, 1, 1)
+
+    assert _get_keyset_filter(Member, ["-joined", "pk"], ["2023-01-01", 1], "next") == (
+        models.Q(joined__lt=joined)
+        | (models.Q(joined=joined) & models.Q(pk__gt=1))
+    )
+
+
+@pytest.mark.parametrize("key", [[1], ["abc", 1], ["2023-01-01", {"a": 1}], ["2023-01-01", None]])
+def test_keyset_filter_invalid_key(key):
+    with pytest.raises(HTTPException) as exc_info:
+        _get_keyset_filter(Member, ["-joined", "pk"], key, "next")
+
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,120 @@
+import logging
+import time
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from fastapi_django.phases import RequestProfile, get_request_profile, profile_phase, request_profile_var
+from fastapi_django.profiling import QueryProfilingMiddleware, _profile_query
+
+
+@pytest.fixture()
+def anyio_backend():
+    return 'asyncio'
+
+
+def _execute(sql, _params, _many, _context):
+    return sql
+
+
+def test_profile_query():
+    profile = RequestProfile()
+    token = request_profile_var.set(profile)
+    try:
+        for _ in range(3):
+            assert _profile_query(_execute, "SELECT 1", None, False, {}) == "SELECT 1"
+        _profile_query(_execute, "SELECT 2", None, False, {})
+    finally:
+        request_profile_var.reset(token)
+
+    # Not recorded outside of profiled requests
+    _profile_query(_execute, "SELECT 3", None, False, {})
+
+    assert profile.queries == 4
+    assert profile.get_repeated_queries(3) == [("SELECT 1", 3)]
+    assert profile.get_repeated_queries(5) == []
+
+
+def test_profile_phase_nested():
+    profile = RequestProfile()
+    token = request_profile_var.set(profile)
+    try:
+        with profile_phase("serialization"):
+            with profile_phase("conversion"):
+                time.sleep(0.05)
+                # Pretend half of the time was spent in the database
+                profile.add_query("SELECT 1", 0.025)
+    finally:
+        request_profile_var.reset(token)
+
+    # Neither contains the time of the query, serialization not the conversion time
+    assert 0.025 <= profile.phase_seconds["conversion"] < 0.05
+    assert 0.0 <= profile.phase_seconds["serialization"] < 0.01
+
+
+@pytest.mark.anyio()
+async def test_query_profiling_middleware(caplog):
+    app = FastAPI()
+
+    @app.get("/")
+    def endpoint() -> dict:
+        # Runs in a thread, like the ORM code
+        for _ in range(3):
+            _profile_query(_execute, "SELECT 1", None, False, {})
+        with profile_phase("conversion"):
+            pass
+        return {}
+
+    with caplog.at_level(logging.INFO, logger="fastapi_django.profiling"):
+        async with AsyncClient(app=QueryProfilingMiddleware(app), base_url="http://test") as ac:
+            response = await ac.get("/")
+
+    server_timing = response.headers["server-timing"]
+    assert server_timing.startswith('db;dur=')
+    assert 'desc="3 queries"' in server_timing
+    assert "conversion;dur=" in server_timing
+    assert 'n-plus-one;desc="1 repeated queries"' in server_timing
+    assert caplog.records[0].request_profile["queries"] == 3
+    assert caplog.records[0].request_profile["repeated_queries"] == [{"sql": "SELECT 1", "count": 3}]
+    assert "likely N+1: SELECT 1" in caplog.records[1].message
+    assert get_request_profile() is None
+
+
+@pytest.mark.anyio()
+async def test_query_profiling_middleware_nested():
+    app = FastAPI()
+
+    @app.get("/")
+    async def endpoint() -> dict:
+        return {}
+
+    app.add_middleware(QueryProfilingMiddleware)
+    outer_app = FastAPI()
+    outer_app.mount("/api", app)
+    outer_app.add_middleware(QueryProfilingMiddleware, n_plus_one_threshold=2)
+
+    async with AsyncClient(app=outer_app, base_url="http://test") as ac:
+        response = await ac.get("/api/")
+
+    assert len(response.headers.get_list("server-timing")) == 1
+
+
+@pytest.mark.anyio()
+async def test_query_profiling_middleware_disabled(monkeypatch):
+    installed = []
+    monkeypatch.setattr("fastapi_django.profiling._install_query_profiling", lambda: installed.append(True))
+    app = FastAPI()
+
+    @app.get("/")
+    async def endpoint() -> dict:
+        return {}
+
+    middleware = QueryProfilingMiddleware(app, enabled=False)
+    async with AsyncClient(app=middleware, base_url="http://test") as ac:
+        response = await ac.get("/")
+
+    assert installed == []
+    assert "server-timing" not in response.headers
+    QueryProfilingMiddleware(app)
+    assert installed == [True]
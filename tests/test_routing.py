@@ -0,0 +1,64 @@
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from fastapi_django.routing import PrefixDispatcher
+
+
+@pytest.fixture()
+def anyio_backend():
+    return 'asyncio'
+
+
+def _create_app(name: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/{path:path}")
+    def endpoint(path: str) -> dict:
+        return {"app": name, "path": f"/{path}"}
+
+    return app
+
+
+@pytest.fixture()
+def dispatcher():
+    return PrefixDispatcher(
+        {
+            "/api": _create_app("api"),
+            "/api/v1": _create_app("v1"),
+            "/static": _create_app("static"),
+        },
+        default=_create_app("default"),
+        paths={"/health": _create_app("health")},
+    )
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize(("path", "expected"), [
+    ("/api/v1/somethings/", {"app": "v1", "path": "/somethings/"}),
+    ("/api/v1", {"app": "v1", "path": "/"}),
+    ("/api/v10/", {"app": "api", "path": "/v10/"}),
+    ("/api/v2/somethings/", {"app": "api", "path": "/v2/somethings/"}),
+    ("/static/css/app.css", {"app": "static", "path": "/css/app.css"}),
+    ("/staticfiles/", {"app": "default", "path": "/staticfiles/"}),
+    ("/health", {"app": "health", "path": "/health"}),
+    ("/health/", {"app": "default", "path": "/health/"}),
+    ("/health/live", {"app": "default", "path": "/health/live"}),
+    ("/admin/", {"app": "default", "path": "/admin/"}),
+    ("/", {"app": "default", "path": "/"}),
+])
+async def test_prefix_dispatcher(dispatcher, path, expected):
+    async with AsyncClient(app=dispatcher, base_url="http://test") as ac:
+        response = await ac.get(path)
+
+    assert response.json() == expected
+
+
+def test_prefix_dispatcher_invalid_prefix():
+    with pytest.raises(ValueError, match="slash"):
+        PrefixDispatcher({"/api/": FastAPI()}, default=FastAPI())
+
+
+def test_prefix_dispatcher_path_parameters():
+    with pytest.raises(ValueError, match="parameters"):
+        PrefixDispatcher({}, default=FastAPI(), paths={"/items/{id}": FastAPI()})
@@ -0,0 +1,150 @@
+import gzip
+
+import pytest
+from httpx import AsyncClient
+
+from fastapi_django.staticfiles import StaticFilesApp, _parse_range
+from fastapi_django.utils import parse_accept_encoding
+
+
+@pytest.fixture()
+def anyio_backend():
+    return 'asyncio'
+
+
+CONTENT = b"body { color: red; }\n" * 100
+
+
+@pytest.fixture()
+def static_root(tmp_path):
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "app.css").write_bytes(CONTENT)
+    (tmp_path / "css" / "app.css.gz").write_bytes(gzip.compress(CONTENT))
+    (tmp_path / "robots.txt").write_bytes(b"")
+    return tmp_path
+
+
+@pytest.fixture()
+def client(static_root):
+    return AsyncClient(app=StaticFilesApp(static_root, chunk_size=100), base_url="http://test")
+
+
+def testparse_accept_encoding():
+    assert parse_accept_encoding("gzip, deflate, br;q=0.5, zstd;q=0") == {"gzip", "deflate", "br"}
+
+
+@pytest.mark.parametrize(("range_header", "expected"), [
+    ("bytes=0-9", (0, 9)),
+    ("bytes=10-", (10, 99)),
+    ("bytes=90-200", (90, 99)),
+    ("bytes=-10", (90, 99)),
+    ("bytes=0-9,20-29", None),
+    ("lines=0-9", None),
+])
+def test_parse_range(range_header, expected):
+    assert _parse_range(range_header, 100) == expected
+
+
+@pytest.mark.parametrize("range_header", ["bytes=100-", "bytes=9-0", "bytes=-0"])
+def test_parse_range_not_satisfiable(range_header):
+    with pytest.raises(ValueError, match="not satisfiable"):
+        _parse_range(range_header, 100)
+
+
+@pytest.mark.parametrize("range_header", ["bytes=-10", "bytes=0-"])
+def test_parse_range_empty_file(range_header):
+    with pytest.raises(ValueError, match="not satisfiable"):
+        _parse_range(range_header, 0)
+
+
+@pytest.mark.anyio()
+async def test_static_file(client):
+    async with client:
+        response = await client.get("/css/app.css", headers={"accept-encoding": "identity"})
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["content-type"] == "text/css; charset=utf-8"
+    assert response.headers["content-length"] == str(len(CONTENT))
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["vary"] == "accept-encoding"
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.anyio()
+async def test_static_file_compressed(client):
+    async with client:
+        response = await client.get("/css/app.css", headers={"accept-encoding": "gzip, br"})
+        identity_response = await client.get("/css/app.css", headers={"accept-encoding": "identity"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == CONTENT
+    assert response.headers["etag"] != identity_response.headers["etag"]
+
+
+@pytest.mark.anyio()
+async def test_static_file_not_modified(client):
+    async with client:
+        response = await client.get("/css/app.css", headers={"accept-encoding": "identity"})
+        etag_response = await client.get("/css/app.css", headers={
+            "accept-encoding": "identity",
+            "if-none-match": response.headers["etag"],
+        })
+        last_modified_response = await client.get("/css/app.css", headers={
+            "accept-encoding": "identity",
+            "if-modified-since": response.headers["last-modified"],
+        })
+
+    assert etag_response.status_code == 304
+    assert etag_response.content == b""
+    assert etag_response.headers["etag"] == response.headers["etag"]
+    assert last_modified_response.status_code == 304
+
+
+@pytest.mark.anyio()
+async def test_static_file_range(client):
+    async with client:
+        response = await client.get("/css/app.css", headers={"accept-encoding": "gzip", "range": "bytes=10-1009"})
+        not_satisfiable_response = await client.get("/css/app.css", headers={"range": "bytes=5000-"})
+        if_range_response = await client.get("/css/app.css", headers={
+            "accept-encoding": "identity",
+            "range": "bytes=10-19",
+            "if-range": '"outdated"',
+        })
+
+    assert response.status_code == 206
+    assert response.content == CONTENT[10:1010]
+    assert response.headers["content-range"] == f"bytes 10-1009/{len(CONTENT)}"
+    assert "content-encoding" not in response.headers
+    assert not_satisfiable_response.status_code == 416
+    assert not_satisfiable_response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+    assert if_range_response.status_code == 200
+    assert if_range_response.content == CONTENT
+
+
+@pytest.mark.anyio()
+async def test_static_file_head_and_empty(client):
+    async with client:
+        head_response = await client.head("/css/app.css", headers={"accept-encoding": "identity"})
+        empty_response = await client.get("/robots.txt")
+        empty_range_response = await client.get("/robots.txt", headers={"range": "bytes=-10"})
+
+    assert head_response.status_code == 200
+    assert head_response.content == b""
+    assert head_response.headers["content-length"] == str(len(CONTENT))
+    assert empty_response.status_code == 200
+    assert empty_response.content == b""
+    assert empty_range_response.status_code == 416
+    assert empty_range_response.headers["content-range"] == "bytes */0"
+
+
+@pytest.mark.anyio()
+async def test_static_file_errors(client):
+    async with client:
+        not_found_response = await client.get("/css/missing.css")
+        traversal_response = await client.get("/css/../../etc/passwd")
+        post_response = await client.post("/css/app.css")
+
+    assert not_found_response.status_code == 404
+    assert traversal_response.status_code == 404
+    assert post_response.status_code == 405